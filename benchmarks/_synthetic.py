@@ -0,0 +1,228 @@
+"""Synthetic stand-ins shared by the benchmarks.
+
+The real `fastval.pt` / `gemma_shield.pt` weights are not part of the repo, so
+benchmarks script a small BERT-shaped encoder with the same call signature:
+`model(input_ids, attention_mask) -> scores[batch, 1]`.
+"""
+import collections
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import torch
+from torch import nn
+
+
+class SyntheticEncoder(nn.Module):
+    def __init__(self, vocab_size: int = 30522, hidden: int = 256, layers: int = 4,
+                 heads: int = 4, max_length: int = 512):
+        super().__init__()
+        self.embeddings = nn.Embedding(vocab_size, hidden)
+        self.positions = nn.Embedding(max_length, hidden)
+        layer = nn.TransformerEncoderLayer(hidden, heads, dim_feedforward=hidden * 4,
+                                           batch_first=True)
+        self.encoder = nn.TransformerEncoder(layer, layers, enable_nested_tensor=False)
+        self.head = nn.Linear(hidden, 1)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        positions = torch.arange(input_ids.size(1), device=input_ids.device).unsqueeze(0)
+        hidden = self.embeddings(input_ids) + self.positions(positions)
+        hidden = self.encoder(hidden, src_key_padding_mask=attention_mask == 0)
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1.0)
+        return torch.sigmoid(self.head(pooled))
+
+
+class BertLayer(nn.Module):
+    """A post-norm encoder layer written out with plain linear layers and matmuls."""
+
+    def __init__(self, hidden: int, heads: int):
+        super().__init__()
+        self.heads = heads
+        self.query = nn.Linear(hidden, hidden)
+        self.key = nn.Linear(hidden, hidden)
+        self.value = nn.Linear(hidden, hidden)
+        self.output = nn.Linear(hidden, hidden)
+        self.attention_norm = nn.LayerNorm(hidden)
+        self.intermediate = nn.Linear(hidden, hidden * 4)
+        self.feed_forward = nn.Linear(hidden * 4, hidden)
+        self.output_norm = nn.LayerNorm(hidden)
+
+    def _split_heads(self, x: torch.Tensor) -> torch.Tensor:
+        batch, length, hidden = x.shape
+        return x.view(batch, length, self.heads, hidden // self.heads).transpose(1, 2)
+
+    def forward(self, hidden: torch.Tensor, bias: torch.Tensor) -> torch.Tensor:
+        batch, length, size = hidden.shape
+        query = self._split_heads(self.query(hidden))
+        key = self._split_heads(self.key(hidden))
+        scores = query @ key.transpose(-1, -2) / math.sqrt(size // self.heads) + bias
+        context = torch.softmax(scores, -1) @ self._split_heads(self.value(hidden))
+        context = context.transpose(1, 2).reshape(batch, length, size)
+        hidden = self.attention_norm(hidden + self.output(context))
+        feed_forward = self.feed_forward(torch.nn.functional.gelu(self.intermediate(hidden)))
+        return self.output_norm(hidden + feed_forward)
+
+
+class SyntheticBertEncoder(nn.Module):
+    """SyntheticEncoder built from BertLayer, the graph a traced Hugging Face BERT has.
+
+    Unlike nn.TransformerEncoder it does not take PyTorch's fused fast path,
+    and it can be exported to ONNX after being saved as TorchScript.
+    """
+
+    def __init__(self, vocab_size: int = 30522, hidden: int = 256, layers: int = 4,
+                 heads: int = 4, max_length: int = 512):
+        super().__init__()
+        self.embeddings = nn.Embedding(vocab_size, hidden)
+        self.positions = nn.Embedding(max_length, hidden)
+        self.encoder = nn.ModuleList([BertLayer(hidden, heads) for _ in range(layers)])
+        self.head = nn.Linear(hidden, 1)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        positions = torch.arange(input_ids.size(1), device=input_ids.device).unsqueeze(0)
+        hidden = self.embeddings(input_ids) + self.positions(positions)
+        bias = (1.0 - attention_mask[:, None, None, :].to(hidden.dtype)) * -10000.0
+        for layer in self.encoder:
+            hidden = layer(hidden, bias)
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1.0)
+        return torch.sigmoid(self.head(pooled))
+
+
+def build_torchscript_encoder(path: str, bert_layers: bool = False, **kwargs) -> str:
+    """Trace a SyntheticEncoder and save it as a TorchScript file at `path`.
+
+    With `bert_layers`, trace a SyntheticBertEncoder instead.
+    """
+    model = (SyntheticBertEncoder if bert_layers else SyntheticEncoder)(**kwargs).eval()
+    input_ids = torch.randint(0, 1000, (2, 16))
+    attention_mask = torch.ones_like(input_ids)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, (input_ids, attention_mask), check_trace=False)
+    traced.save(path)
+    return path
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_tokenizer(directory: str, vocab_words: int = 1000):
+    """A local BERT WordPiece tokenizer over the words w0..w{vocab_words-1}."""
+    from transformers import BertTokenizerFast
+
+    vocab_file = os.path.join(directory, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]))
+        f.write("\n" + "\n".join(f"w{i}" for i in range(vocab_words)) + "\n")
+    return BertTokenizerFast(vocab_file)
+
+
+def synthetic_text(num_words: int, rng: random.Random, vocab_words: int = 1000) -> str:
+    return " ".join(f"w{rng.randrange(vocab_words)}" for _ in range(num_words))
+
+
+class ChatCompletionsStub(ThreadingHTTPServer):
+    """Local OpenAI chat completions endpoint answering the medical evaluator prompts.
+
+    Each call takes `latency` seconds plus `seconds_per_token` per prompt and
+    completion token (whitespace-separated words), like a hosted model does.
+    With `requests_per_second`, calls beyond that many in the last second are
+    answered with a 429 and a Retry-After, like a provider's rate limit.
+    Point `ChatOpenAI` at it with `OPENAI_API_BASE=stub.url`.
+    """
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.5, seconds_per_token: float = 0.0,
+                 requests_per_second: Optional[float] = None):
+        super().__init__(("127.0.0.1", 0), _ChatCompletionsHandler)
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.requests_per_second = requests_per_second
+        self.calls = 0
+        self.throttled = 0
+        self.accepted_at = collections.deque()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> "ChatCompletionsStub":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = " ".join(message["content"] for message in body["messages"])
+        answer = {}
+        if '"score"' in prompt:
+            answer.update(score=0.75, reasoning="The medical information is accurate and safe")
+        if '"feedback"' in prompt:
+            answer.pop("reasoning", None)
+            answer["feedback"] = "No misinformation or risks found"
+        content = json.dumps(answer)
+        prompt_tokens, completion_tokens = len(prompt.split()), len(content.split())
+        with self.server.lock:
+            retry_after = self._throttle()
+            if retry_after is None:
+                self.server.calls += 1
+        if retry_after is not None:
+            self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                        {"Retry-After": f"{retry_after:.3f}"})
+            return
+        time.sleep(self.server.latency + self.server.seconds_per_token * (prompt_tokens + completion_tokens))
+
+        payload = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+        self._reply(200, payload)
+
+    def _throttle(self) -> Optional[float]:
+        """Seconds until the sliding one-second window has room, or None to accept the call."""
+        server = self.server
+        if server.requests_per_second is None:
+            return None
+        now = time.monotonic()
+        while server.accepted_at and now - server.accepted_at[0] >= 1.0:
+            server.accepted_at.popleft()
+        if len(server.accepted_at) >= server.requests_per_second:
+            server.throttled += 1
+            return 1.0 - (now - server.accepted_at[0])
+        server.accepted_at.append(now)
+        return None
+
+    def _reply(self, status: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,98 @@
+"""Per-request API key authentication overhead with and without the API key cache.
+
+Starts a local PostgREST-compatible stub for the users table that answers
+after `--latency-ms`, then authenticates `--requests` API keys through
+`RepositoryService.aget_user_from_api_key` on an AsyncSupabaseStore. Keys
+are drawn from `--keys` valid keys, plus `--invalid-share` of requests that
+repeat a handful of wrong keys, like a misconfigured client retrying.
+
+    python benchmarks/api_key_cache.py --requests 2000 --keys 100 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.infrastructure.cache import MemoryApiKeyCache
+from vizeval.infrastructure.supabase.async_supabase_store import AsyncSupabaseStore
+
+
+class PostgrestStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, Nagle would delay the body on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        api_key = dict(parse_qsl(urlsplit(self.path).query)).get("api_key", "")[3:]
+        users = []
+        if api_key.startswith("key-"):
+            users.append({"id": f"user-{api_key}", "name": api_key, "api_key": api_key})
+        body = json.dumps(users).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def run(stub: PostgrestStub, api_keys, cache) -> float:
+    store = AsyncSupabaseStore(stub.url, "bench-key")
+    service = RepositoryService(store, cache)
+    start = time.perf_counter()
+    for api_key in api_keys:
+        await service.aget_user_from_api_key(api_key)
+    elapsed = time.perf_counter() - start
+    await store.aclose()
+    return elapsed / len(api_keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--invalid-share", type=float, default=0.1)
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="simulated round trip per Supabase request")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    api_keys = [f"bogus-{rng.randrange(5)}" if rng.random() < args.invalid_share
+                else f"key-{rng.randrange(args.keys)}" for _ in range(args.requests)]
+
+    stub = PostgrestStub(args.latency_ms / 1000)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    print(f"requests={args.requests} keys={args.keys} invalid_share={args.invalid_share} "
+          f"latency={args.latency_ms}ms")
+    print(f"{'mode':>8} {'auth_ms/request':>16} {'hit_rate':>9}")
+    uncached = asyncio.run(run(stub, api_keys, None))
+    print(f"{'no cache':>8} {uncached * 1000:>16.3f} {'-':>9}")
+    cache = MemoryApiKeyCache()
+    cached = asyncio.run(run(stub, api_keys, cache))
+    print(f"{'cache':>8} {cached * 1000:>16.3f} {cache.stats()['hit_rate']:>9.3f}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
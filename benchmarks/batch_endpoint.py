@@ -0,0 +1,112 @@
+"""Offline evaluation throughput: one request per item versus POST /evaluation/batch.
+
+Scores `--items` responses with a synthetic TorchScript encoder standing in
+for Fastval, first with one `POST /evaluation/` per item (what an SDK loop
+does today) and then with `POST /evaluation/batch` in chunks of
+`--batch-size`. Each batch runs a single forward pass per evaluator.
+
+    python benchmarks/batch_endpoint.py --items 1000 --batch-size 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+import torch
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_tokenizer, build_torchscript_encoder, synthetic_text  # noqa: E402
+import vizeval.evaluators as evaluators  # noqa: E402
+from vizeval.app.api.routes.evaluation import router as evaluation_router  # noqa: E402
+from vizeval.app.services.evaluation_service import EvaluationService  # noqa: E402
+from vizeval.app.services.repository_service import RepositoryService  # noqa: E402
+from vizeval.app.services.service_provider import get_evaluation_service, get_repository_service  # noqa: E402
+from vizeval.core.entities import EvaluationResult, User  # noqa: E402
+from vizeval.evaluators.base import BaseEvaluator  # noqa: E402
+from vizeval.evaluators.tokenization import tokenize_batch  # noqa: E402
+from vizeval.infrastructure.memory_repository import MemoryRepository  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+
+
+class EncoderEvaluator(BaseEvaluator):
+    """Scores like MedicalEvaluator: tokenize, one forward pass, first logit."""
+    name = "encoder"
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def fast_evaluate(self, request):
+        return self.fast_evaluate_batch([request])[0]
+
+    def fast_evaluate_batch(self, requests):
+        texts = [f"{r.system_prompt}\n{r.user_prompt}\n{r.response}" for r in requests]
+        tokens = tokenize_batch(self.tokenizer, texts, max_length=512)
+        with torch.no_grad():
+            scores = self.model(tokens["input_ids"], tokens["attention_mask"])
+        return [EvaluationResult(evaluator=self.name, score=score)
+                for score in scores.reshape(len(requests), -1)[:, 0].tolist()]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    repository = MemoryRepository()
+    repository.add_user(User(name="benchmark"))
+    service = EvaluationService(repository=repository, queue=MemoryQueue())
+    app.include_router(evaluation_router)
+    app.dependency_overrides[get_evaluation_service] = lambda: service
+    app.dependency_overrides[get_repository_service] = lambda: RepositoryService(repository)
+    return app
+
+
+async def run(items, batch_size: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()),
+                                 base_url="http://bench") as client:
+        start = time.perf_counter()
+        if batch_size <= 1:
+            for item in items:
+                response = await client.post("/evaluation/", json={**item, "api_key": "mock-api-key"})
+                response.raise_for_status()
+        else:
+            for offset in range(0, len(items), batch_size):
+                response = await client.post("/evaluation/batch", json={
+                    "items": items[offset:offset + batch_size],
+                    "api_key": "mock-api-key",
+                })
+                response.raise_for_status()
+        return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=4, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    rng = random.Random(0)
+    items = [{"system_prompt": "s", "user_prompt": "u",
+              "response": synthetic_text(rng.randint(args.words // 2, args.words), rng),
+              "evaluator": EncoderEvaluator.name} for _ in range(args.items)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = torch.jit.load(build_torchscript_encoder(os.path.join(tmp, "encoder.pt")))
+        model.eval()
+        evaluators._evaluators[EncoderEvaluator.name] = EncoderEvaluator(model, build_tokenizer(tmp))
+
+        print(f"items={args.items} words<={args.words} torch_threads={args.threads}")
+        print(f"{'mode':>12} {'items/s':>9}")
+        for label, batch_size in (("per-item", 1), (f"batch-{args.batch_size}", args.batch_size)):
+            print(f"{label:>12} {asyncio.run(run(items, batch_size)):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Process cold start: importing the app versus FastAPI alone, and evaluator warmup.
+
+Runs each step `--repeats` times in a fresh interpreter and reports the median:
+
+- fastapi:       `import fastapi`, the floor for any FastAPI service
+- app:           `import vizeval.main`, everything needed to start serving
+- app + warmup:  the app plus `warmup(--warmup)`, with per-evaluator load times
+
+    python benchmarks/cold_start.py --repeats 5 --warmup medical
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SNIPPET = """
+import json, time
+start = time.perf_counter()
+{imports}
+timings = {warmup}
+print(json.dumps({{"seconds": time.perf_counter() - start, "timings": timings}}))
+"""
+
+
+def run(imports: str, warmup: str = "{}"):
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "cold-start-bench")}
+    output = subprocess.run([sys.executable, "-c", SNIPPET.format(imports=imports, warmup=warmup)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", nargs="*", default=["medical"])
+    args = parser.parse_args()
+
+    steps = {
+        "fastapi": ("import fastapi", "{}"),
+        "app": ("import vizeval.main", "{}"),
+        "app + warmup": ("import vizeval.main\nfrom vizeval.evaluators import warmup",
+                         f"warmup({args.warmup!r})"),
+    }
+    print(f"repeats={args.repeats} warmup={args.warmup}")
+    print(f"{'step':>14} {'seconds':>8}")
+    for step, (imports, warmup) in steps.items():
+        results = [run(imports, warmup) for _ in range(args.repeats)]
+        print(f"{step:>14} {statistics.median(r['seconds'] for r in results):>8.2f}")
+    for name in args.warmup:
+        seconds = statistics.median(r["timings"][name] for r in results)
+        print(f"{'load ' + name:>14} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
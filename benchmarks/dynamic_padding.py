@@ -0,0 +1,83 @@
+"""CPU inference time of max_length vs. longest vs. bucketed padding.
+
+Request lengths follow a log-normal distribution (median ~60 tokens, long
+tail up to the 512 token limit), which matches our mostly-short medical Q&A
+traffic. Each padding mode tokenizes and scores the same requests with a
+synthetic TorchScript encoder.
+
+    python benchmarks/dynamic_padding.py --requests 200 --batch-size 1
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import torch
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_tokenizer, build_torchscript_encoder, synthetic_text  # noqa: E402
+from vizeval.evaluators.tokenization import tokenize_batch  # noqa: E402
+
+MAX_LENGTH = 512
+BUCKETS = (64, 128, 256, 512)
+
+
+def sample_lengths(count: int, rng: random.Random):
+    return [max(4, min(MAX_LENGTH, int(rng.lognormvariate(4.1, 0.7)))) for _ in range(count)]
+
+
+def run(model, tokenizer, texts, batch_size: int, padding: str):
+    shapes = Counter()
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        encoded = tokenize_batch(tokenizer, texts[i:i + batch_size], max_length=MAX_LENGTH,
+                                 padding=padding, buckets=BUCKETS)
+        shapes[encoded["input_ids"].shape[1]] += 1
+        with torch.no_grad():
+            model(encoded["input_ids"], encoded["attention_mask"])
+    elapsed = time.perf_counter() - start
+    return elapsed, shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    rng = random.Random(args.seed)
+    lengths = sample_lengths(args.requests, rng)
+    ordered = sorted(lengths)
+    print(f"requests={args.requests} batch_size={args.batch_size} "
+          f"length p50={ordered[len(ordered) // 2]} p90={ordered[int(len(ordered) * 0.9)]} "
+          f"max={ordered[-1]}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tokenizer = build_tokenizer(tmp)
+        # [CLS] and [SEP] are added by the tokenizer
+        texts = [synthetic_text(length - 2, rng) for length in lengths]
+        model = torch.jit.load(build_torchscript_encoder(os.path.join(tmp, "encoder.pt")))
+        model.eval()
+
+        # Warm up every shape once so the comparison excludes first-call costs
+        for padding in ("max_length", "longest", "bucket"):
+            run(model, tokenizer, texts[:args.batch_size], args.batch_size, padding)
+
+        baseline = None
+        print(f"{'padding':>11} {'total_s':>8} {'ms/req':>8} {'speedup':>8}  shapes")
+        for padding in ("max_length", "longest", "bucket"):
+            elapsed, shapes = run(model, tokenizer, texts, args.batch_size, padding)
+            baseline = baseline or elapsed
+            print(f"{padding:>11} {elapsed:>8.2f} {elapsed / len(texts) * 1000:>8.1f} "
+                  f"{baseline / elapsed:>7.1f}x  {len(shapes)} distinct")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Throughput and memory of POST /evaluation/stream as the upload grows.
+
+Serves the evaluation router with uvicorn on a local port and streams
+`--lines` NDJSON items through one chunked upload, reading results while
+still sending. The cheap dummy evaluator is used so the numbers reflect the
+streaming pipeline itself. Peak Python heap (tracemalloc) should stay flat as
+the line count grows, because at most STREAM_MAX_IN_FLIGHT items are held.
+Detailed jobs are not queued, so the queue does not grow either.
+
+    python benchmarks/evaluation_stream.py --lines 10000 100000
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+import uvicorn
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from vizeval.app.api.routes.evaluation import router as evaluation_router  # noqa: E402
+from vizeval.app.services.evaluation_service import EvaluationService  # noqa: E402
+from vizeval.app.services.repository_service import RepositoryService  # noqa: E402
+from vizeval.app.services.service_provider import get_evaluation_service, get_repository_service  # noqa: E402
+from vizeval.core.entities import User  # noqa: E402
+from vizeval.infrastructure.memory_repository import MemoryRepository  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+
+
+class DiscardingQueue(MemoryQueue):
+    def enqueue_many(self, jobs):
+        pass
+
+
+def start_server() -> int:
+    repository = MemoryRepository()
+    repository.add_user(User(name="benchmark"))
+    service = EvaluationService(repository=repository, queue=DiscardingQueue())
+    app = FastAPI()
+    app.include_router(evaluation_router)
+    app.dependency_overrides[get_evaluation_service] = lambda: service
+    app.dependency_overrides[get_repository_service] = lambda: RepositoryService(repository)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+def upload(lines: int):
+    item = {"system_prompt": "You are a helpful assistant.", "user_prompt": "Tell me about Python.",
+            "evaluator": "dummy"}
+    for i in range(lines):
+        yield (json.dumps({**item, "response": f"Python is a programming language, take {i}."}) + "\n").encode()
+
+
+def send_chunked(sock: socket.socket, path: str, lines: int) -> None:
+    sock.sendall(f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/x-ndjson\r\n"
+                 "Transfer-Encoding: chunked\r\n\r\n".encode())
+    batch = []
+    for line in upload(lines):
+        batch.append(line)
+        if len(batch) == 100:
+            chunk = b"".join(batch)
+            sock.sendall(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            batch = []
+    if batch:
+        chunk = b"".join(batch)
+        sock.sendall(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+    sock.sendall(b"0\r\n\r\n")
+
+
+def count_results(sock: socket.socket) -> int:
+    """Read the chunked response and count result lines, without keeping them."""
+    reader = sock.makefile("rb")
+    while reader.readline() not in (b"\r\n", b""):
+        pass
+    results = 0
+    while True:
+        size = int(reader.readline().strip(), 16)
+        if size == 0:
+            return results
+        results += reader.read(size).count(b"\n")
+        reader.readline()
+
+
+def run(host: str, port: int, lines: int):
+    # Upload and download at the same time, like a streaming client must: a client
+    # that sends the whole body before reading stalls once the server stops reading
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    with socket.create_connection((host, port)) as sock:
+        sender = threading.Thread(target=send_chunked,
+                                  args=(sock, "/evaluation/stream?api_key=mock-api-key", lines))
+        sender.start()
+        received = count_results(sock)
+        sender.join()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    assert received == lines, f"expected {lines} results, got {received}"
+    return lines / elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    port = start_server()
+    tracemalloc.start()
+    print(f"{'lines':>9} {'items/s':>9} {'peak_heap_mb':>13}")
+    for lines in args.lines:
+        rate, peak_mb = run("127.0.0.1", port, lines)
+        print(f"{lines:>9} {rate:>9.0f} {peak_mb:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
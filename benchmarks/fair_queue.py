@@ -0,0 +1,102 @@
+"""Per-tenant wait times under mixed load, FIFO versus fair scheduling.
+
+One tenant submits a large bulk regression suite at once while a few other
+tenants keep sending interactive evaluations at a steady rate. Workers take
+`--service-ms` per job. The wait of every job, from enqueue until a worker
+picks it up, is reported per tenant for `MemoryQueue` (FIFO) and
+`FairQueue`, without and with the bulk job marked as the "bulk" class.
+
+    python benchmarks/fair_queue.py --bulk-jobs 2000 --tenants 3 --service-ms 1
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import percentile  # noqa: E402
+from vizeval.core.entities import EvaluationJob, EvaluationRequest  # noqa: E402
+from vizeval.infrastructure.queue.fair_queue import FairQueue  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+
+
+def make_job(user_id: str, priority=None) -> EvaluationJob:
+    return EvaluationJob(request=EvaluationRequest(system_prompt="s", user_prompt="u", response="r",
+                                                   user_id=user_id, metadata={"priority": priority}
+                                                   if priority else None))
+
+
+def run(queue, args, bulk_priority=None):
+    waits = defaultdict(list)
+    lock = threading.Lock()
+    stop = threading.Event()
+    total = args.bulk_jobs + args.tenants * args.interactive_jobs
+    done = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            job = queue.dequeue(timeout=0.1)
+            if job is None:
+                continue
+            with lock:
+                waits[job.request.user_id].append(time.time() - job.enqueued_at)
+                if sum(len(values) for values in waits.values()) == total:
+                    done.set()
+            time.sleep(args.service_ms / 1000.0)
+
+    def interactive(user_id):
+        for _ in range(args.interactive_jobs):
+            queue.enqueue(make_job(user_id, "interactive" if bulk_priority else None))
+            time.sleep(args.interval_ms / 1000.0)
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(args.workers)]
+    for thread in workers:
+        thread.start()
+
+    for _ in range(args.bulk_jobs):
+        queue.enqueue(make_job("bulk-tenant", bulk_priority))
+    producers = [threading.Thread(target=interactive, args=(f"tenant-{i}",)) for i in range(args.tenants)]
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+
+    done.wait()
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk-jobs", type=int, default=2000)
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--interactive-jobs", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    parser.add_argument("--service-ms", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"bulk_jobs={args.bulk_jobs} tenants={args.tenants} interactive_jobs={args.interactive_jobs} "
+          f"interval={args.interval_ms}ms service={args.service_ms}ms workers={args.workers}")
+    print(f"{'queue':>14} {'tenant':>12} {'jobs':>6} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    scenarios = (
+        ("fifo", MemoryQueue(), None),
+        ("fair", FairQueue(), None),
+        ("fair+priority", FairQueue(), "bulk"),
+    )
+    for label, queue, bulk_priority in scenarios:
+        waits = run(queue, args, bulk_priority)
+        interactive = [wait for user_id, values in waits.items() if user_id != "bulk-tenant"
+                       for wait in values]
+        for tenant, values in (("bulk-tenant", waits["bulk-tenant"]), ("interactive", interactive)):
+            print(f"{label:>14} {tenant:>12} {len(values):>6} {percentile(values, 50) * 1000:>9.1f} "
+                  f"{percentile(values, 95) * 1000:>9.1f} {max(values) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Throughput vs. added latency of FastvalModel micro-batching on CPU.
+
+Runs a fixed number of concurrent client threads against a synthetic
+TorchScript encoder, once per (max_batch_size, max_wait_ms) setting, and
+reports requests/sec, average batch size and p50/p99 latency.
+
+    python benchmarks/fastval_batching.py --clients 32 --seconds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import torch
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_torchscript_encoder, percentile  # noqa: E402
+from vizeval.evaluators.batching import MicroBatcher  # noqa: E402
+
+SETTINGS = [(1, 0.0), (8, 2.0), (16, 5.0), (32, 5.0), (64, 10.0)]
+
+
+def run(model, seq_len: int, clients: int, seconds: float, max_batch_size: int,
+        max_wait_ms: float):
+    def forward(rows):
+        input_ids = torch.stack(rows)
+        with torch.no_grad():
+            scores = model(input_ids, torch.ones_like(input_ids))
+        return scores[:, 0].tolist()
+
+    batcher = MicroBatcher(forward, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def client():
+        row = torch.randint(1000, 2000, (seq_len,))
+        local = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            batcher(row)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    batcher.close()
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "avg_batch": batcher.average_batch_size,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seq-len", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = torch.jit.load(build_torchscript_encoder(os.path.join(tmp, "encoder.pt")))
+        model.eval()
+
+        print(f"clients={args.clients} seq_len={args.seq_len} torch_threads={args.threads}")
+        print(f"{'batch':>6} {'wait_ms':>8} {'req/s':>9} {'avg_batch':>10} {'p50_ms':>9} {'p99_ms':>9}")
+        for max_batch_size, max_wait_ms in SETTINGS:
+            stats = run(model, args.seq_len, args.clients, args.seconds,
+                        max_batch_size, max_wait_ms)
+            print(f"{max_batch_size:>6} {max_wait_ms:>8.1f} {stats['rps']:>9.1f} "
+                  f"{stats['avg_batch']:>10.1f} {stats['p50_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
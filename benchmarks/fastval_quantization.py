@@ -0,0 +1,60 @@
+"""Score drift and CPU speedup of int8 dynamic quantization on a fastval-sized encoder.
+
+Builds a synthetic BERT-shaped encoder (`--hidden`, `--layers`) standing in for
+`fastval.pt`, quantizes it with `quantize_int8` and scores the same random
+inputs with both, once per (batch size, sequence length). PyTorch's fused
+transformer fast path is disabled while tracing so the encoder runs plain
+linear layers, as a traced BERT does.
+
+    python benchmarks/fastval_quantization.py --batches 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import torch
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_torchscript_encoder  # noqa: E402
+from vizeval.evaluators.quantization import compare_scores, quantize_int8  # noqa: E402
+
+SHAPES = [(1, 128), (1, 512), (8, 128), (32, 128)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--hidden", type=int, default=768)
+    parser.add_argument("--layers", type=int, default=12)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.backends.mha.set_fastpath_enabled(False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_torchscript_encoder(os.path.join(tmp, "fastval.pt"), hidden=args.hidden,
+                                         layers=args.layers, heads=12)
+        model = torch.jit.load(path).eval()
+    quantized = quantize_int8(model)
+
+    def scorer(module):
+        def score(input_ids):
+            with torch.no_grad():
+                return module(input_ids, torch.ones_like(input_ids))[:, 0].tolist()
+        return score
+
+    print(f"hidden={args.hidden} layers={args.layers} threads={torch.get_num_threads()}")
+    print(f"{'batch':>5} {'seq':>4} {'fp32_ms':>8} {'int8_ms':>8} {'speedup':>7} "
+          f"{'max_drift':>9} {'mean_drift':>10}")
+    for batch_size, seq_len in SHAPES:
+        batches = [torch.randint(1000, 30000, (batch_size, seq_len)) for _ in range(args.batches)]
+        compare_scores(scorer(model), scorer(quantized), batches[:1])
+        report = compare_scores(scorer(model), scorer(quantized), batches)
+        print(f"{batch_size:>5} {seq_len:>4} {report.fp32_seconds / args.batches * 1000:>8.1f} "
+              f"{report.int8_seconds / args.batches * 1000:>8.1f} {report.speedup:>6.2f}x "
+              f"{report.max_drift:>9.4f} {report.mean_drift:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""LLM calls, tokens and wall time of a repetitive medical workload with and without the LLM cache.
+
+Sends `--evaluations` detailed medical evaluations drawn from `--unique`
+distinct requests, like a regression suite re-running its cases, to a local
+chat completions stub taking `--latency` seconds per call. It runs the
+workload three times:
+
+- bypass:  VIZEVAL_LLM_CACHE_BYPASS, every prompt goes to the model
+- cold:    an empty cache file, repeats within the run are cached
+- warm:    the same file again, as the next run of the suite
+
+    python benchmarks/llm_cache.py --evaluations 100 --unique 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import ChatCompletionsStub  # noqa: E402
+
+from vizeval.core.entities import EvaluationRequest  # noqa: E402
+
+
+def workload(evaluations: int, unique: int):
+    rng = random.Random(0)
+    requests = [
+        EvaluationRequest(system_prompt="You are an informative medical assistant.",
+                          user_prompt=f"Question {i}: what are the symptoms of condition {i}?",
+                          response=f"Condition {i} usually causes fatigue and should be checked by a doctor.",
+                          evaluator="medical")
+        for i in range(unique)
+    ]
+    return [rng.choice(requests) for _ in range(evaluations)]
+
+
+def run(stub, requests, bypass: bool):
+    import vizeval.evaluators.llm_cache as llm_cache
+    from vizeval.evaluators.medical_temp import MedicalEvaluator
+
+    os.environ["VIZEVAL_LLM_CACHE_BYPASS"] = "true" if bypass else "false"
+    llm_cache._cache = None
+    evaluator = MedicalEvaluator()
+    calls_before = stub.calls
+    start = time.perf_counter()
+    for request in requests:
+        evaluator.detailed_evaluate(request)
+    elapsed = time.perf_counter() - start
+    tokens = sum(values["prompt_tokens"] + values["completion_tokens"]
+                 for values in evaluator.usage.stats().values())
+    stats = llm_cache.llm_cache_stats()
+    return elapsed, stub.calls - calls_before, tokens, stats["hit_rate"] if stats else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=100)
+    parser.add_argument("--unique", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    stub = ChatCompletionsStub(args.latency).start()
+    requests = workload(args.evaluations, args.unique)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(OPENAI_API_BASE=stub.url, VIZEVAL_LLM_CACHE_PATH=os.path.join(tmp, "llm.db"))
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+        print(f"evaluations={args.evaluations} unique={args.unique} latency={args.latency}s")
+        print(f"{'run':>6} {'seconds':>8} {'llm_calls':>9} {'tokens':>7} {'hit_rate':>8}")
+        for name, bypass in (("bypass", True), ("cold", False), ("warm", False)):
+            elapsed, calls, tokens, hit_rate = run(stub, requests, bypass)
+            print(f"{name:>6} {elapsed:>8.2f} {calls:>9} {tokens:>7} {hit_rate:>8.2f}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
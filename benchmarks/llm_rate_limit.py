@@ -0,0 +1,109 @@
+"""Outcomes of concurrent medical evaluations against a rate-limited provider, with and without a client budget.
+
+`--workers` threads run `--evaluations` combined-mode fast evaluations (one
+LLM call each) against a local chat completions stub that accepts
+`--provider-rps` calls in any one-second window and answers the rest with a
+429, in three configurations:
+
+- no retries:  VIZEVAL_LLM_MAX_RETRIES=0, every 429 fails the evaluation
+- retries:     jittered retries after the provider's Retry-After, no budget
+- budget:      retries, plus VIZEVAL_LLM_RPM at `--budget-fraction` of the
+               provider's limit
+
+Before the rate limiter, a failed call became a score of -1; now it raises
+`EvaluatorUnavailableError`, counted as "unavailable".
+
+    python benchmarks/llm_rate_limit.py --evaluations 60 --workers 8 --provider-rps 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import ChatCompletionsStub, percentile  # noqa: E402
+
+from vizeval.core.entities import EvaluationRequest  # noqa: E402
+from vizeval.core.interfaces import EvaluatorUnavailableError  # noqa: E402
+
+
+def run(stub, evaluations: int, workers: int):
+    import vizeval.evaluators.rate_limit as rate_limit
+    from vizeval.evaluators.medical_temp import MedicalEvaluator
+
+    rate_limit._limiters.clear()
+    evaluator = MedicalEvaluator(mode="combined", llm_cache=False)
+    requests = [
+        EvaluationRequest(system_prompt="You are an informative medical assistant.",
+                          user_prompt=f"Question {i}: what are the symptoms of condition {i}?",
+                          response=f"Condition {i} usually causes fatigue and should be checked by a doctor.",
+                          evaluator="medical")
+        for i in range(evaluations)
+    ]
+    latencies, outcomes = [], {"scored": 0, "unavailable": 0}
+    lock = threading.Lock()
+
+    def worker(assigned):
+        for request in assigned:
+            start = time.perf_counter()
+            try:
+                evaluator.fast_evaluate(request)
+                outcome = "scored"
+            except EvaluatorUnavailableError:
+                outcome = "unavailable"
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                outcomes[outcome] += 1
+
+    throttled_before = stub.throttled
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(requests[i::workers],)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    limits = rate_limit.llm_limiter_stats()["gpt-4o-mini"]
+    return elapsed, outcomes, stub.throttled - throttled_before, latencies, limits["average_queue_seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--provider-rps", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--budget-fraction", type=float, default=0.9)
+    args = parser.parse_args()
+
+    stub = ChatCompletionsStub(args.latency, requests_per_second=args.provider_rps).start()
+    os.environ["OPENAI_API_BASE"] = stub.url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    print(f"evaluations={args.evaluations} workers={args.workers} provider_rps={args.provider_rps} "
+          f"latency={args.latency}s")
+    print(f"{'config':>10} {'seconds':>8} {'scored':>6} {'unavailable':>11} {'429s':>5} "
+          f"{'p50_s':>6} {'p95_s':>6} {'queue_s':>7}")
+    configs = [
+        ("no retries", {"VIZEVAL_LLM_MAX_RETRIES": "0"}),
+        ("retries", {"VIZEVAL_LLM_MAX_RETRIES": "3"}),
+        ("budget", {"VIZEVAL_LLM_MAX_RETRIES": "3",
+                    "VIZEVAL_LLM_RPM": str(args.provider_rps * 60 * args.budget_fraction)}),
+    ]
+    for name, env in configs:
+        os.environ.pop("VIZEVAL_LLM_RPM", None)
+        os.environ.update(env)
+        elapsed, outcomes, throttled, latencies, queue_seconds = run(stub, args.evaluations, args.workers)
+        print(f"{name:>10} {elapsed:>8.2f} {outcomes['scored']:>6} {outcomes['unavailable']:>11} "
+              f"{throttled:>5} {statistics.median(latencies):>6.2f} {percentile(latencies, 95):>6.2f} "
+              f"{queue_seconds:>7.2f}")
+        # Let the provider's window empty between configurations
+        time.sleep(1.0)
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Wall time and tokens per medical evaluation: sequential, parallel and combined LLM calls.
+
+Runs `medical_temp.MedicalEvaluator` against a local chat completions stub
+that takes `--latency` seconds per call plus `--ms-per-token` per token, in
+two flows:
+
+- detailed:     `detailed_evaluate` without a fast result (a worker job
+                whose fast evaluation failed or was skipped)
+- fast+detailed: `fast_evaluate`, then `detailed_evaluate` with its result,
+                the path of a normal request
+
+"sequential" is the previous behaviour: the risk chain, then the feedback chain.
+
+    python benchmarks/medical_llm_calls.py --evaluations 10 --latency 0.5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import ChatCompletionsStub  # noqa: E402
+
+from vizeval.core.entities import EvaluationRequest  # noqa: E402
+
+REQUEST = EvaluationRequest(
+    system_prompt="You are an informative medical assistant.",
+    user_prompt="What is type 2 diabetes and how is it treated?",
+    response="Type 2 diabetes is a chronic condition where the body does not use insulin well. "
+             "It is usually treated with diet, exercise and medication such as metformin.",
+    evaluator="medical",
+)
+
+
+def sequential_detailed(evaluator, request):
+    inputs = evaluator._inputs(request)
+    score = evaluator.risk_chain.run(inputs).score
+    return score, evaluator.feedback_chain.run(inputs).feedback
+
+
+def run(evaluator, flow: str, sequential: bool, evaluations: int):
+    timings = []
+    for _ in range(evaluations):
+        start = time.perf_counter()
+        if flow == "detailed":
+            if sequential:
+                sequential_detailed(evaluator, REQUEST)
+            else:
+                evaluator.detailed_evaluate(REQUEST)
+        else:
+            evaluator.detailed_evaluate(REQUEST, evaluator.fast_evaluate(REQUEST))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--ms-per-token", type=float, default=1.0)
+    args = parser.parse_args()
+
+    stub = ChatCompletionsStub(args.latency, args.ms_per_token / 1000).start()
+    os.environ["OPENAI_API_BASE"] = stub.url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from vizeval.evaluators.medical_temp import MedicalEvaluator
+
+    print(f"latency={args.latency}s ms_per_token={args.ms_per_token} evaluations={args.evaluations}")
+    print(f"{'flow':>13} {'mode':>10} {'p50_s':>6} {'calls':>6} {'tokens':>7}")
+    cases = [("detailed", "sequential"), ("detailed", "parallel"), ("detailed", "combined"),
+             ("fast+detailed", "parallel"), ("fast+detailed", "combined")]
+    for flow, mode in cases:
+        evaluator = MedicalEvaluator(mode="parallel" if mode == "sequential" else mode)
+        timings = run(evaluator, flow, mode == "sequential", args.evaluations)
+        usage = evaluator.usage.stats().values()
+        calls = sum(values["calls"] for values in usage) / args.evaluations
+        tokens = sum(values["prompt_tokens"] + values["completion_tokens"] for values in usage)
+        print(f"{flow:>13} {mode:>10} {statistics.median(timings):>6.2f} {calls:>6.1f} "
+              f"{tokens / args.evaluations:>7.0f}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
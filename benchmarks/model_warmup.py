@@ -0,0 +1,84 @@
+"""First-request latency of a cold, an optimized and a warmed-up TorchScript model.
+
+Each mode runs in a fresh interpreter on a synthetic BERT-shaped encoder
+(`--hidden`, `--layers`) standing in for `fastval.pt`:
+
+- cold:       `torch.jit.load`, what the models did before
+- optimized:  frozen with `optimize_for_inference`
+- warm:       optimized, then `warmup_model` at every bucket length
+
+It then sends the first request at each bucket length, followed by
+`--repeats` more to get the steady-state latency.
+
+    python benchmarks/model_warmup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_torchscript_encoder  # noqa: E402
+
+BUCKETS = [64, 128, 256, 512]
+
+SNIPPET = """
+import json, time
+import torch
+from vizeval.evaluators.model_loading import optimize_for_inference, warmup_model
+
+start = time.perf_counter()
+model = torch.jit.load({path!r}).eval()
+if {mode!r} != "cold":
+    model = optimize_for_inference(model, optimize=True, shared_weights=False)
+if {mode!r} == "warm":
+    warmup_model(model, torch.device("cpu"), {buckets!r})
+prepare = time.perf_counter() - start
+
+results = {{}}
+with torch.no_grad():
+    for length in {buckets!r}:
+        input_ids = torch.randint(1000, 2000, (1, length))
+        timings = []
+        for _ in range({repeats} + 1):
+            start = time.perf_counter()
+            model(input_ids, torch.ones_like(input_ids))
+            timings.append(time.perf_counter() - start)
+        results[length] = timings
+print(json.dumps({{"prepare": prepare, "results": results}}))
+"""
+
+
+def run(path: str, mode: str, repeats: int):
+    code = SNIPPET.format(path=path, mode=mode, buckets=BUCKETS, repeats=repeats)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--hidden", type=int, default=768)
+    parser.add_argument("--layers", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_torchscript_encoder(os.path.join(tmp, "fastval.pt"), bert_layers=True,
+                                         hidden=args.hidden, layers=args.layers, heads=12)
+        print(f"hidden={args.hidden} layers={args.layers} repeats={args.repeats}")
+        print(f"{'mode':>9} {'prepare_s':>9} {'seq':>4} {'first_ms':>9} {'second_ms':>9} {'steady_ms':>9}")
+        for mode in ("cold", "optimized", "warm"):
+            result = run(path, mode, args.repeats)
+            for length in BUCKETS:
+                timings = [seconds * 1000 for seconds in result["results"][str(length)]]
+                print(f"{mode:>9} {result['prepare']:>9.2f} {length:>4} {timings[0]:>9.1f} "
+                      f"{timings[1]:>9.1f} {statistics.median(timings[1:]):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
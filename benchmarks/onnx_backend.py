@@ -0,0 +1,77 @@
+"""Latency and throughput of the ONNX Runtime backend versus TorchScript on CPU.
+
+Exports a synthetic BERT-shaped encoder (`--hidden`, `--layers`) standing in
+for `fastval.pt` with `export_onnx`, then times both backends on the same
+inputs, once per (batch size, sequence length). Reports the median latency
+per batch, requests/sec and the largest score difference between the two.
+
+    python benchmarks/onnx_backend.py --repeats 10 --threads 1
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import torch
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_torchscript_encoder  # noqa: E402
+from vizeval.evaluators.backends import load_model  # noqa: E402
+from vizeval.evaluators.onnx_runtime import OnnxRuntimeModel, export_onnx  # noqa: E402
+
+SHAPES = [(1, 64), (1, 128), (1, 512), (8, 128), (32, 128)]
+
+
+def median_ms(model, input_ids, attention_mask, repeats: int):
+    timings = []
+    with torch.no_grad():
+        model(input_ids, attention_mask)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            scores = model(input_ids, attention_mask)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--hidden", type=int, default=768)
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads(),
+                        help="torch threads and ONNX Runtime intra-op threads")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = build_torchscript_encoder(os.path.join(tmp, "fastval.pt"), bert_layers=True,
+                                               hidden=args.hidden, layers=args.layers, heads=12)
+        start = time.perf_counter()
+        onnx_path = export_onnx(model_path)
+        export_seconds = time.perf_counter() - start
+        backends = {
+            "torchscript": load_model(model_path, torch.device("cpu"), backend="torchscript"),
+            "onnx": OnnxRuntimeModel(onnx_path, intra_op_threads=args.threads),
+        }
+
+        print(f"hidden={args.hidden} layers={args.layers} threads={args.threads} "
+              f"export={export_seconds:.1f}s")
+        print(f"{'batch':>5} {'seq':>4} {'backend':>11} {'p50_ms':>8} {'req/s':>7} {'max_diff':>9}")
+        for batch_size, seq_len in SHAPES:
+            input_ids = torch.randint(1000, 30000, (batch_size, seq_len))
+            attention_mask = torch.ones_like(input_ids)
+            results = {name: median_ms(model, input_ids, attention_mask, args.repeats)
+                       for name, model in backends.items()}
+            expected = results["torchscript"][1]
+            for name, (ms, scores) in results.items():
+                difference = (scores - expected).abs().max().item()
+                print(f"{batch_size:>5} {seq_len:>4} {name:>11} {ms:>8.1f} "
+                      f"{batch_size / ms * 1000:>7.1f} {difference:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Enqueue-to-start latency of the detailed evaluation worker.
+
+Compares the original polling loop (check `is_empty`, sleep `poll_interval`
+when empty) with the blocking `MemoryQueue.dequeue(timeout)` the worker uses
+now. Jobs arrive at random intervals. The latency is measured from enqueue
+until a worker picks the job up.
+
+    python benchmarks/queue_latency.py --jobs 20 --poll-interval 5
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import percentile  # noqa: E402
+from vizeval.core.entities import EvaluationJob, EvaluationRequest  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+
+
+def polling_worker(queue, poll_interval, on_start, stop):
+    while not stop.is_set():
+        if queue.is_empty():
+            time.sleep(poll_interval)
+            continue
+        on_start(queue.dequeue())
+
+
+def blocking_worker(queue, poll_interval, on_start, stop):
+    while not stop.is_set():
+        job = queue.dequeue(timeout=poll_interval)
+        if job is not None:
+            on_start(job)
+
+
+def run(worker, jobs: int, poll_interval: float, max_gap: float, seed: int):
+    queue = MemoryQueue()
+    rng = random.Random(seed)
+    enqueued_at = {}
+    latencies = []
+    done = threading.Event()
+    stop = threading.Event()
+
+    def on_start(job):
+        latencies.append(time.monotonic() - enqueued_at[job.id])
+        if len(latencies) == jobs:
+            done.set()
+
+    thread = threading.Thread(target=worker, args=(queue, poll_interval, on_start, stop))
+    thread.start()
+    cpu_before = time.process_time()
+    for i in range(jobs):
+        time.sleep(rng.uniform(0, max_gap))
+        job = EvaluationJob(request=EvaluationRequest(system_prompt="s", user_prompt="u",
+                                                      response=str(i)))
+        enqueued_at[job.id] = time.monotonic()
+        queue.enqueue(job)
+    done.wait()
+    cpu = time.process_time() - cpu_before
+    stop.set()
+    thread.join()
+    return latencies, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--max-gap", type=float, default=2.0,
+                        help="maximum seconds between two enqueues")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"jobs={args.jobs} poll_interval={args.poll_interval}s max_gap={args.max_gap}s")
+    print(f"{'worker':>9} {'mean_ms':>9} {'p50_ms':>9} {'p99_ms':>9} {'max_ms':>9} {'cpu_s':>7}")
+    for label, worker in (("polling", polling_worker), ("blocking", blocking_worker)):
+        latencies, cpu = run(worker, args.jobs, args.poll_interval, args.max_gap, args.seed)
+        print(f"{label:>9} {sum(latencies) / len(latencies) * 1000:>9.2f} "
+              f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f} "
+              f"{max(latencies) * 1000:>9.2f} {cpu:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
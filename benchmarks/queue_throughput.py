@@ -0,0 +1,79 @@
+"""Throughput of the in-memory and the durable SQLite evaluation queues.
+
+Enqueues jobs one at a time and in batches, then drains the queue with
+`dequeue_many` and acknowledges every job, the way the worker pool does.
+The SQLite queue is measured with synchronous=NORMAL (fsync batched at
+checkpoints) and synchronous=FULL (fsync on every commit).
+
+    python benchmarks/queue_throughput.py --jobs 5000 --batch-size 64
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from vizeval.core.entities import EvaluationJob, EvaluationRequest  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+from vizeval.infrastructure.queue.sqlite_queue import SqliteQueue  # noqa: E402
+
+
+def make_jobs(count: int):
+    return [
+        EvaluationJob(request=EvaluationRequest(system_prompt="You are a helpful assistant.",
+                                                user_prompt=f"Question {i}",
+                                                response=f"Answer {i} " * 20))
+        for i in range(count)
+    ]
+
+
+def measure(queue, jobs, batch_size: int):
+    start = time.perf_counter()
+    if batch_size <= 1:
+        for job in jobs:
+            queue.enqueue(job)
+    else:
+        for offset in range(0, len(jobs), batch_size):
+            queue.enqueue_many(jobs[offset:offset + batch_size])
+    enqueue_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drained = 0
+    while drained < len(jobs):
+        batch = queue.dequeue_many(max(batch_size, 1))
+        for job in batch:
+            queue.ack(job)
+        drained += len(batch)
+    dequeue_seconds = time.perf_counter() - start
+    return len(jobs) / enqueue_seconds, len(jobs) / dequeue_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    print(f"jobs={args.jobs}")
+    print(f"{'queue':>14} {'batch':>6} {'enqueue/s':>11} {'dequeue+ack/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        backends = (
+            ("memory", lambda name: MemoryQueue()),
+            ("sqlite-normal", lambda name: SqliteQueue(os.path.join(directory, f"{name}.db"))),
+            ("sqlite-full", lambda name: SqliteQueue(os.path.join(directory, f"{name}.db"),
+                                                     synchronous="FULL")),
+        )
+        for label, factory in backends:
+            for batch_size in (1, args.batch_size):
+                queue = factory(f"{label}-{batch_size}")
+                enqueue_rate, dequeue_rate = measure(queue, jobs, batch_size)
+                print(f"{label:>14} {batch_size:>6} {enqueue_rate:>11.0f} {dequeue_rate:>14.0f}")
+                if isinstance(queue, SqliteQueue):
+                    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Listing a user's evaluations from MemoryRepository with many stored evaluations.
+
+Stores `--evaluations` evaluations spread round-robin over `--users` users,
+then pages through one user's evaluations three ways:
+
+- scan:   the original list comprehension over every evaluation, then a slice
+- offset: `list_evaluations(limit, offset)` on the per-user index
+- keyset: `list_evaluations_page(limit, cursor)`
+
+and reports the mean time per page.
+
+    python benchmarks/repository_pagination.py --evaluations 1000000 --users 10000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from vizeval.core.entities import Evaluation  # noqa: E402
+from vizeval.infrastructure.memory_repository import MemoryRepository  # noqa: E402
+
+
+def fill(repository: MemoryRepository, evaluations: int, users: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(evaluations):
+        repository.store_evaluation(Evaluation(
+            system_prompt="s", user_prompt="u", response=str(i), user_id=f"user-{i % users}",
+            evaluator="medical" if i % 3 else "dummy", score=0.5,
+            created_at=start + timedelta(milliseconds=i),
+        ))
+
+
+def scan_page(repository: MemoryRepository, user_id: str, limit: int, offset: int):
+    user_evaluations = [e for e in repository.evaluations.values() if e.user_id == user_id]
+    return user_evaluations[offset:offset + limit]
+
+
+def time_pages(fetch, pages: int) -> float:
+    start = time.perf_counter()
+    for page in range(pages):
+        fetch(page)
+    return (time.perf_counter() - start) / pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--scan-pages", type=int, default=5,
+                        help="pages timed for the full scan, which is slow")
+    args = parser.parse_args()
+
+    repository = MemoryRepository()
+    start = time.perf_counter()
+    fill(repository, args.evaluations, args.users)
+    print(f"stored {args.evaluations} evaluations for {args.users} users "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    user_id = "user-0"
+    per_user = len(repository.list_evaluations(user_id, limit=args.evaluations))
+    pages = max(1, per_user // args.limit)
+
+    cursors = [None]
+    for _ in range(pages):
+        cursors.append(repository.list_evaluations_page(user_id, limit=args.limit,
+                                                        cursor=cursors[-1]).next_cursor)
+
+    results = {
+        "scan": time_pages(lambda page: scan_page(repository, user_id, args.limit, page * args.limit),
+                           min(pages, args.scan_pages)),
+        "offset": time_pages(lambda page: repository.list_evaluations(user_id, args.limit,
+                                                                      page * args.limit), pages),
+        "keyset": time_pages(lambda page: repository.list_evaluations_page(user_id, args.limit,
+                                                                           cursors[page]), pages),
+    }
+
+    print(f"user has {per_user} evaluations, {pages} pages of {args.limit}")
+    print(f"{'method':>8} {'ms/page':>10}")
+    for method, seconds in results.items():
+        print(f"{method:>8} {seconds * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
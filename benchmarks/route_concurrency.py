@@ -0,0 +1,149 @@
+"""Latency of cheap endpoints while evaluations are in flight.
+
+Serves /health and the repository-backed GET /user/evaluations next to the
+evaluation route with a blocking evaluator (`time.sleep`, standing in for an
+OpenAI or torch call). Half of the run uses a route that calls the synchronous
+`EvaluationService.evaluate`, like the original code. The other half uses the
+real router, which awaits `aevaluate`. Reports the p50/p99 of both probes and
+evaluation throughput for both. With fewer `--threads` than evaluation
+clients, the evaluation pool is saturated; /user/evaluations must not wait
+for it.
+
+    python benchmarks/route_concurrency.py --evaluation-clients 16 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import percentile  # noqa: E402
+import vizeval.evaluators as evaluators  # noqa: E402
+from vizeval.app.api.routes.evaluation import router as evaluation_router  # noqa: E402
+from vizeval.app.api.routes.user import router as user_router  # noqa: E402
+from vizeval.app.api.schemas.evaluation import EvaluationRequest  # noqa: E402
+from vizeval.app.services.evaluation_service import EvaluationService  # noqa: E402
+from vizeval.app.services.repository_service import RepositoryService  # noqa: E402
+from vizeval.app.services.service_provider import get_evaluation_service, get_repository_service  # noqa: E402
+from vizeval.core.entities import EvaluationRequest as CoreEvaluationRequest  # noqa: E402
+from vizeval.core.entities import EvaluationResult, User  # noqa: E402
+from vizeval.core.executor import configure_executor  # noqa: E402
+from vizeval.evaluators.base import BaseEvaluator  # noqa: E402
+from vizeval.infrastructure.memory_repository import MemoryRepository  # noqa: E402
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue  # noqa: E402
+
+
+class BlockingEvaluator(BaseEvaluator):
+    name = "blocking"
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def fast_evaluate(self, request):
+        time.sleep(self.seconds)
+        return EvaluationResult(evaluator=self.name, score=0.5)
+
+
+def build_app(blocking_route: bool) -> FastAPI:
+    app = FastAPI()
+    repository = MemoryRepository()
+    repository.add_user(User(name="benchmark"))
+    service = EvaluationService(repository=repository, queue=MemoryQueue())
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    app.include_router(user_router)
+    app.dependency_overrides[get_repository_service] = lambda: RepositoryService(repository)
+
+    if blocking_route:
+        @app.post("/evaluation/", status_code=201)
+        async def create_evaluation(request: EvaluationRequest):
+            core_request = CoreEvaluationRequest(
+                system_prompt=request.system_prompt,
+                user_prompt=request.user_prompt,
+                response=request.response,
+                evaluator=request.evaluator,
+                metadata=request.metadata,
+            )
+            result = service.evaluate(core_request)
+            return {"evaluator": core_request.evaluator, "score": result.score}
+    else:
+        app.include_router(evaluation_router)
+        app.dependency_overrides[get_evaluation_service] = lambda: service
+
+    return app
+
+
+async def run(app: FastAPI, evaluation_clients: int, seconds: float):
+    payload = {
+        "system_prompt": "You are a medical assistant.",
+        "user_prompt": "How should I treat a migraine?",
+        "response": "Rest in a dark room and ask a doctor before taking medication.",
+        "evaluator": "blocking",
+        "api_key": "mock-api-key",
+    }
+    latencies = {"/health": [], "/user/evaluations?api_key=mock-api-key": []}
+    evaluations = 0
+    stop_at = time.monotonic() + seconds
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://bench") as client:
+        async def evaluation_client():
+            nonlocal evaluations
+            while time.monotonic() < stop_at:
+                await client.post("/evaluation/", json=payload)
+                evaluations += 1
+
+        async def probe_client(path):
+            # Latency is measured from when each probe was due, so time spent
+            # waiting for a blocked event loop is counted
+            due = time.monotonic()
+            while due < stop_at:
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+                await client.get(path)
+                latencies[path].append(time.monotonic() - due)
+                due = max(due + 0.02, time.monotonic())
+
+        await asyncio.gather(*(probe_client(path) for path in latencies),
+                             *(evaluation_client() for _ in range(evaluation_clients)))
+
+    health, listing = latencies.values()
+    return {
+        "eval_rps": evaluations / seconds,
+        "health_p50_ms": percentile(health, 50) * 1000,
+        "health_p99_ms": percentile(health, 99) * 1000,
+        "list_p50_ms": percentile(listing, 50) * 1000,
+        "list_p99_ms": percentile(listing, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluation-clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--evaluation-ms", type=float, default=100.0)
+    parser.add_argument("--threads", type=int, default=32, help="evaluation thread pool size")
+    args = parser.parse_args()
+
+    configure_executor(args.threads)
+    evaluators._evaluators[BlockingEvaluator.name] = BlockingEvaluator(args.evaluation_ms / 1000)
+
+    print(f"evaluation_clients={args.evaluation_clients} evaluation_ms={args.evaluation_ms} "
+          f"threads={args.threads}")
+    print(f"{'route':>10} {'eval/s':>8} {'health_p50_ms':>14} {'health_p99_ms':>14} "
+          f"{'list_p50_ms':>12} {'list_p99_ms':>12}")
+    for label, blocking_route in (("blocking", True), ("offloaded", False)):
+        stats = asyncio.run(run(build_app(blocking_route), args.evaluation_clients, args.seconds))
+        print(f"{label:>10} {stats['eval_rps']:>8.1f} {stats['health_p50_ms']:>14.1f} "
+              f"{stats['health_p99_ms']:>14.1f} {stats['list_p50_ms']:>12.1f} {stats['list_p99_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Memory of N worker processes holding the same TorchScript model, with and without shared weights.
+
+Builds a synthetic BERT-shaped encoder (`--hidden`, `--layers`) standing in
+for `fastval.pt`, then starts 1, 4 and 8 spawned processes that each load it
+with `load_torchscript` and score one batch, like uvicorn or process-mode
+workers would. Reports the summed RSS and PSS of the workers. PSS splits
+shared pages between the processes that map them, so it is the memory the
+workers really cost. With shared weights it should grow by the per-process
+overhead only, not by the size of the model.
+
+    python benchmarks/shared_weights_memory.py --workers 1 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _synthetic import build_torchscript_encoder  # noqa: E402
+
+
+def worker(model_path: str, shared_weights: bool, ready, done) -> None:
+    import torch
+    from vizeval.evaluators.model_loading import load_torchscript
+
+    start = time.perf_counter()
+    model = load_torchscript(model_path, torch.device("cpu"), shared_weights=shared_weights)
+    input_ids = torch.randint(0, 1000, (4, 64))
+    with torch.no_grad():
+        model(input_ids, torch.ones_like(input_ids))
+    ready.put((os.getpid(), time.perf_counter() - start))
+    done.wait()
+
+
+def memory_mb(pid: int):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values["Rss"], values["Pss"]
+
+
+def run(model_path: str, workers: int, shared_weights: bool):
+    context = multiprocessing.get_context("spawn")
+    ready, done = context.Queue(), context.Event()
+    processes = [context.Process(target=worker, args=(model_path, shared_weights, ready, done))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    loaded = [ready.get() for _ in processes]
+    usage = [memory_mb(pid) for pid, _ in loaded]
+    done.set()
+    for process in processes:
+        process.join()
+    return (sum(rss for rss, _ in usage), sum(pss for _, pss in usage),
+            max(seconds for _, seconds in loaded))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--hidden", type=int, default=512)
+    parser.add_argument("--layers", type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = build_torchscript_encoder(os.path.join(tmp, "fastval.pt"), hidden=args.hidden,
+                                               heads=8, layers=args.layers)
+        # Split once up front, as the first worker to start would
+        run(model_path, 1, shared_weights=True)
+
+        print(f"model={os.path.getsize(model_path) / 2 ** 20:.0f}MB")
+        print(f"{'workers':>7} {'mode':>7} {'rss_mb':>8} {'pss_mb':>8} {'load_s':>7}")
+        for workers in args.workers:
+            for shared_weights in (False, True):
+                rss, pss, seconds = run(model_path, workers, shared_weights)
+                mode = "shared" if shared_weights else "copy"
+                print(f"{workers:>7} {mode:>7} {rss:>8.0f} {pss:>8.0f} {seconds:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Repository requests/s from async code under concurrent load: sync versus async Supabase store.
+
+Starts a local PostgREST-compatible stub that answers after `--latency-ms`,
+then runs `--concurrency` coroutines, each looking up a user by API key and
+listing a page of their evaluations, like GET /user/evaluations does, until
+`--requests` lookups are done. Three ways of calling the repository:
+
+- sync:    SupabaseStore methods called directly, blocking the event loop
+- thread:  SupabaseStore through the default `a*` methods on the thread pool
+- async:   AsyncSupabaseStore on a pooled keep-alive httpx.AsyncClient
+
+    python benchmarks/supabase_repository.py --requests 500 --concurrency 100 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from vizeval.core.executor import configure_executor, DEFAULT_MAX_WORKERS
+from vizeval.infrastructure.supabase.async_supabase_store import AsyncSupabaseStore
+from vizeval.infrastructure.supabase.supabase_store import SupabaseStore
+
+USER = [{"id": "user-a", "name": "Bench User", "api_key": "bench-api-key"}]
+
+
+class PostgrestStub(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, Nagle would delay the body on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = json.dumps(USER if self.path.startswith("/rest/v1/users") else []).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def run(store, mode: str, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def client():
+        for _ in remaining:
+            if mode == "sync":
+                user = store.get_user_from_api_key("bench-api-key")
+                store.list_evaluations_page(user.id, limit=100)
+            else:
+                user = await store.aget_user_from_api_key("bench-api-key")
+                await store.alist_evaluations_page(user.id, limit=100)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await store.aclose()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="simulated round trip per Supabase request")
+    args = parser.parse_args()
+
+    stub = PostgrestStub(args.latency_ms / 1000)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    configure_executor(DEFAULT_MAX_WORKERS)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} pool_size={args.pool_size} "
+          f"threads={DEFAULT_MAX_WORKERS} latency={args.latency_ms}ms")
+    print(f"{'mode':>8} {'requests/s':>11}")
+    for mode in ("sync", "thread", "async"):
+        if mode == "async":
+            store = AsyncSupabaseStore(stub.url, "bench-key", pool_size=args.pool_size)
+        else:
+            store = SupabaseStore(stub.url, "bench-key")
+        rate = asyncio.run(run(store, mode, args.requests, args.concurrency))
+        print(f"{mode:>8} {rate:>11.0f}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Evaluation write throughput to Supabase at different write batch sizes.
+
+Starts a local PostgREST-compatible stub that accepts inserts into
+/rest/v1/evaluations after `--latency-ms` of simulated round trip, then
+stores `--rows` evaluations through `SupabaseStore` with each
+`--batch-sizes` value and reports rows/s until `close()` has flushed them
+all. A batch size of 1 is the synchronous one-insert-per-evaluation path.
+
+    python benchmarks/supabase_write_buffer.py --rows 5000 --batch-sizes 1 10 100 500
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from vizeval.core.entities import Evaluation
+from vizeval.infrastructure.supabase.supabase_store import SupabaseStore
+
+
+class PostgrestStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.latency = latency
+        self.rows = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, Nagle would delay the body on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.rows += len(body) if isinstance(body, list) else 1
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def run(stub: PostgrestStub, rows: int, batch_size: int) -> float:
+    store = SupabaseStore(stub.url, "bench-key", write_batch_size=batch_size,
+                          max_buffered_writes=max(rows, batch_size))
+    stub.rows = 0
+    start = time.perf_counter()
+    for i in range(rows):
+        store.store_evaluation(Evaluation(
+            system_prompt="You are a helpful assistant.", user_prompt="Tell me about Python.",
+            response=f"Python is a programming language, take {i}.", user_id="user-a",
+            evaluator="dummy", score=0.5,
+        ))
+    store.close()
+    elapsed = time.perf_counter() - start
+    assert stub.rows == rows, f"expected {rows} rows, stub received {stub.rows}"
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="simulated round trip per insert request")
+    args = parser.parse_args()
+
+    stub = PostgrestStub(args.latency_ms / 1000)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    print(f"rows={args.rows} latency={args.latency_ms}ms")
+    print(f"{'batch_size':>10} {'rows/s':>9}")
+    for batch_size in args.batch_sizes:
+        print(f"{batch_size:>10} {run(stub, args.rows, batch_size):>9.0f}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Exporting all of a user's evaluations: one JSON array versus the NDJSON stream.
+
+Stores `--evaluations` evaluations with `--prompt-chars` long prompts for one
+user in a MemoryRepository, then exports them three ways and reports time
+and peak Python heap (tracemalloc):
+
+- array:     every evaluation converted with `Evaluation.from_core` and
+             serialized as one JSON array, as GET /user/evaluations did
+             before it was paginated
+- stream:    GET /user/evaluations/stream with all fields
+- projected: GET /user/evaluations/stream?fields=score,evaluator,metadata
+
+The stream body is consumed chunk by chunk and discarded, like a client
+writing it to disk would.
+
+    python benchmarks/user_evaluations.py --evaluations 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+
+from vizeval.app.api.routes.user import stream_user_evaluations
+from vizeval.app.api.schemas.evaluation import Evaluation as EvaluationSchema
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.core.entities import Evaluation, User
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+def fill(repository: MemoryRepository, evaluations: int, prompt_chars: int) -> None:
+    repository.add_user(User(name="Bench User"))
+    prompt = "x" * prompt_chars
+    for i in range(evaluations):
+        repository.store_evaluation(Evaluation(
+            system_prompt=prompt, user_prompt=prompt, response=prompt, user_id="mock-user-id",
+            evaluator="medical" if i % 3 else "dummy", score=i % 100 / 100, metadata={"run": i % 7},
+        ))
+
+
+async def export_array(service: RepositoryService, evaluations: int) -> int:
+    user = await service.aget_user_from_api_key("mock-api-key")
+    rows = await service.repository.alist_evaluations(user.id, limit=evaluations)
+    body = json.dumps(jsonable_encoder([EvaluationSchema.from_core(row) for row in rows]))
+    return len(body)
+
+
+async def export_stream(service: RepositoryService, fields) -> int:
+    response = await stream_user_evaluations(
+        api_key="mock-api-key", cursor=None, evaluator=None, min_score=None, max_score=None,
+        created_after=None, created_before=None, fields=fields, repository_service=service,
+    )
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+def measure(coroutine):
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    size = asyncio.run(coroutine)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return elapsed, peak / 2 ** 20, size / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    parser.add_argument("--prompt-chars", type=int, default=200)
+    args = parser.parse_args()
+
+    repository = MemoryRepository()
+    fill(repository, args.evaluations, args.prompt_chars)
+    service = RepositoryService(repository)
+
+    tracemalloc.start()
+    print(f"evaluations={args.evaluations} prompt_chars={args.prompt_chars}")
+    print(f"{'mode':>10} {'seconds':>8} {'peak_heap_mb':>13} {'body_mb':>8}")
+    for mode, coroutine in (
+        ("array", lambda: export_array(service, args.evaluations)),
+        ("stream", lambda: export_stream(service, None)),
+        ("projected", lambda: export_stream(service, "score,evaluator,metadata")),
+    ):
+        elapsed, peak_mb, body_mb = measure(coroutine())
+        print(f"{mode:>10} {elapsed:>8.2f} {peak_mb:>13.1f} {body_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,292 @@
-from fastapi import APIRouter, Depends, status
+import asyncio
+import json
+import math
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from pydantic import ValidationError
 
 from vizeval.app.api.schemas.evaluation import (
     EvaluationRequest, 
     EvaluationResponse,
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
+    BatchEvaluationItem,
+    BatchEvaluationItemResponse,
 )
 from vizeval.core.entities import EvaluationRequest as CoreEvaluationRequest
+from vizeval.core.interfaces import EvaluatorUnavailableError, QueueFullError
 from vizeval.app.services.evaluation_service import EvaluationService
-from vizeval.app.services.service_provider import get_evaluation_service
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.app.services.service_provider import get_evaluation_service, get_repository_service
 
 router = APIRouter(prefix="/evaluation", tags=["evaluation"])
 
+# Items read from a stream but not yet answered. Once reached, the upload is no
+# longer read, so TCP flow control slows the client down.
+STREAM_MAX_IN_FLIGHT = 256
+# Items evaluated together while streaming, like one /evaluation/batch call
+STREAM_BATCH_SIZE = 64
+STREAM_MAX_LINE_BYTES = 1024 * 1024
+
 
 @router.post("/", response_model=EvaluationResponse, status_code=status.HTTP_201_CREATED)
 async def create_evaluation(
     request: EvaluationRequest,
-    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+    evaluation_service: EvaluationService = Depends(get_evaluation_service),
+    repository_service: RepositoryService = Depends(get_repository_service)
 ):
     """Create a new evaluation.
     
     If async_evaluation is True, queues the evaluation and returns a status response.
     If async_evaluation is False, performs the evaluation synchronously and returns the evaluation score and feedback.
     """
+    user_id = await _resolve_user_id(request.api_key, repository_service)
     core_request = CoreEvaluationRequest(
         system_prompt=request.system_prompt,
         user_prompt=request.user_prompt,
         response=request.response,
         evaluator=request.evaluator,
+        user_id=user_id,
         metadata=request.metadata,
     )
 
-    result = evaluation_service.evaluate(core_request)
+    detailed_evaluation = "queued"
+    try:
+        # Blocking evaluators run on the evaluation thread pool, not the event loop
+        result = await evaluation_service.aevaluate(core_request)
+    except QueueFullError as e:
+        if evaluation_service.overload_policy != "degrade":
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
+        result = await evaluation_service.aevaluate(core_request, queue_detailed=False)
+        detailed_evaluation = "skipped"
+    except EvaluatorUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
     
     return EvaluationResponse(
         evaluator=core_request.evaluator,
         score=result.score,
-        feedback=result.feedback
-    )
\ No newline at end of file
+        feedback=result.feedback,
+        detailed_evaluation=detailed_evaluation,
+    )
+
+
+@router.post("/batch", response_model=BatchEvaluationResponse, status_code=status.HTTP_201_CREATED)
+async def create_evaluation_batch(
+    request: BatchEvaluationRequest,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service),
+    repository_service: RepositoryService = Depends(get_repository_service)
+):
+    """Create evaluations for many responses at once.
+
+    Items are grouped by evaluator and scored with one batched fast evaluation per
+    evaluator, and their detailed evaluations are queued together. Results are
+    returned in request order; an item that failed carries an `error` instead of a score.
+    """
+    user_id = await _resolve_user_id(request.api_key, repository_service)
+    core_requests = [
+        CoreEvaluationRequest(
+            system_prompt=item.system_prompt,
+            user_prompt=item.user_prompt,
+            response=item.response,
+            evaluator=item.evaluator,
+            user_id=user_id,
+            metadata=item.metadata,
+        )
+        for item in request.items
+    ]
+
+    detailed_evaluation = "queued"
+    try:
+        results = await evaluation_service.aevaluate_batch(core_requests)
+    except QueueFullError as e:
+        if evaluation_service.overload_policy != "degrade":
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
+        results = await evaluation_service.aevaluate_batch(core_requests, queue_detailed=False)
+        detailed_evaluation = "skipped"
+
+    items = []
+    for core_request, result in zip(core_requests, results):
+        if isinstance(result, Exception):
+            items.append(BatchEvaluationItemResponse(evaluator=core_request.evaluator,
+                                                     detailed_evaluation="skipped",
+                                                     error=str(result)))
+        else:
+            items.append(BatchEvaluationItemResponse(evaluator=core_request.evaluator,
+                                                     score=result.score,
+                                                     feedback=result.feedback,
+                                                     detailed_evaluation=detailed_evaluation))
+    return BatchEvaluationResponse(results=items)
+
+
+@router.post("/stream", status_code=status.HTTP_200_OK)
+async def create_evaluation_stream(
+    request: Request,
+    api_key: str,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service),
+    repository_service: RepositoryService = Depends(get_repository_service)
+):
+    """Evaluate a newline-delimited JSON upload and stream NDJSON results back.
+
+    Every line of the body is an item like those of /evaluation/batch. Results are
+    written as soon as their fast evaluation completes, so they can arrive out of
+    order; each carries the zero-based `index` of its input line. Invalid lines get
+    an `error` result and do not stop the stream. At most STREAM_MAX_IN_FLIGHT
+    items are held at a time, so memory stays constant however long the upload is.
+    Clients must read results while uploading: once STREAM_MAX_IN_FLIGHT results are
+    waiting to be read, the server stops reading the upload.
+    """
+    user_id = await _resolve_user_id(api_key, repository_service)
+    return _DuplexStreamingResponse(
+        _stream_results(_read_lines(request.stream()), evaluation_service, user_id),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _resolve_user_id(api_key: str, repository_service: RepositoryService) -> str:
+    # Goes through the API key cache, so evaluations rarely wait for the repository
+    user = await repository_service.aget_user_from_api_key(api_key)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid API key")
+    return user.id
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """A StreamingResponse that may be sent while the request body is still being read.
+
+    StreamingResponse normally listens for a disconnect on `receive` in the
+    background, which would steal body chunks from `request.stream()`. Here the
+    body reader owns `receive` and notices the disconnect itself.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+async def _read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """Split an upload into numbered lines, yielding the complete lines of each received chunk."""
+    buffer = b""
+    index = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > STREAM_MAX_LINE_BYTES:
+            raise ValueError(f"Line {index + len(lines)} is longer than {STREAM_MAX_LINE_BYTES} bytes")
+        numbered = []
+        for line in lines:
+            if line.strip():
+                numbered.append((index, line))
+                index += 1
+        if numbered:
+            yield numbered
+    if buffer.strip():
+        yield [(index, buffer)]
+
+
+async def _stream_results(batches: AsyncIterator[List[Tuple[int, bytes]]],
+                          evaluation_service: EvaluationService, user_id: str) -> AsyncIterator[bytes]:
+    results: asyncio.Queue = asyncio.Queue()
+    in_flight = asyncio.Semaphore(STREAM_MAX_IN_FLIGHT)
+    tasks = set()
+
+    async def evaluate(items: List[Tuple[int, CoreEvaluationRequest]]) -> None:
+        for output in await _evaluate_stream_batch(items, evaluation_service):
+            await results.put(output)
+
+    async def produce() -> None:
+        try:
+            async for lines in batches:
+                pending = []
+                for index, line in lines:
+                    if pending and in_flight.locked():
+                        # Evaluate what we hold instead of waiting on ourselves
+                        tasks.add(asyncio.ensure_future(evaluate(pending)))
+                        pending = []
+                    await in_flight.acquire()
+                    try:
+                        item = BatchEvaluationItem.model_validate_json(line)
+                    except ValidationError as e:
+                        await results.put({"index": index, "error": _validation_message(e)})
+                        continue
+                    pending.append((index, CoreEvaluationRequest(
+                        system_prompt=item.system_prompt,
+                        user_prompt=item.user_prompt,
+                        response=item.response,
+                        evaluator=item.evaluator,
+                        user_id=user_id,
+                        metadata=item.metadata,
+                    )))
+                    # Do not wait for the rest of a chunk once a batch is full
+                    if len(pending) == STREAM_BATCH_SIZE:
+                        tasks.add(asyncio.ensure_future(evaluate(pending)))
+                        pending = []
+                if pending:
+                    tasks.add(asyncio.ensure_future(evaluate(pending)))
+                tasks.difference_update([task for task in tasks if task.done()])
+            if tasks:
+                await asyncio.gather(*tasks)
+        except Exception as e:
+            await results.put({"error": f"Stream aborted: {str(e)}"})
+        finally:
+            await results.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            output = await results.get()
+            if output is None:
+                break
+            yield (json.dumps(output) + "\n").encode()
+            if "index" in output:
+                # An item only stops counting once its result has been sent
+                in_flight.release()
+    finally:
+        # The client went away: stop reading and evaluating
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
+
+
+async def _evaluate_stream_batch(items: List[Tuple[int, CoreEvaluationRequest]],
+                                 evaluation_service: EvaluationService) -> List[Dict[str, Any]]:
+    requests = [request for _, request in items]
+    detailed_evaluation = "queued"
+    try:
+        results = await evaluation_service.aevaluate_batch(requests)
+    except QueueFullError as e:
+        if evaluation_service.overload_policy != "degrade":
+            return [{"index": index, "evaluator": request.evaluator, "error": str(e),
+                     "retry_after": e.retry_after} for index, request in items]
+        results = await evaluation_service.aevaluate_batch(requests, queue_detailed=False)
+        detailed_evaluation = "skipped"
+
+    outputs = []
+    for (index, request), result in zip(items, results):
+        if isinstance(result, Exception):
+            outputs.append({"index": index, "evaluator": request.evaluator, "error": str(result)})
+        else:
+            outputs.append({"index": index, "evaluator": request.evaluator, "score": result.score,
+                            "feedback": result.feedback, "detailed_evaluation": detailed_evaluation})
+    return outputs
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, detail['loc'])) or 'line'}: {detail['msg']}"
+                     for detail in error.errors())
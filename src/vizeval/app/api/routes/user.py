@@ -1,21 +1,32 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
+import json
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
 from vizeval.app.api.schemas.user import UserCreate, UserResponse
 from vizeval.app.services.repository_service import RepositoryService
 from vizeval.app.api.schemas.evaluation import Evaluation
-from vizeval.core.entities import User as CoreUser
+from vizeval.core.entities import Evaluation as CoreEvaluation, EvaluationFilter, User as CoreUser
+from vizeval.core.interfaces import VizevalRepository
 from vizeval.app.services.service_provider import get_repository_service
 
 router = APIRouter(prefix="/user", tags=["user"])
 
+# Evaluations fetched per repository query while streaming
+STREAM_PAGE_SIZE = 500
+# Result lines sent per chunk while streaming
+STREAM_CHUNK_LINES = 100
+# Fields that `fields` may select
+EVALUATION_FIELDS = tuple(Evaluation.model_fields)
+
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserCreate,
     repository_service: RepositoryService = Depends(get_repository_service)
 ):
     """Create a new user and return their API key."""
-    user_api_key = repository_service.add_user(CoreUser(name=user.name))
+    user_api_key = await repository_service.aadd_user(CoreUser(name=user.name))
     return UserResponse(
         name=user.name,
         api_key=user_api_key,
@@ -24,8 +35,115 @@ async def create_user(
 @router.get("/evaluations", response_model=List[Evaluation])
 async def get_user_evaluations(
     api_key: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    evaluator: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
     repository_service: RepositoryService = Depends(get_repository_service)
 ):
-    """Get all evaluations for a user by their API key."""
-    core_evaluations = repository_service.get_evaluations_by_api_key(api_key)
-    return [Evaluation.from_core(core_evaluation) for core_evaluation in core_evaluations]
\ No newline at end of file
+    """Get a page of evaluations for a user by their API key, oldest first.
+
+    When more evaluations follow, the `X-Next-Cursor` response header holds the
+    `cursor` to pass to get the next page. `fields` is a comma-separated list of
+    the fields to return, e.g. `score,evaluator,metadata`; all fields by default.
+    """
+    projection = _parse_fields(fields)
+    filters = _parse_filters(min_score, max_score, created_after, created_before)
+    try:
+        page = await repository_service.aget_evaluations_page_by_api_key(api_key, limit=limit,
+                                                                          cursor=cursor, evaluator=evaluator,
+                                                                          filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if projection is not None:
+        headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor is not None else None
+        return JSONResponse([_project(evaluation, projection) for evaluation in page.evaluations],
+                            headers=headers)
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [Evaluation.from_core(core_evaluation) for core_evaluation in page.evaluations]
+
+
+@router.get("/evaluations/stream")
+async def stream_user_evaluations(
+    api_key: str,
+    cursor: Optional[str] = None,
+    evaluator: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    repository_service: RepositoryService = Depends(get_repository_service)
+):
+    """Stream all of a user's evaluations as newline-delimited JSON, oldest first.
+
+    Takes the same filters and `fields` as GET /user/evaluations. Evaluations are
+    read from the repository STREAM_PAGE_SIZE at a time, so memory stays constant
+    however many evaluations the user has.
+    """
+    projection = _parse_fields(fields)
+    filters = _parse_filters(min_score, max_score, created_after, created_before)
+    try:
+        if cursor is not None:
+            VizevalRepository.decode_cursor(cursor)
+        user = await repository_service.aget_user_from_api_key(api_key)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid API key")
+
+    evaluations = repository_service.aiter_evaluations(user, page_size=STREAM_PAGE_SIZE, cursor=cursor,
+                                                       evaluator=evaluator, filters=filters)
+    return StreamingResponse(_ndjson_lines(evaluations, projection), media_type="application/x-ndjson")
+
+
+async def _ndjson_lines(evaluations: AsyncIterator[CoreEvaluation],
+                        projection: Optional[Sequence[str]]) -> AsyncIterator[str]:
+    lines = []
+    async for evaluation in evaluations:
+        lines.append(json.dumps(_project(evaluation, projection or EVALUATION_FIELDS)) + "\n")
+        if len(lines) == STREAM_CHUNK_LINES:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    projection = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in projection if field not in EVALUATION_FIELDS]
+    if unknown or not projection:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown fields {unknown}, expected some of {list(EVALUATION_FIELDS)}")
+    return projection
+
+
+def _parse_filters(min_score: Optional[float], max_score: Optional[float],
+                   created_after: Optional[datetime],
+                   created_before: Optional[datetime]) -> Optional[EvaluationFilter]:
+    if min_score is None and max_score is None and created_after is None and created_before is None:
+        return None
+    # Evaluation times are stored in UTC, a time without a timezone is taken as UTC
+    if created_after is not None and created_after.tzinfo is None:
+        created_after = created_after.replace(tzinfo=timezone.utc)
+    if created_before is not None and created_before.tzinfo is None:
+        created_before = created_before.replace(tzinfo=timezone.utc)
+    return EvaluationFilter(min_score=min_score, max_score=max_score,
+                            created_after=created_after, created_before=created_before)
+
+
+def _project(evaluation: CoreEvaluation, projection: Sequence[str]) -> Dict[str, Any]:
+    """JSON-ready dict of the projected fields, without building a pydantic model."""
+    item = {}
+    for field in projection:
+        value = getattr(evaluation, field)
+        item[field] = value.isoformat() if isinstance(value, datetime) else value
+    return item
@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from vizeval.core.entities import Evaluation as CoreEvaluation
 
 class EvaluationRequest(BaseModel):
@@ -14,6 +15,29 @@ class EvaluationResponse(BaseModel):
     evaluator: str
     score: Optional[float] = None
     feedback: Optional[str] = None
+    # "queued", or "skipped" when the detailed evaluation was shed under load
+    detailed_evaluation: str = "queued"
+
+# Upper bound on items per batch request, keeps a single request's memory and latency bounded
+MAX_BATCH_SIZE = 1000
+
+class BatchEvaluationItem(BaseModel):
+    system_prompt: str
+    user_prompt: str
+    response: str
+    evaluator: str
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class BatchEvaluationRequest(BaseModel):
+    items: List[BatchEvaluationItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    api_key: str
+
+class BatchEvaluationItemResponse(EvaluationResponse):
+    # Set instead of score/feedback when this item could not be evaluated
+    error: Optional[str] = None
+
+class BatchEvaluationResponse(BaseModel):
+    results: List[BatchEvaluationItemResponse]
 
 class Evaluation(BaseModel):
     system_prompt: str
@@ -24,6 +48,8 @@ class Evaluation(BaseModel):
     score: Optional[float] = None
     feedback: Optional[str] = None
     metadata: Dict[str, Any] = {}
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_core(cls, core_evaluation: CoreEvaluation) -> "Evaluation":
@@ -35,5 +61,7 @@ class Evaluation(BaseModel):
             evaluator=core_evaluation.evaluator,
             score=core_evaluation.score,
             feedback=core_evaluation.feedback,
-            metadata=core_evaluation.metadata
+            metadata=core_evaluation.metadata,
+            id=core_evaluation.id,
+            created_at=core_evaluation.created_at,
         )
\ No newline at end of file
@@ -1,58 +1,170 @@
-import time
+import asyncio
+from collections import Counter
+from typing import Dict, List, Optional, Union
 
 from vizeval.core.use_cases import EvaluateRequest
-from vizeval.core.interfaces import VizevalRepository, Evaluator, EvaluationQueue
-from vizeval.core.entities import EvaluationResult, EvaluationRequest
-from vizeval.evaluators import get_evaluator
+from vizeval.core.interfaces import VizevalRepository, Evaluator, EvaluationQueue, ResultCache
+from vizeval.core.entities import EvaluationResult, EvaluationRequest, EvaluationJob
+from vizeval.evaluators import aget_evaluator, get_evaluator
+
+
+OVERLOAD_POLICIES = ("reject", "degrade")
 
 
 class EvaluationService:
-    def __init__(self, repository: VizevalRepository, queue: EvaluationQueue):
+    def __init__(self, repository: VizevalRepository, queue: EvaluationQueue,
+                 cache: Optional[ResultCache] = None, overload_policy: str = "reject"):
+        """
+        Args:
+            repository: Where detailed evaluations are stored
+            queue: Queue of pending detailed evaluations
+            cache: Optional fast evaluation result cache
+            overload_policy: What callers should do when the queue is full:
+                "reject" the request or "degrade" to a fast evaluation only
+        """
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unknown overload policy '{overload_policy}', expected one of {OVERLOAD_POLICIES}")
+
         self.repository = repository
         self.queue = queue
-        self._running = False
+        self.cache = cache
+        self.overload_policy = overload_policy
         
-    def evaluate(self, request: EvaluationRequest) -> EvaluationResult:
-        evaluator = get_evaluator(request.evaluator)
-        evaluate_request = EvaluateRequest(evaluator, self.repository)
-        self.queue.enqueue(request)
+    def evaluate(self, request: EvaluationRequest, queue_detailed: bool = True) -> EvaluationResult:
+        """Run the fast evaluation and queue the detailed one.
 
-        return evaluate_request.execute_fast_eval(request)
-    
-    def start_worker(self, poll_interval: float = 5.0) -> None:
-        """Start the worker to continuously process queued evaluation requests.
-        
         Args:
-            poll_interval: Time in seconds to wait between checking the queue when empty.
+            request: The request to evaluate
+            queue_detailed: Whether to queue a detailed evaluation
+
+        Raises:
+            QueueFullError: If the detailed evaluation cannot be queued
         """
-        self._running = True
-        print("Evaluation worker started.")
-        
-        # We don't use signal handlers in threads as they only work in the main thread
-        
-        while self._running:
+        if queue_detailed:
+            # Fail before spending a fast evaluation on a job the queue will refuse
+            self.queue.check_capacity(request.user_id)
+
+        evaluator = get_evaluator(request.evaluator)
+        evaluate_request = EvaluateRequest(evaluator, self.repository, self.cache)
+        result = evaluate_request.execute_fast_eval(request)
+
+        if queue_detailed:
+            # The detailed stage reuses this fast result instead of scoring again
+            self.queue.enqueue(EvaluationJob(request=request, fast_result=result))
+        return result
+
+    async def aevaluate(self, request: EvaluationRequest, queue_detailed: bool = True) -> EvaluationResult:
+        """Async variant of `evaluate` that keeps the event loop free during inference and queue writes."""
+        if queue_detailed:
+            await self.queue.acheck_capacity(request.user_id)
+
+        evaluator = await aget_evaluator(request.evaluator)
+        evaluate_request = EvaluateRequest(evaluator, self.repository, self.cache)
+        result = await evaluate_request.aexecute_fast_eval(request)
+
+        if queue_detailed:
+            await self.queue.aenqueue(EvaluationJob(request=request, fast_result=result))
+        return result
+
+    def evaluate_batch(self, requests: List[EvaluationRequest],
+                       queue_detailed: bool = True) -> List[Union[EvaluationResult, Exception]]:
+        """Run the fast evaluation of many requests and queue their detailed evaluations.
+
+        Requests are grouped by evaluator and each group is scored with one
+        batched call. Detailed jobs are enqueued in a single operation.
+
+        Returns:
+            One entry per request, in order: its fast result, or the exception
+            raised while evaluating its group. Failed requests are not queued.
+
+        Raises:
+            QueueFullError: If the detailed evaluations cannot all be queued
+        """
+        if queue_detailed:
+            self._check_batch_capacity(requests)
+
+        results: List[Union[EvaluationResult, Exception]] = [None] * len(requests)
+        for name, indexes in self._group_by_evaluator(requests).items():
+            evaluate_request = EvaluateRequest(get_evaluator(name), self.repository, self.cache)
             try:
-                # Try to get a request from the queue
-                if self.queue.is_empty():
-                    time.sleep(poll_interval)
-                    continue
-
-                request = self.queue.dequeue()
-                try:
-                    # Process the request synchronously
-                    evaluator = get_evaluator(request.evaluator)
-                    evaluate_request = EvaluateRequest(evaluator, self.repository)
-                    result = evaluate_request.execute_detailed_eval(request)
-                    print(f"Processed evaluation request in background thread. Result Feedback: {result.feedback}")
-
-                except Exception as e:
-                    print(f"Error processing evaluation request: {str(e)}")
-            
+                group_results = evaluate_request.execute_fast_eval_batch([requests[i] for i in indexes])
             except Exception as e:
-                print(f"Unexpected error in worker: {str(e)}")
-                
-        print("Evaluation worker stopped.")
+                group_results = [e] * len(indexes)
+            for index, result in zip(indexes, group_results):
+                results[index] = result
+
+        if queue_detailed:
+            self._enqueue_batch(requests, results)
+        return results
+
+    async def aevaluate_batch(self, requests: List[EvaluationRequest],
+                              queue_detailed: bool = True) -> List[Union[EvaluationResult, Exception]]:
+        """Async variant of `evaluate_batch`. Evaluator groups are scored concurrently."""
+        if queue_detailed:
+            await self._acheck_batch_capacity(requests)
+
+        groups = self._group_by_evaluator(requests)
+        group_results = await asyncio.gather(
+            *(self._aevaluate_group(name, [requests[i] for i in indexes])
+              for name, indexes in groups.items()),
+            return_exceptions=True,
+        )
+
+        results: List[Union[EvaluationResult, Exception]] = [None] * len(requests)
+        for indexes, outcome in zip(groups.values(), group_results):
+            if isinstance(outcome, Exception):
+                outcome = [outcome] * len(indexes)
+            for index, result in zip(indexes, outcome):
+                results[index] = result
+
+        if queue_detailed:
+            await self.queue.aenqueue_many(self._batch_jobs(requests, results))
+        return results
+
+    async def _aevaluate_group(self, name: str,
+                               requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        evaluator = await aget_evaluator(name)
+        return await EvaluateRequest(evaluator, self.repository, self.cache).aexecute_fast_eval_batch(requests)
+
+    def process_job(self, job: EvaluationJob) -> EvaluationResult:
+        """Run the detailed evaluation of a queued job and store the evaluation."""
+        evaluator = get_evaluator(job.request.evaluator)
+        evaluate_request = EvaluateRequest(evaluator, self.repository, self.cache)
+        return evaluate_request.execute_detailed_eval(job.request, job.fast_result)
+
+    def record_detailed_result(self, job: EvaluationJob, fast_result: EvaluationResult,
+                               detailed_result: EvaluationResult) -> None:
+        """Store a detailed evaluation that was computed outside this process."""
+        evaluation = EvaluateRequest.build_evaluation(job.request, detailed_result, fast_result)
+        self.repository.store_evaluation(evaluation)
     
-    def stop_worker(self) -> None:
-        """Stop the worker on the next iteration."""
-        self._running = False
+    def _check_batch_capacity(self, requests: List[EvaluationRequest]) -> None:
+        # Checked before scoring anything, so a batch that cannot be queued costs no evaluations
+        self.queue.check_capacity(None, len(requests))
+        for user_id, count in Counter(request.user_id for request in requests).items():
+            self.queue.check_capacity(user_id, count)
+
+    async def _acheck_batch_capacity(self, requests: List[EvaluationRequest]) -> None:
+        await self.queue.acheck_capacity(None, len(requests))
+        for user_id, count in Counter(request.user_id for request in requests).items():
+            await self.queue.acheck_capacity(user_id, count)
+
+    @staticmethod
+    def _group_by_evaluator(requests: List[EvaluationRequest]) -> Dict[str, List[int]]:
+        groups: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault(request.evaluator, []).append(index)
+        return groups
+
+    def _enqueue_batch(self, requests: List[EvaluationRequest],
+                       results: List[Union[EvaluationResult, Exception]]) -> None:
+        self.queue.enqueue_many(self._batch_jobs(requests, results))
+
+    @staticmethod
+    def _batch_jobs(requests: List[EvaluationRequest],
+                    results: List[Union[EvaluationResult, Exception]]) -> List[EvaluationJob]:
+        return [
+            EvaluationJob(request=request, fast_result=result)
+            for request, result in zip(requests, results)
+            if not isinstance(result, Exception)
+        ]
@@ -1,12 +1,20 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from vizeval.core.interfaces import VizevalRepository
-from vizeval.core.entities import Evaluation, User
+from fastapi import HTTPException, status
+
+from vizeval.core.interfaces import VizevalRepository, ApiKeyCache
+from vizeval.core.entities import Evaluation, EvaluationFilter, EvaluationPage, User
 
 
 class RepositoryService:
-    def __init__(self, repository: VizevalRepository):
+    def __init__(self, repository: VizevalRepository, api_key_cache: Optional[ApiKeyCache] = None):
+        """
+        Args:
+            repository: Where users and evaluations are stored
+            api_key_cache: Optional cache of API key lookups, valid and invalid
+        """
         self.repository = repository
+        self.api_key_cache = api_key_cache
 
     def get_evaluations_by_api_key(self, api_key: str) -> List[Evaluation]:
         """
@@ -21,13 +29,80 @@ class RepositoryService:
         Raises:
             ValueError: If the API key is invalid or no user is found
         """
-        user = self.repository.get_user_from_api_key(api_key)
+        user = self._lookup_user(api_key)
         
         if not user:
             raise ValueError("Invalid API key")
             
         return self.repository.list_evaluations(user_id=user.id)
 
+    def get_evaluations_page_by_api_key(self, api_key: str, limit: int = 100,
+                                        cursor: Optional[str] = None,
+                                        evaluator: Optional[str] = None,
+                                        filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        """
+        Retrieve one page of evaluations for a given API key.
+        
+        Args:
+            api_key: The API key to fetch evaluations for
+            limit: Maximum number of evaluations to return
+            cursor: `next_cursor` of the previous page, None for the first page
+            evaluator: Only return evaluations made by this evaluator
+            filters: Only return evaluations within these score and time bounds
+            
+        Returns:
+            EvaluationPage: The evaluations and the cursor of the next page
+            
+        Raises:
+            ValueError: If the API key or the cursor is invalid
+        """
+        user = self._lookup_user(api_key)
+        
+        if not user:
+            raise ValueError("Invalid API key")
+            
+        return self.repository.list_evaluations_page(user_id=user.id, limit=limit, cursor=cursor,
+                                                     evaluator=evaluator, filters=filters)
+
+    async def aget_evaluations_page_by_api_key(self, api_key: str, limit: int = 100,
+                                               cursor: Optional[str] = None,
+                                               evaluator: Optional[str] = None,
+                                               filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        """Async version of get_evaluations_page_by_api_key."""
+        user = await self._alookup_user(api_key)
+        
+        if not user:
+            raise ValueError("Invalid API key")
+            
+        return await self.repository.alist_evaluations_page(user_id=user.id, limit=limit, cursor=cursor,
+                                                            evaluator=evaluator, filters=filters)
+
+    async def aiter_evaluations(self, user: User, page_size: int = 500, cursor: Optional[str] = None,
+                                evaluator: Optional[str] = None,
+                                filters: Optional[EvaluationFilter] = None) -> AsyncIterator[Evaluation]:
+        """
+        Iterate over all of a user's evaluations, fetching one page at a time.
+        
+        Args:
+            user: The user whose evaluations to list
+            page_size: Evaluations fetched per repository query
+            cursor: Start after the evaluation this cursor points to
+            evaluator: Only return evaluations made by this evaluator
+            filters: Only return evaluations within these score and time bounds
+            
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        while True:
+            page = await self.repository.alist_evaluations_page(user_id=user.id, limit=page_size,
+                                                                cursor=cursor, evaluator=evaluator,
+                                                                filters=filters)
+            for evaluation in page.evaluations:
+                yield evaluation
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
     def add_user(self, user: User) -> str:
         """
         Add a new user and return its API key.
@@ -41,9 +116,30 @@ class RepositoryService:
         Raises:
             ValueError: If the user already exists
         """
-        return self.repository.add_user(user)
+        api_key = self.repository.add_user(user)
+        self.invalidate_api_key(api_key)
+        return api_key
+
+    async def aadd_user(self, user: User) -> str:
+        """Async version of add_user."""
+        api_key = await self.repository.aadd_user(user)
+        self.invalidate_api_key(api_key)
+        return api_key
+
+    def invalidate_api_key(self, api_key: str) -> None:
+        """
+        Forget the cached lookup of an API key.
+        
+        Call it whenever a key is created, rotated or revoked, so the change is
+        seen at once instead of after the cache TTL.
+        
+        Args:
+            api_key: The API key whose user changed
+        """
+        if self.api_key_cache is not None:
+            self.api_key_cache.invalidate(api_key)
 
-    def get_user_from_api_key(self, api_key: str) -> User:
+    def get_user_from_api_key(self, api_key: str) -> Optional[User]:
         """
         Retrieve a user by their API key.
         
@@ -54,6 +150,35 @@ class RepositoryService:
             Optional[User]: The user associated with the API key, or None if not found
         """
         try:
-            return self.repository.get_user_from_api_key(api_key)
+            return self._lookup_user(api_key)
         except ValueError as e:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    async def aget_user_from_api_key(self, api_key: str) -> Optional[User]:
+        """Async version of get_user_from_api_key."""
+        try:
+            return await self._alookup_user(api_key)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    def _lookup_user(self, api_key: str) -> Optional[User]:
+        if self.api_key_cache is not None:
+            found, user = self.api_key_cache.get(api_key)
+            if found:
+                return user
+            version = self.api_key_cache.version()
+        user = self.repository.get_user_from_api_key(api_key)
+        if self.api_key_cache is not None:
+            self.api_key_cache.set(api_key, user, version)
+        return user
+
+    async def _alookup_user(self, api_key: str) -> Optional[User]:
+        if self.api_key_cache is not None:
+            found, user = self.api_key_cache.get(api_key)
+            if found:
+                return user
+            version = self.api_key_cache.version()
+        user = await self.repository.aget_user_from_api_key(api_key)
+        if self.api_key_cache is not None:
+            self.api_key_cache.set(api_key, user, version)
+        return user
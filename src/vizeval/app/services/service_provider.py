@@ -7,12 +7,18 @@ from vizeval.app.services.repository_service import RepositoryService
 # For now, we'll use module-level variables
 _repository = None
 _queue = None
+_cache = None
+_api_key_cache = None
+_overload_policy = "reject"
 
-def initialize_services(repository, queue):
+def initialize_services(repository, queue, cache=None, overload_policy="reject", api_key_cache=None):
     """Initialize service dependencies."""
-    global _repository, _queue
+    global _repository, _queue, _cache, _overload_policy, _api_key_cache
     _repository = repository
     _queue = queue
+    _cache = cache
+    _overload_policy = overload_policy
+    _api_key_cache = api_key_cache
 
 def get_evaluation_service() -> EvaluationService:
     """Get the evaluation service with initialized dependencies."""
@@ -24,7 +30,9 @@ def get_evaluation_service() -> EvaluationService:
     
     return EvaluationService(
         repository=_repository,
-        queue=_queue
+        queue=_queue,
+        cache=_cache,
+        overload_policy=_overload_policy,
     )
 
 def get_repository_service() -> RepositoryService:
@@ -34,4 +42,4 @@ def get_repository_service() -> RepositoryService:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Repository service not properly initialized"
         )
-    return RepositoryService(_repository)
+    return RepositoryService(_repository, _api_key_cache)
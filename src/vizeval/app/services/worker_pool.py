@@ -0,0 +1,306 @@
+import multiprocessing
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from vizeval.app.services.evaluation_service import EvaluationService
+from vizeval.core.entities import EvaluationJob, EvaluationRequest, EvaluationResult
+from vizeval.core.interfaces import EvaluatorUnavailableError
+from vizeval.evaluators import get_evaluator
+
+WORKER_MODES = ("thread", "process")
+
+
+@dataclass
+class WorkerPoolStats:
+    mode: str
+    workers: int
+    busy: int
+    idle: int
+    processed: int
+    failed: int
+    deferred: int
+    jobs_per_second: float
+    queue_size: int
+
+
+def parse_concurrency_limits(spec: str) -> Dict[str, int]:
+    """Parse per-evaluator limits written as "medical=2,dummy=8"."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        if not value:
+            raise ValueError(f"Invalid evaluator concurrency limit '{item}', expected name=limit")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+def run_detailed_evaluation(request: EvaluationRequest,
+                            fast_result: Optional[EvaluationResult]) -> Tuple[EvaluationResult, EvaluationResult]:
+    """Entry point for process workers: evaluate in the child, store in the parent."""
+    evaluator = get_evaluator(request.evaluator)
+    if fast_result is None:
+        fast_result = evaluator.fast_evaluate(request)
+    return fast_result, evaluator.detailed_evaluate(request, fast_result)
+
+
+class WorkerPool:
+    """Processes queued detailed evaluations on several workers.
+
+    In "thread" mode each worker thread runs the evaluation itself, which suits
+    I/O-bound evaluators such as LLM calls. In "process" mode the worker threads
+    only dispatch: evaluations run in a pool of child processes, so CPU-bound
+    torch evaluators are not serialized by the GIL, and results are stored by
+    the parent.
+
+    A job whose evaluator is at its concurrency limit is set aside instead of
+    holding a worker, so jobs of other evaluators keep flowing; the worker that
+    frees a slot runs the next set-aside job. Once `max_deferred` jobs are set
+    aside, workers stop taking new jobs until one of them can run. Set-aside
+    jobs keep their lease on queues that redeliver, and are given back to the
+    queue when the pool shuts down.
+    """
+
+    def __init__(self,
+                 evaluation_service: EvaluationService,
+                 num_workers: int = 4,
+                 mode: str = "thread",
+                 evaluator_concurrency: Optional[Dict[str, int]] = None,
+                 poll_interval: float = 1.0,
+                 rate_window: float = 60.0,
+                 max_deferred: int = 64):
+        """
+        Args:
+            evaluation_service: Service that owns the queue and repository
+            num_workers: Number of jobs processed at the same time
+            mode: "thread" or "process"
+            evaluator_concurrency: Maximum concurrent jobs per evaluator name
+            poll_interval: How long an idle worker blocks on the queue before
+                checking whether the pool is shutting down
+            rate_window: Window in seconds over which jobs_per_second is computed
+            max_deferred: Jobs held while their evaluator is at its limit
+        """
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown worker mode '{mode}', expected one of {WORKER_MODES}")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.evaluation_service = evaluation_service
+        self.queue = evaluation_service.queue
+        self.num_workers = num_workers
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.rate_window = rate_window
+        self.max_deferred = max_deferred
+        self._limits = dict(evaluator_concurrency or {})
+        self._running: Dict[str, int] = defaultdict(int)
+        self._deferred: Dict[str, Deque[EvaluationJob]] = defaultdict(deque)
+        self._deferred_count = 0
+        # When the lease of each set-aside job was last started, by job id
+        self._leased_at: Dict[str, float] = {}
+        timeout = self.queue.visibility_timeout
+        self._lease_renewal = timeout / 2 if timeout else None
+
+        self._threads: List[threading.Thread] = []
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = threading.Event()
+        self._draining = threading.Event()
+        self._lock = threading.Lock()
+        # Signalled whenever an evaluator's slot is released
+        self._slot_freed = threading.Condition(self._lock)
+        self._busy = 0
+        self._processed = 0
+        self._failed = 0
+        self._completed_at: Deque[float] = deque()
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        if self._threads:
+            raise RuntimeError("WorkerPool already started")
+
+        self._started_at = time.monotonic()
+        if self.mode == "process":
+            # Spawned children do not inherit the parent's threads and locks
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f"evaluation-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"Evaluation worker pool started with {self.num_workers} {self.mode} workers.")
+
+    def shutdown(self, drain: bool = True, timeout: float = 30.0) -> None:
+        """Stop the workers.
+
+        Args:
+            drain: Keep processing until the queue is empty before stopping.
+                Otherwise workers stop after their current job.
+            timeout: Maximum time in seconds to wait. Workers still running
+                afterwards stop after their current job.
+        """
+        if drain:
+            self._draining.set()
+        else:
+            self._stopping.set()
+
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._stopping.set()
+        self._return_deferred()
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+        print("Evaluation worker pool stopped.")
+
+    def stats(self) -> WorkerPoolStats:
+        with self._lock:
+            now = time.monotonic()
+            while self._completed_at and now - self._completed_at[0] > self.rate_window:
+                self._completed_at.popleft()
+            alive = sum(1 for thread in self._threads if thread.is_alive())
+            window = min(self.rate_window, now - self._started_at) if self._started_at else 0.0
+            return WorkerPoolStats(
+                mode=self.mode,
+                workers=alive,
+                busy=self._busy,
+                idle=alive - self._busy,
+                processed=self._processed,
+                failed=self._failed,
+                deferred=self._deferred_count,
+                jobs_per_second=len(self._completed_at) / window if window > 0 else 0.0,
+                queue_size=self.queue.size(),
+            )
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._renew_deferred_leases()
+            job = self._take_deferred()
+            if job is None:
+                if self._deferred_count >= self.max_deferred:
+                    continue
+                try:
+                    job = self.queue.dequeue(timeout=self.poll_interval)
+                except Exception as e:
+                    print(f"Unexpected error in worker: {str(e)}")
+                    continue
+
+                if job is None:
+                    # Jobs waiting out a retry delay or set aside still count as work to drain
+                    if self._draining.is_set() and self.queue.is_empty() and not self._deferred_count:
+                        return
+                    continue
+
+                if not self._claim_slot(job):
+                    continue
+
+            self._process(job)
+
+    def _claim_slot(self, job: EvaluationJob) -> bool:
+        """Reserve a slot of the job's evaluator, or set the job aside if none is free."""
+        name = job.request.evaluator
+        limit = self._limits.get(name)
+        if limit is None:
+            return True
+        with self._lock:
+            # Jobs set aside earlier go first, to keep each evaluator's jobs in order
+            if not self._deferred[name] and self._running[name] < limit:
+                self._running[name] += 1
+                return True
+            if not self._stopping.is_set():
+                self._deferred[name].append(job)
+                self._deferred_count += 1
+                self._leased_at[job.id] = time.monotonic()
+                return False
+        # Nobody would pick the job up again once the pool is stopping
+        self.queue.nack(job)
+        return False
+
+    def _return_deferred(self) -> None:
+        """Give every set-aside job back to the queue. Called once the pool is stopping."""
+        with self._lock:
+            jobs = [job for deferred in self._deferred.values() for job in deferred]
+            self._deferred.clear()
+            self._deferred_count = 0
+            self._leased_at.clear()
+        for job in jobs:
+            self.queue.nack(job)
+
+    def _renew_deferred_leases(self) -> None:
+        """Extend the lease of jobs set aside for half the queue's visibility timeout.
+
+        Otherwise a job waiting for its evaluator could be redelivered to
+        another consumer and run twice.
+        """
+        if self._lease_renewal is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            jobs = [job for deferred in self._deferred.values() for job in deferred
+                    if now - self._leased_at[job.id] >= self._lease_renewal]
+            for job in jobs:
+                self._leased_at[job.id] = now
+        if jobs:
+            try:
+                self.queue.extend_lease(jobs)
+            except Exception as e:
+                print(f"Error extending the lease of {len(jobs)} set-aside jobs: {str(e)}")
+
+    def _take_deferred(self) -> Optional[EvaluationJob]:
+        """Return a set-aside job whose evaluator has a free slot, with the slot reserved.
+
+        While `max_deferred` jobs are set aside, waits up to `poll_interval`
+        for a slot to be freed.
+        """
+        with self._slot_freed:
+            for waited in (False, True):
+                for name, jobs in self._deferred.items():
+                    if jobs and self._running[name] < self._limits[name]:
+                        self._running[name] += 1
+                        self._deferred_count -= 1
+                        job = jobs.popleft()
+                        self._leased_at.pop(job.id, None)
+                        return job
+                if waited or self._deferred_count < self.max_deferred:
+                    return None
+                self._slot_freed.wait(self.poll_interval)
+        return None
+
+    def _process(self, job: EvaluationJob) -> None:
+        name = job.request.evaluator
+        with self._lock:
+            self._busy += 1
+
+        failed = False
+        try:
+            if self._process_pool is not None:
+                fast_result, result = self._process_pool.submit(
+                    run_detailed_evaluation, job.request, job.fast_result
+                ).result()
+                self.evaluation_service.record_detailed_result(job, fast_result, result)
+            else:
+                result = self.evaluation_service.process_job(job)
+            self.queue.ack(job)
+            print(f"Processed evaluation job {job.id}. Result Feedback: {result.feedback}")
+        except Exception as e:
+            failed = True
+            # An unavailable evaluator (e.g. a throttled LLM) says when to try again
+            self.queue.nack(job, e.retry_after if isinstance(e, EvaluatorUnavailableError) else 0.0)
+            print(f"Error processing evaluation job {job.id}: {str(e)}")
+        finally:
+            with self._lock:
+                if name in self._limits:
+                    self._running[name] -= 1
+                    self._slot_freed.notify_all()
+                self._busy -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._processed += 1
+                    self._completed_at.append(time.monotonic())
@@ -1,4 +1,5 @@
 from .evaluation_request import EvaluationRequest
 from .evaluation_result import EvaluationResult
-from .evaluation import Evaluation
-from .user import User
\ No newline at end of file
+from .evaluation import Evaluation, EvaluationPage, EvaluationFilter
+from .user import User
+from .evaluation_job import EvaluationJob
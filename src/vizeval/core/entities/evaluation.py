@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, List
 
 
 @dataclass
@@ -11,4 +12,42 @@ class Evaluation:
     evaluator: str
     score: Optional[float] = None
     feedback: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Assigned by the repository when the evaluation is stored
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class EvaluationPage:
+    """One page of a keyset-paginated listing."""
+    evaluations: List[Evaluation]
+    # Pass back to get the following page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class EvaluationFilter:
+    """Conditions on listed evaluations, applied by the repository query.
+
+    Score bounds are inclusive and exclude unscored evaluations; time bounds
+    are exclusive.
+    """
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    def matches(self, evaluation: Evaluation) -> bool:
+        if self.min_score is not None or self.max_score is not None:
+            if evaluation.score is None:
+                return False
+            if self.min_score is not None and evaluation.score < self.min_score:
+                return False
+            if self.max_score is not None and evaluation.score > self.max_score:
+                return False
+        if self.created_after is not None and evaluation.created_at <= self.created_after:
+            return False
+        if self.created_before is not None and evaluation.created_at >= self.created_before:
+            return False
+        return True
@@ -0,0 +1,18 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import uuid4
+
+from .evaluation_request import EvaluationRequest
+from .evaluation_result import EvaluationResult
+
+
+@dataclass
+class EvaluationJob:
+    """A queued detailed evaluation, carrying the fast result already computed for it."""
+    request: EvaluationRequest
+    fast_result: Optional[EvaluationResult] = None
+    # Scheduling class such as "interactive" or "bulk"; falls back to request.metadata["priority"]
+    priority: Optional[str] = None
+    id: str = field(default_factory=lambda: str(uuid4()))
+    enqueued_at: float = field(default_factory=time.time)
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor: Optional[ThreadPoolExecutor] = None
+# Blocking storage calls get their own pool, so they never wait behind inference
+_io_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def configure_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> ThreadPoolExecutor:
+    """Replace the thread pool used to run blocking evaluator calls.
+
+    Args:
+        max_workers: Maximum number of blocking calls running at once. Further
+            calls wait for a free thread instead of blocking the event loop.
+    """
+    global _executor
+    with _lock:
+        previous = _executor
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vizeval-eval")
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _executor
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared evaluation thread pool, creating it on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                           thread_name_prefix="vizeval-eval")
+        return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the evaluation thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+def configure_io_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> ThreadPoolExecutor:
+    """Replace the thread pool used to run blocking repository, result cache and queue calls.
+
+    Args:
+        max_workers: Maximum number of blocking I/O calls running at once
+    """
+    global _io_executor
+    with _lock:
+        previous = _io_executor
+        _io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vizeval-io")
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _io_executor
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared I/O thread pool, creating it on first use."""
+    global _io_executor
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                              thread_name_prefix="vizeval-io")
+        return _io_executor
+
+
+async def run_io(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking storage call on the I/O thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), partial(fn, *args, **kwargs))
@@ -1,3 +1,5 @@
-from .evaluator import Evaluator
+from .evaluator import Evaluator, EvaluatorUnavailableError
 from .vizeval_repository import VizevalRepository
-from .evaluation_queue import EvaluationQueue
+from .evaluation_queue import EvaluationQueue, QueueFullError
+from .result_cache import ResultCache
+from .api_key_cache import ApiKeyCache
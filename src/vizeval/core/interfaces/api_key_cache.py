@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+from vizeval.core.entities import User
+
+
+class ApiKeyCache(ABC):
+    @abstractmethod
+    def get(self, api_key: str) -> Tuple[bool, Optional[User]]:
+        """Return (True, user) on a hit, where user is None for a known invalid key, or (False, None) on a miss"""
+        pass
+
+    @abstractmethod
+    def set(self, api_key: str, user: Optional[User], version: Optional[int] = None) -> None:
+        """Cache the user of an API key, or None if the key is invalid.
+
+        With `version`, the value of `version()` read before the lookup, nothing
+        is stored if a key was invalidated since, as the lookup may be stale.
+        """
+        pass
+
+    @abstractmethod
+    def version(self) -> int:
+        """Counter that every invalidation increments"""
+        pass
+
+    @abstractmethod
+    def invalidate(self, api_key: str) -> None:
+        """Forget an API key, e.g. after it was created or rotated"""
+        pass
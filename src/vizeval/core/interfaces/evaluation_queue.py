@@ -1,21 +1,101 @@
-from collections import deque
-from typing import Deque
-
-from vizeval.core.entities import EvaluationRequest
-
-
-class EvaluationQueue:
-    def __init__(self):
-        self._queue: Deque[EvaluationRequest] = deque()
-    
-    def enqueue(self, evaluation_request: EvaluationRequest) -> None:
-        self._queue.append(evaluation_request)
-    
-    def dequeue(self) -> EvaluationRequest:
-        return self._queue.popleft()
-    
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from vizeval.core.entities import EvaluationJob
+from vizeval.core.executor import run_blocking, run_io
+
+
+class QueueFullError(Exception):
+    """Raised when a queue has no room for another job."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EvaluationQueue(ABC):
+    # Seconds a dequeued job stays leased before it is redelivered, None if leases never expire
+    visibility_timeout: Optional[float] = None
+
+    @abstractmethod
+    def enqueue(self, job: EvaluationJob) -> None:
+        """Add a job and wake up a waiting consumer.
+
+        Raises:
+            QueueFullError: If a bounded queue has no room for the job
+        """
+        pass
+
+    def enqueue_many(self, jobs: List[EvaluationJob]) -> None:
+        """Add several jobs. Durable queues write them in a single transaction."""
+        for job in jobs:
+            self.enqueue(job)
+
+    def check_capacity(self, user_id: Optional[str] = None, count: int = 1) -> None:
+        """Raise QueueFullError if `count` jobs for `user_id` would currently be rejected.
+
+        This is advisory: `enqueue` still enforces the limits. Unbounded queues
+        always have capacity.
+        """
+        pass
+
+    @abstractmethod
+    def dequeue(self, timeout: Optional[float] = 0) -> Optional[EvaluationJob]:
+        """Remove and return the next job.
+
+        Waits up to `timeout` seconds for a job to arrive (None waits forever,
+        0 returns immediately) and returns None if there is still none.
+        """
+        pass
+
+    @abstractmethod
+    def dequeue_many(self, max_items: int, timeout: Optional[float] = 0) -> List[EvaluationJob]:
+        """Remove and return up to `max_items` jobs, waiting like `dequeue` for the first one"""
+        pass
+
+    def ack(self, job: EvaluationJob) -> None:
+        """Mark a dequeued job as done.
+
+        Queues with redelivery hand out unacknowledged jobs again once their
+        visibility timeout expires, so a crashed worker's jobs are not lost.
+        """
+        pass
+
+    def nack(self, job: EvaluationJob, retry_after: float = 0.0) -> None:
+        """Give a dequeued job back after a failed attempt so it is retried in `retry_after` seconds."""
+        pass
+
+    def extend_lease(self, jobs: List[EvaluationJob]) -> None:
+        """Restart the visibility timeout of dequeued jobs that are not finished yet.
+
+        Queues whose leases never expire ignore it.
+        """
+        pass
+
+    @abstractmethod
     def is_empty(self) -> bool:
-        return len(self._queue) == 0
+        pass
 
+    @abstractmethod
     def size(self) -> int:
-        return len(self._queue)
\ No newline at end of file
+        pass
+
+    async def aenqueue(self, job: EvaluationJob) -> None:
+        """Async variant of `enqueue`. Defaults to running it on the I/O thread pool."""
+        await run_io(self.enqueue, job)
+
+    async def aenqueue_many(self, jobs: List[EvaluationJob]) -> None:
+        """Async variant of `enqueue_many`. Defaults to running it on the I/O thread pool."""
+        await run_io(self.enqueue_many, jobs)
+
+    async def acheck_capacity(self, user_id: Optional[str] = None, count: int = 1) -> None:
+        """Async variant of `check_capacity`. Defaults to running it on the I/O thread pool."""
+        await run_io(self.check_capacity, user_id, count)
+
+    async def adequeue(self, timeout: Optional[float] = None) -> Optional[EvaluationJob]:
+        """Async variant of `dequeue`. Defaults to waiting on the evaluation thread pool."""
+        return await run_blocking(self.dequeue, timeout)
+
+    async def adequeue_many(self, max_items: int, timeout: Optional[float] = None) -> List[EvaluationJob]:
+        """Async variant of `dequeue_many`. Defaults to waiting on the evaluation thread pool."""
+        return await run_blocking(self.dequeue_many, max_items, timeout)
@@ -1,16 +1,56 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional
+
 from vizeval.core.entities import EvaluationResult, EvaluationRequest
+from vizeval.core.executor import run_blocking
+
+class EvaluatorUnavailableError(Exception):
+    """Raised when an evaluator cannot score a request right now, e.g. its LLM provider is throttling.
+
+    It is not a verdict on the request: retry after `retry_after` seconds.
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        # Keep retry_after when raised in a process worker
+        return type(self), (str(self), self.retry_after)
 
 class Evaluator(ABC):
     """Abstract base class for all evaluators."""
 
     name: str = "base"
+    # Bump when scoring changes so cached results of the old version are not reused
+    version: str = "1"
 
     @abstractmethod
     def fast_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
         raise NotImplementedError
 
+    def fast_evaluate_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Fast evaluation of several requests, in order. Defaults to one `fast_evaluate` per request.
+
+        An evaluator may return an EvaluatorUnavailableError in place of the
+        result of a request it cannot score right now; the other results are kept.
+        """
+        return [self.fast_evaluate(request) for request in requests]
+
     @abstractmethod
-    def detailed_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
+    def detailed_evaluate(self, request: EvaluationRequest,
+                          fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
         raise NotImplementedError
-    
\ No newline at end of file
+
+    async def afast_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
+        """Async fast evaluation. Defaults to running `fast_evaluate` on the evaluation thread pool."""
+        return await run_blocking(self.fast_evaluate, request)
+
+    async def adetailed_evaluate(self, request: EvaluationRequest,
+                                 fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
+        """Async detailed evaluation. Defaults to running `detailed_evaluate` on the evaluation thread pool."""
+        return await run_blocking(self.detailed_evaluate, request, fast_result)
+
+    async def afast_evaluate_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Async batch fast evaluation. Defaults to running `fast_evaluate_batch` on the evaluation thread pool."""
+        return await run_blocking(self.fast_evaluate_batch, requests)
@@ -0,0 +1,51 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.core.executor import run_io
+
+
+class ResultCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[EvaluationResult]:
+        """Return the cached result for a key, or None on a miss"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, result: EvaluationResult) -> None:
+        """Store a result under a key"""
+        pass
+
+    def get_entry(self, key: str) -> Optional[Tuple[EvaluationResult, float]]:
+        """Return the cached result for a key and its age in seconds, or None on a miss"""
+        result = self.get(key)
+        return None if result is None else (result, 0.0)
+
+    async def aget_entries(self, keys: List[str]) -> List[Optional[Tuple[EvaluationResult, float]]]:
+        """Async `get_entry` of several keys. Runs them on the I/O thread pool by default."""
+        return await run_io(lambda: [self.get_entry(key) for key in keys])
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[EvaluationResult]]:
+        """Async `get` of several keys, None for each miss."""
+        return [entry[0] if entry is not None else None for entry in await self.aget_entries(keys)]
+
+    async def aset_many(self, items: List[Tuple[str, EvaluationResult]]) -> None:
+        """Async `set` of several results. Runs them on the I/O thread pool by default."""
+        await run_io(lambda: [self.set(key, result) for key, result in items])
+
+    @staticmethod
+    def key_for(request: EvaluationRequest, evaluator_name: str, evaluator_version: str) -> str:
+        """Stable content hash of a request and the evaluator that scores it."""
+        payload = json.dumps(
+            [
+                evaluator_name,
+                evaluator_version,
+                request.system_prompt,
+                request.user_prompt,
+                request.response,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
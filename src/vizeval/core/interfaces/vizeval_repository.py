@@ -1,7 +1,11 @@
+import base64
+import json
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from vizeval.core.entities import Evaluation, User
+from vizeval.core.entities import Evaluation, EvaluationFilter, EvaluationPage, User
+from vizeval.core.executor import run_io
 
 class VizevalRepository(ABC):
     @abstractmethod
@@ -14,6 +18,21 @@ class VizevalRepository(ABC):
         """List evaluations for a user with pagination"""
         pass
 
+    @abstractmethod
+    def list_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                              evaluator: Optional[str] = None,
+                              filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        """List a user's evaluations in (created_at, id) order, one page at a time.
+
+        Args:
+            user_id: Owner of the evaluations
+            limit: Maximum number of evaluations in the page
+            cursor: `next_cursor` of the previous page, None for the first page
+            evaluator: Only list evaluations made by this evaluator
+            filters: Only list evaluations matching these score and time bounds
+        """
+        pass
+
     @abstractmethod
     def get_user_from_api_key(self, api_key: str) -> Optional[User]:
         """Get a user by API key"""
@@ -22,4 +41,53 @@ class VizevalRepository(ABC):
     @abstractmethod
     def add_user(self, user: User) -> str:
         """Add a new user and return its API key"""
-        pass
\ No newline at end of file
+        pass
+
+    def close(self) -> None:
+        """Write out buffered data and release resources. Called on shutdown."""
+        pass
+
+    async def astore_evaluation(self, evaluation: Evaluation) -> str:
+        """Async version of store_evaluation. Runs it on the I/O thread pool by default."""
+        return await run_io(self.store_evaluation, evaluation)
+
+    async def alist_evaluations(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Evaluation]:
+        """Async version of list_evaluations. Runs it on the I/O thread pool by default."""
+        return await run_io(self.list_evaluations, user_id, limit, offset)
+
+    async def alist_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                                     evaluator: Optional[str] = None,
+                                     filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        """Async version of list_evaluations_page. Runs it on the I/O thread pool by default."""
+        return await run_io(self.list_evaluations_page, user_id, limit, cursor, evaluator, filters)
+
+    async def aget_user_from_api_key(self, api_key: str) -> Optional[User]:
+        """Async version of get_user_from_api_key. Runs it on the I/O thread pool by default."""
+        return await run_io(self.get_user_from_api_key, api_key)
+
+    async def aadd_user(self, user: User) -> str:
+        """Async version of add_user. Runs it on the I/O thread pool by default."""
+        return await run_io(self.add_user, user)
+
+    async def aclose(self) -> None:
+        """Async version of close. Runs it on the I/O thread pool by default."""
+        await run_io(self.close)
+
+    @staticmethod
+    def encode_cursor(evaluation: Evaluation) -> str:
+        """Opaque cursor pointing just after `evaluation`."""
+        position = [evaluation.created_at.isoformat(), evaluation.id]
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Return the (created_at, id) position of a cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            created_at, evaluation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(created_at), evaluation_id
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor '{cursor}'") from e
@@ -1,26 +1,122 @@
+from typing import List, Optional, Tuple
+
 from vizeval.core.entities import EvaluationRequest, EvaluationResult, Evaluation
-from vizeval.core.interfaces import VizevalRepository, Evaluator
+from vizeval.core.interfaces import VizevalRepository, Evaluator, ResultCache
 
 class EvaluateRequest:
-    def __init__(self, evaluator: Evaluator, repository: VizevalRepository):
+    def __init__(self, evaluator: Evaluator, repository: VizevalRepository,
+                 cache: Optional[ResultCache] = None):
         self.evaluator = evaluator
         self.repository = repository
+        self.cache = cache
     
     def execute_fast_eval(self, request: EvaluationRequest) -> EvaluationResult:
+        if self.cache is None:
+            return self.evaluator.fast_evaluate(request)
+
+        cache_key = self._cache_key(request)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
         evaluation_result = self.evaluator.fast_evaluate(request)
+        self._store_in_cache(cache_key, evaluation_result)
         return evaluation_result
 
-    def execute_detailed_eval(self, request: EvaluationRequest) -> EvaluationResult:
-        fast_evaluation_result = self.evaluator.fast_evaluate(request)
-        detailed_evaluation_result = self.evaluator.detailed_evaluate(request)
+    async def aexecute_fast_eval(self, request: EvaluationRequest) -> EvaluationResult:
+        """Async variant of `execute_fast_eval` for callers running on an event loop.
+
+        Cache tiers that block, like SQLite, are read and written off the loop.
+        """
+        if self.cache is None:
+            return await self.evaluator.afast_evaluate(request)
+
+        cache_key = self._cache_key(request)
+        (cached_result,) = await self.cache.aget_many([cache_key])
+        if cached_result is not None:
+            return cached_result
+
+        evaluation_result = await self.evaluator.afast_evaluate(request)
+        if self._is_cacheable(evaluation_result):
+            await self.cache.aset_many([(cache_key, evaluation_result)])
+        return evaluation_result
+
+    def execute_fast_eval_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Fast evaluation of several requests, scoring only the cache misses in one batch."""
+        results, misses = self._lookup_batch(requests)
+        if misses:
+            evaluated = self.evaluator.fast_evaluate_batch([requests[index] for index in misses])
+            for cache_key, result in self._fill_batch(requests, results, misses, evaluated):
+                self.cache.set(cache_key, result)
+        return results
+
+    async def aexecute_fast_eval_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Async variant of `execute_fast_eval_batch`."""
+        if self.cache is None:
+            results, misses = [None] * len(requests), list(range(len(requests)))
+        else:
+            results = await self.cache.aget_many([self._cache_key(request) for request in requests])
+            misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            evaluated = await self.evaluator.afast_evaluate_batch([requests[index] for index in misses])
+            to_cache = self._fill_batch(requests, results, misses, evaluated)
+            if to_cache:
+                await self.cache.aset_many(to_cache)
+        return results
 
-        evaluation = self._build_evaluation(request, detailed_evaluation_result, fast_evaluation_result)
+    def execute_detailed_eval(self, request: EvaluationRequest,
+                              fast_evaluation_result: Optional[EvaluationResult] = None) -> EvaluationResult:
+        """Run the detailed evaluation and store it.
+
+        Args:
+            request: The request to evaluate
+            fast_evaluation_result: The fast result computed when the request was
+                accepted. It is only recomputed when missing.
+        """
+        if fast_evaluation_result is None:
+            fast_evaluation_result = self.execute_fast_eval(request)
+        detailed_evaluation_result = self.evaluator.detailed_evaluate(request, fast_evaluation_result)
+
+        evaluation = self.build_evaluation(request, detailed_evaluation_result, fast_evaluation_result)
         self.repository.store_evaluation(evaluation)
         return detailed_evaluation_result
 
-    def _build_evaluation(self, request: EvaluationRequest, 
-                            detailed_eval_result: EvaluationResult,
-                            fast_eval_result: EvaluationResult) -> Evaluation:
+    def _lookup_batch(self, requests: List[EvaluationRequest]) -> Tuple[List[Optional[EvaluationResult]], List[int]]:
+        """Return the cached results, None where missing, and the indexes still to evaluate."""
+        if self.cache is None:
+            return [None] * len(requests), list(range(len(requests)))
+
+        results = [self.cache.get(self._cache_key(request)) for request in requests]
+        return results, [index for index, result in enumerate(results) if result is None]
+
+    def _fill_batch(self, requests: List[EvaluationRequest], results: List[Optional[EvaluationResult]],
+                    misses: List[int], evaluated: List[EvaluationResult]) -> List[Tuple[str, EvaluationResult]]:
+        """Put the evaluated results in place and return the (key, result) pairs to cache."""
+        if len(evaluated) != len(misses):
+            raise RuntimeError(f"Evaluator returned {len(evaluated)} results for {len(misses)} requests")
+        to_cache = []
+        for index, result in zip(misses, evaluated):
+            results[index] = result
+            if self.cache is not None and self._is_cacheable(result):
+                to_cache.append((self._cache_key(requests[index]), result))
+        return to_cache
+
+    def _cache_key(self, request: EvaluationRequest) -> str:
+        return ResultCache.key_for(request, self.evaluator.name, self.evaluator.version)
+
+    def _store_in_cache(self, cache_key: str, result: EvaluationResult) -> None:
+        if self._is_cacheable(result):
+            self.cache.set(cache_key, result)
+
+    @staticmethod
+    def _is_cacheable(result: EvaluationResult) -> bool:
+        # Evaluators report failures with a negative score or an exception, which must not be replayed
+        return not isinstance(result, Exception) and result.score is not None and result.score >= 0
+
+    @staticmethod
+    def build_evaluation(request: EvaluationRequest,
+                         detailed_eval_result: EvaluationResult,
+                         fast_eval_result: EvaluationResult) -> Evaluation:
         return Evaluation(
             system_prompt=request.system_prompt,
             user_prompt=request.user_prompt,
@@ -1,16 +1,126 @@
-from typing import Dict
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+from vizeval.core.executor import run_blocking
 
 from .dummy import DummyEvaluator
 from .base import BaseEvaluator
-from .medical_temp import MedicalEvaluator as MedicalEvaluatorTemp
-# from .medical import MedicalEvaluator # Thats our real evaluator
 
-_evaluators: Dict[str, BaseEvaluator] = {
-    DummyEvaluator.name: DummyEvaluator(),
-    MedicalEvaluatorTemp.name: MedicalEvaluatorTemp(),
-}
+EvaluatorFactory = Callable[[], BaseEvaluator]
+
+# Evaluators are built by their factory on first use, or by warmup() at startup,
+# so importing this package does not load LangChain, models or tokenizers
+_factories: Dict[str, EvaluatorFactory] = {}
+_evaluators: Dict[str, BaseEvaluator] = {}
+_load_seconds: Dict[str, float] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def register_evaluator(name: str, factory: EvaluatorFactory) -> None:
+    """Register how to build an evaluator. It is built the first time it is used.
+
+    Args:
+        name: Name requests use to select the evaluator
+        factory: Callable returning the evaluator; import heavy dependencies inside it
+    """
+    with _lock:
+        _factories[name] = factory
+        _evaluators.pop(name, None)
+        _load_seconds.pop(name, None)
+
+
+def _medical_temp() -> BaseEvaluator:
+    from .medical_temp import MedicalEvaluator as MedicalEvaluatorTemp
+    return MedicalEvaluatorTemp()
+
+
+# def _medical() -> BaseEvaluator:  # Thats our real evaluator
+#     from .medical import MedicalEvaluator
+#     return MedicalEvaluator()
+
+
+register_evaluator(DummyEvaluator.name, DummyEvaluator)
+register_evaluator("medical", _medical_temp)
 
 
 def get_evaluator(name: str) -> BaseEvaluator:
-    """Retrieve evaluator instance by name, defaulting to dummy evaluator."""
-    return _evaluators.get(name, _evaluators[DummyEvaluator.name])
+    """Retrieve evaluator instance by name, defaulting to dummy evaluator.
+
+    Builds and warms up the evaluator on first use; concurrent first calls
+    build it once.
+    """
+    evaluator = _evaluators.get(name)
+    if evaluator is not None:
+        return evaluator
+    if name not in _factories:
+        name = DummyEvaluator.name
+    return _load(name)
+
+
+async def aget_evaluator(name: str) -> BaseEvaluator:
+    """Async variant of `get_evaluator`.
+
+    A loaded evaluator is returned at once. Loading, and waiting for another
+    thread that is loading it, run on the evaluation thread pool so the event
+    loop keeps serving other requests.
+    """
+    evaluator = _evaluators.get(name)
+    if evaluator is not None:
+        return evaluator
+    return await run_blocking(get_evaluator, name)
+
+
+def warmup(names: Iterable[str]) -> Dict[str, float]:
+    """Build evaluators now instead of on their first request.
+
+    Args:
+        names: Registered evaluator names
+
+    Returns:
+        Dict[str, float]: Seconds each evaluator took to load
+
+    Raises:
+        ValueError: If a name is not registered
+    """
+    names = list(names)
+    unknown = [name for name in names if name not in _factories]
+    if unknown:
+        raise ValueError(f"Unknown evaluators {unknown}, expected some of {sorted(_factories)}")
+    for name in names:
+        _load(name)
+    return {name: _load_seconds[name] for name in names if name in _load_seconds}
+
+
+def evaluator_stats() -> Dict[str, Dict[str, Any]]:
+    """Whether each registered evaluator is loaded, how long loading took, and
+    the statistics of loaded evaluators that report any."""
+    with _lock:
+        stats = {
+            name: {"loaded": name in _evaluators, "load_seconds": _load_seconds.get(name)}
+            for name in sorted(set(_factories) | set(_evaluators))
+        }
+        evaluators = dict(_evaluators)
+    for name, evaluator in evaluators.items():
+        reported = evaluator.stats()
+        if reported:
+            stats[name]["stats"] = reported
+    return stats
+
+
+def _load(name: str) -> BaseEvaluator:
+    with _lock:
+        load_lock = _load_locks.setdefault(name, threading.Lock())
+    with load_lock:
+        evaluator = _evaluators.get(name)
+        if evaluator is None:
+            start = time.perf_counter()
+            evaluator = _factories[name]()
+            evaluator.warmup()
+            seconds = time.perf_counter() - start
+            with _lock:
+                _evaluators[name] = evaluator
+                _load_seconds[name] = seconds
+            print(f"Loaded evaluator '{name}' in {seconds:.2f}s")
+    return evaluator
@@ -0,0 +1,55 @@
+import os
+from typing import Callable, Dict, Optional
+
+import torch
+
+from vizeval.evaluators.model_loading import load_torchscript
+
+BACKEND_ENV = "VIZEVAL_INFERENCE_BACKEND"
+DEFAULT_BACKEND = "torchscript"
+
+# A loader takes (model_path, device, shared_weights=None) and returns a model
+# called as model(input_ids, attention_mask) -> scores tensor
+ModelLoader = Callable[..., Callable]
+
+_loaders: Dict[str, ModelLoader] = {}
+
+
+def register_backend(name: str, loader: ModelLoader) -> None:
+    """Register how a backend loads a model.
+
+    Args:
+        name: Name selecting the backend in `load_model` and VIZEVAL_INFERENCE_BACKEND
+        loader: Callable building the model; import the backend runtime inside it
+    """
+    _loaders[name] = loader
+
+
+def load_model(model_path: str, device: torch.device, backend: Optional[str] = None,
+               shared_weights: Optional[bool] = None):
+    """Load a scoring model with the configured inference backend.
+
+    Args:
+        model_path: Path to the TorchScript model file; other backends load the
+            file they export from it
+        device: Device to run the model on
+        backend: Registered backend name; defaults to VIZEVAL_INFERENCE_BACKEND,
+            then to "torchscript"
+        shared_weights: Passed to backends that can share weights between processes
+
+    Raises:
+        ValueError: If the backend is not registered
+    """
+    backend = backend or os.getenv(BACKEND_ENV) or DEFAULT_BACKEND
+    if backend not in _loaders:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {sorted(_loaders)}")
+    return _loaders[backend](model_path, device, shared_weights=shared_weights)
+
+
+def _onnx(model_path: str, device: torch.device, shared_weights: Optional[bool] = None):
+    from vizeval.evaluators.onnx_runtime import load_onnx
+    return load_onnx(model_path, device)
+
+
+register_backend("torchscript", load_torchscript)
+register_backend("onnx", _onnx)
@@ -1,19 +1,63 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.core.executor import run_blocking
 
 class BaseEvaluator(ABC):
     """Abstract base class for all evaluators."""
 
     name: str = "base"
+    # Part of the fast-result cache key
+    version: str = "1"
 
     @abstractmethod
     def fast_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
         """Return evaluation result as a dictionary."""
         raise NotImplementedError
 
-    def detailed_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
-        """Return evaluation result as a dictionary."""
+    def fast_evaluate_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Return one fast evaluation result per request, in order.
+
+        Evaluators backed by a model that scores batches in one forward pass
+        should override this. The default evaluates the requests one by one.
+        """
+        return [self.fast_evaluate(request) for request in requests]
+
+    def warmup(self) -> None:
+        """Get ready to serve, e.g. by running warmup batches through models.
+
+        Called once, right after the evaluator is built and before it scores
+        its first request. The default does nothing.
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Evaluator-specific statistics reported by `GET /stats`, e.g. LLM usage."""
+        return {}
+
+    def detailed_evaluate(self, request: EvaluationRequest,
+                          fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
+        """Return evaluation result as a dictionary.
+
+        `fast_result` is the fast evaluation already computed for the request, if
+        any, so implementations can reuse it instead of scoring again.
+        """
         raise NotImplementedError
-    
\ No newline at end of file
+
+    async def afast_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
+        """Async variant of `fast_evaluate`.
+
+        Evaluators with a native async client should override this. The default
+        runs the blocking `fast_evaluate` on the shared evaluation thread pool so
+        the event loop stays free while inference is in flight.
+        """
+        return await run_blocking(self.fast_evaluate, request)
+
+    async def adetailed_evaluate(self, request: EvaluationRequest,
+                                 fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
+        """Async variant of `detailed_evaluate`, offloaded like `afast_evaluate`."""
+        return await run_blocking(self.detailed_evaluate, request, fast_result)
+
+    async def afast_evaluate_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """Async variant of `fast_evaluate_batch`, offloaded like `afast_evaluate`."""
+        return await run_blocking(self.fast_evaluate_batch, requests)
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent single-item calls into batched calls.
+
+    Callers submit items from any thread. A background thread collects them
+    until `max_batch_size` items are pending or `max_wait_ms` has passed since
+    the oldest pending item arrived, runs `batch_fn` once on the whole batch
+    and hands each caller its own row of the result.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Sequence[R]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+
+        self._pending: Deque[Tuple[T, Future, float]] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queue an item for the next batch and return a future for its result."""
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._pending.append((item, future, time.monotonic()))
+            self._condition.notify()
+        return future
+
+    def __call__(self, item: T) -> R:
+        """Submit an item and block until its result is available."""
+        return self.submit(item).result()
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting items, finish the pending ones and stop the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=timeout)
+
+    def _next_batch(self) -> List[Tuple[T, Future, float]]:
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+
+            deadline = self._pending[0][2] + self.max_wait if self._pending else 0.0
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                # Only happens once closed and fully drained
+                return
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[T, Future, float]]) -> None:
+        items = [item for item, _, _ in batch]
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(items)
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
@@ -1,5 +1,5 @@
 import random
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from vizeval.evaluators.base import BaseEvaluator
 from vizeval.core.entities import EvaluationRequest, EvaluationResult
@@ -17,7 +17,8 @@ class DummyEvaluator(BaseEvaluator):
             evaluator=self.name,
         )
 
-    def detailed_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
+    def detailed_evaluate(self, request: EvaluationRequest,
+                          fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
         # Very naive evaluation: random score and generic feedback
         score = random.uniform(0, 1)
         feedback = "This is a dummy evaluation. Replace with domain-specific logic."
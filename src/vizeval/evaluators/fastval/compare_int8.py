@@ -0,0 +1,34 @@
+"""Compare fp32 and int8 fastval scores on a held-out request set.
+
+Reports score drift and speedup, and exits with status 1 when the drift is
+larger than `--max-drift`, so it can gate a model release:
+
+    python -m vizeval.evaluators.fastval.compare_int8 --requests heldout.jsonl
+"""
+import argparse
+import sys
+
+from vizeval.evaluators.fastval import FastvalModel
+from vizeval.evaluators.quantization import default_int8_max_drift, load_requests
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="./models/fastval.pt")
+    parser.add_argument("--requests", required=True,
+                        help="JSONL file of system_prompt, user_prompt and response objects")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-drift", type=float, default=default_int8_max_drift())
+    args = parser.parse_args(argv)
+
+    model = FastvalModel(args.model, max_batch_size=1, int8=False, optimize=False)
+    report = model.compare_int8(load_requests(args.requests), batch_size=args.batch_size)
+    print(report)
+    if report.max_drift > args.max_drift:
+        print(f"Max drift {report.max_drift:.4f} is above {args.max_drift}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,163 @@
-from typing import Dict
-import os
+import time
+from typing import Dict, List, Optional, Sequence, Union
 
 from transformers import AutoTokenizer
 import torch
 
 from vizeval.core.entities import EvaluationRequest
+from vizeval.evaluators.backends import load_model
+from vizeval.evaluators.model_loading import optimize_for_inference, warmup_batch_sizes, warmup_model
+from vizeval.evaluators.quantization import (QuantizationReport, batched, compare_scores,
+                                             default_int8_max_drift, default_int8_reference,
+                                             int8_enabled, load_requests, quantize_int8)
+from vizeval.evaluators.batching import MicroBatcher
+from vizeval.evaluators.tokenization import padded_lengths, tokenize_batch
 
 
 class FastvalModel:
     name = "fastval"
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 padding: str = "bucket", buckets: Optional[Sequence[int]] = (64, 128, 256, 512),
+                 shared_weights: Optional[bool] = None, backend: Optional[str] = None,
+                 int8: Optional[bool] = None, int8_reference: Optional[str] = None,
+                 max_int8_drift: Optional[float] = None, optimize: Optional[bool] = None):
+        """
+        Args:
+            model_path: Path to the TorchScript model file
+            max_batch_size: Maximum number of concurrent requests coalesced into
+                a single forward pass. Use 1 to disable micro-batching.
+            max_wait_ms: Maximum time a request waits for others to join its batch
+            padding: "bucket", "longest" or "max_length" (see `tokenize_batch`)
+            buckets: Sequence lengths inputs are padded up to in "bucket" mode
+            shared_weights: Memory-map the weights so worker processes share them
+                (see `load_torchscript`); defaults to VIZEVAL_SHARED_WEIGHTS
+            backend: Inference backend, "torchscript" or "onnx" (see `load_model`);
+                defaults to VIZEVAL_INFERENCE_BACKEND
+            int8: Score with dynamic int8 quantized linear layers on CPU with the
+                torchscript backend; defaults to whether VIZEVAL_INT8_MODELS lists "fastval"
+            int8_reference: JSONL file of held-out requests the int8 model is checked
+                against at load time; defaults to VIZEVAL_INT8_REFERENCE
+            max_int8_drift: Largest score difference from fp32 on the reference
+                requests before falling back to fp32; defaults to VIZEVAL_INT8_MAX_DRIFT
+            optimize: Freeze and optimize the TorchScript graph for inference (see
+                `optimize_for_inference`); defaults to VIZEVAL_OPTIMIZE_MODELS
+        """
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = self._load_model(model_path)
+        self.model = self._load_model(model_path, shared_weights, backend)
         self.tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
         self.max_length = 512
+        self.padding = padding
+        self.buckets = buckets
+        if (int8_enabled(self.name) if int8 is None else int8) and self.device.type == "cpu":
+            self.model = self._quantize(
+                int8_reference or default_int8_reference(),
+                default_int8_max_drift() if max_int8_drift is None else max_int8_drift,
+            )
+        # After quantization, which cannot be applied to a frozen model
+        self.model = optimize_for_inference(self.model, optimize, shared_weights)
+        self.max_batch_size = max_batch_size
+        self.batcher = None
+        if max_batch_size > 1:
+            self.batcher = MicroBatcher(
+                self._evaluate_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                name="fastval-batcher",
+            )
     
-    def _load_model(self, model_path: str):
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model file not found at {model_path}")
-            
-        model = torch.jit.load(model_path, map_location=self.device)
-        model.eval()
-        return model
+    def _load_model(self, model_path: str, shared_weights: Optional[bool] = None,
+                    backend: Optional[str] = None):
+        return load_model(model_path, self.device, backend, shared_weights=shared_weights)
+    
+    def prepare(self, batch_sizes: Optional[Sequence[int]] = None) -> float:
+        """Warm up the tokenizer and the model at every padded sequence length.
+        
+        Args:
+            batch_sizes: Batch sizes to warm up at each length; defaults to the
+                sizes the micro-batcher produces (see `warmup_batch_sizes`)
+        
+        Returns:
+            float: Seconds spent warming up
+        """
+        start = time.perf_counter()
+        self._tokenize("warmup")
+        warmup_model(self.model, self.device, padded_lengths(self.max_length, self.padding, self.buckets),
+                     batch_sizes or warmup_batch_sizes(self.max_batch_size))
+        return time.perf_counter() - start
     
     def _prepare_input(self, request: EvaluationRequest) -> str:
         context = f"System: {request.system_prompt}\n\nUser: {request.user_prompt}\n\nResponse: {request.response}"
         return context
     
-    def _tokenize(self, text: str) -> Dict[str, torch.Tensor]:
-        encoded = self.tokenizer(text, 
-                                 truncation=True, 
-                                 padding="max_length", 
-                                 max_length=self.max_length, 
-                                 return_tensors="pt")
+    def _tokenize(self, text: Union[str, List[str]]) -> Dict[str, torch.Tensor]:
+        encoded = tokenize_batch(self.tokenizer,
+                                 text,
+                                 max_length=self.max_length,
+                                 padding=self.padding,
+                                 buckets=self.buckets)
         return {
             "input_ids": encoded["input_ids"].to(self.device),
             "attention_mask": encoded["attention_mask"].to(self.device)
         }
     
+    def _quantize(self, reference_path: Optional[str], max_drift: float):
+        if not isinstance(self.model, torch.jit.ScriptModule):
+            print("Int8 quantization applies to the torchscript backend only, keeping fastval as is")
+            return self.model
+        quantized = quantize_int8(self.model)
+        if reference_path is None:
+            print("Scoring fastval with int8 weights, not checked against a reference set")
+            return quantized
+        report = self.compare_int8(load_requests(reference_path), quantized)
+        if report.max_drift > max_drift:
+            print(f"Keeping fp32 fastval, int8 scores drift too far: {report}")
+            return self.model
+        print(f"Scoring fastval with int8 weights: {report}")
+        return quantized
+    
+    def compare_int8(self, requests: List[EvaluationRequest], quantized=None,
+                     batch_size: int = 32) -> QuantizationReport:
+        """Score held-out requests with the fp32 model and its int8 version.
+        
+        Without `quantized`, the model must be loaded with `optimize=False`, since
+        a frozen model cannot be quantized.
+        
+        Args:
+            requests: Held-out requests, ideally like production traffic
+            quantized: Int8 version of the model; quantized from the fp32 model if omitted
+            batch_size: Requests scored per forward pass
+        """
+        quantized = quantized if quantized is not None else quantize_int8(self.model)
+        return compare_scores(lambda batch: self._score(self.model, batch),
+                              lambda batch: self._score(quantized, batch),
+                              batched(requests, batch_size))
+    
+    def _score(self, model, requests: List[EvaluationRequest]) -> List[float]:
+        with torch.no_grad():
+            input_texts = [self._prepare_input(request) for request in requests]
+            tokens = self._tokenize(input_texts)
+            # TorchScript model expects positional arguments
+            scores = model(tokens["input_ids"], tokens["attention_mask"])
+
+        return scores.reshape(len(requests), -1)[:, 0].tolist()
+
+    def _evaluate_batch(self, requests: List[EvaluationRequest]) -> List[float]:
+        return self._score(self.model, requests)
+
+    def evaluate_batch(self, requests: List[EvaluationRequest]) -> List[float]:
+        """Score several requests in a single forward pass, bypassing the batcher."""
+        try:
+            return self._evaluate_batch(requests)
+        except Exception as e:
+            print(f"Error scoring a fastval batch of {len(requests)} requests: {str(e)}")
+            return [-1] * len(requests)
+
     def evaluate(self, request: EvaluationRequest) -> float:
         try:
-            with torch.no_grad():
-                input_text = self._prepare_input(request)
-                tokens = self._tokenize(input_text)
-                # TorchScript model expects positional arguments
-                score = self.model(tokens["input_ids"], tokens["attention_mask"]).item()
-                
-            return score
+            if self.batcher is None:
+                return self._evaluate_batch([request])[0]
+            # Concurrent callers are coalesced into one padded batch
+            return self.batcher(request)
         except Exception as e:
             return -1
\ No newline at end of file
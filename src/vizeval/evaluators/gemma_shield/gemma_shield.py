@@ -1,39 +1,72 @@
-from typing import Dict
-import os
+import time
+from typing import Dict, List, Optional, Sequence, Union
 
 from transformers import AutoTokenizer
 import torch
 
 from vizeval.core.entities import EvaluationRequest
+from vizeval.evaluators.backends import load_model
+from vizeval.evaluators.model_loading import optimize_for_inference, warmup_model
+from vizeval.evaluators.tokenization import padded_lengths, tokenize_batch
 
 
 class GemmaShieldModel:
     name = "gemma_shield"
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, padding: str = "bucket",
+                 buckets: Optional[Sequence[int]] = (128, 256, 512, 1024),
+                 shared_weights: Optional[bool] = None, backend: Optional[str] = None,
+                 optimize: Optional[bool] = None):
+        """
+        Args:
+            model_path: Path to the TorchScript model file
+            padding: "bucket", "longest" or "max_length" (see `tokenize_batch`)
+            buckets: Sequence lengths inputs are padded up to in "bucket" mode
+            shared_weights: Memory-map the weights so worker processes share them
+                (see `load_torchscript`); defaults to VIZEVAL_SHARED_WEIGHTS
+            backend: Inference backend, "torchscript" or "onnx" (see `load_model`);
+                defaults to VIZEVAL_INFERENCE_BACKEND
+            optimize: Freeze and optimize the TorchScript graph for inference (see
+                `optimize_for_inference`); defaults to VIZEVAL_OPTIMIZE_MODELS
+        """
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = self._load_model(model_path)
+        self.model = optimize_for_inference(self._load_model(model_path, shared_weights, backend),
+                                            optimize, shared_weights)
         self.tokenizer = AutoTokenizer.from_pretrained("google/shieldgemma-2b")
         self.max_length = 1024
+        self.padding = padding
+        self.buckets = buckets
     
-    def _load_model(self, model_path: str):
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model file not found at {model_path}")
-            
-        model = torch.jit.load(model_path, map_location=self.device)
-        model.eval()
-        return model
+    def _load_model(self, model_path: str, shared_weights: Optional[bool] = None,
+                    backend: Optional[str] = None):
+        return load_model(model_path, self.device, backend, shared_weights=shared_weights)
+    
+    def prepare(self, batch_sizes: Sequence[int] = (1,)) -> float:
+        """Warm up the tokenizer and the model at every padded sequence length.
+        
+        Args:
+            batch_sizes: Batch sizes to warm up at each length; `evaluate` scores
+                one request at a time
+        
+        Returns:
+            float: Seconds spent warming up
+        """
+        start = time.perf_counter()
+        self._tokenize("warmup")
+        warmup_model(self.model, self.device, padded_lengths(self.max_length, self.padding, self.buckets),
+                     batch_sizes)
+        return time.perf_counter() - start
     
     def _prepare_input(self, request: EvaluationRequest) -> str:
         context = f"System: {request.system_prompt}\n\nUser: {request.user_prompt}\n\nResponse: {request.response}"
         return context
     
-    def _tokenize(self, text: str) -> Dict[str, torch.Tensor]:
-        encoded = self.tokenizer(text, 
-                                 truncation=True, 
-                                 padding="max_length", 
-                                 max_length=self.max_length, 
-                                 return_tensors="pt")
+    def _tokenize(self, text: Union[str, List[str]]) -> Dict[str, torch.Tensor]:
+        encoded = tokenize_batch(self.tokenizer,
+                                 text,
+                                 max_length=self.max_length,
+                                 padding=self.padding,
+                                 buckets=self.buckets)
         return {
             "input_ids": encoded["input_ids"].to(self.device),
             "attention_mask": encoded["attention_mask"].to(self.device)
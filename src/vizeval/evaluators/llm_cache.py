@@ -0,0 +1,41 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+LLM_CACHE_PATH_ENV = "VIZEVAL_LLM_CACHE_PATH"
+LLM_CACHE_SIZE_ENV = "VIZEVAL_LLM_CACHE_SIZE"
+LLM_CACHE_TTL_ENV = "VIZEVAL_LLM_CACHE_TTL"
+LLM_CACHE_BYPASS_ENV = "VIZEVAL_LLM_CACHE_BYPASS"
+
+# One cache shared by every LLM-backed evaluator of the process, built on first
+# use so importing this module does not load LangChain
+_cache = None
+_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """The shared persistent LLM response cache, or None when it is off.
+
+    It is on when VIZEVAL_LLM_CACHE_PATH names a SQLite file, and bypassed,
+    neither read nor written, when VIZEVAL_LLM_CACHE_BYPASS is true.
+    """
+    global _cache
+    path = os.getenv(LLM_CACHE_PATH_ENV)
+    if not path or os.getenv(LLM_CACHE_BYPASS_ENV, "").lower() in ("1", "true", "yes"):
+        return None
+    with _lock:
+        if _cache is None or _cache.path != path:
+            from vizeval.infrastructure.cache.llm_cache import SqliteLLMCache
+            ttl_seconds = os.getenv(LLM_CACHE_TTL_ENV)
+            _cache = SqliteLLMCache(
+                path,
+                max_entries=int(os.getenv(LLM_CACHE_SIZE_ENV, "100000")),
+                ttl_seconds=float(ttl_seconds) if ttl_seconds else None,
+            )
+        return _cache
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    """Statistics of the shared LLM cache, or None if no evaluator has used it."""
+    with _lock:
+        return _cache.stats() if _cache is not None else None
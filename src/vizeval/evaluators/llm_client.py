@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Optional
+
+import openai
+from langchain.chat_models import ChatOpenAI
+
+from vizeval.evaluators.rate_limit import get_llm_limiter
+
+# Completion tokens reserved for a call that does not set max_tokens; the
+# reservation is settled with the real usage once the answer arrives
+DEFAULT_COMPLETION_TOKENS = 256
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Rough prompt plus completion tokens of a chat completion, at about four characters a token."""
+    characters = sum(len(str(message.get("content", ""))) for message in messages)
+    return characters // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _total_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+class RateLimitedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose calls go through the shared rate limiter of its model (see `get_llm_limiter`).
+
+    The limiter retries 429 and 5xx answers itself, so build it with
+    `max_retries=0`. Prompts answered from the LLM cache never reach it.
+    """
+
+    def completion_with_retry(self, run_manager: Optional[Any] = None, **kwargs: Any) -> Any:
+        create = super().completion_with_retry
+        return get_llm_limiter(self.model_name).call(
+            lambda: create(run_manager=run_manager, **kwargs),
+            tokens=estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens")),
+            used_tokens=_total_tokens,
+            transient_errors=(openai.APIConnectionError,),
+        )
@@ -0,0 +1,68 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+class LLMUsageTracker(BaseCallbackHandler):
+    """Counts calls, latency and tokens of LLM calls, per tag.
+
+    Attach it to the LLM of each chain together with a tag naming the chain,
+    e.g. `ChatOpenAI(callbacks=[tracker], tags=["risk"])`. Calls running on
+    several threads at once are counted correctly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[UUID, tuple] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     tags: Optional[List[str]] = None, **kwargs: Any) -> None:
+        self._start(run_id, tags)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, tags: Optional[List[str]] = None, **kwargs: Any) -> None:
+        self._start(run_id, tags)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        self._finish(run_id, prompt_tokens=usage.get("prompt_tokens", 0),
+                     completion_tokens=usage.get("completion_tokens", 0))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, errors=1)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Calls, errors, latency and tokens per tag, with per-call averages."""
+        with self._lock:
+            stats = {name: dict(values) for name, values in self._stats.items()}
+        for values in stats.values():
+            calls = values["calls"] or 1
+            values["average_seconds"] = values["seconds"] / calls
+            values["average_tokens"] = (values["prompt_tokens"] + values["completion_tokens"]) / calls
+        return stats
+
+    def _start(self, run_id: UUID, tags: Optional[List[str]]) -> None:
+        # The LLM's own tag comes after any tags inherited from the chain
+        name = tags[-1] if tags else "llm"
+        with self._lock:
+            self._started[run_id] = (name, time.perf_counter())
+
+    def _finish(self, run_id: UUID, errors: int = 0, prompt_tokens: int = 0,
+                completion_tokens: int = 0) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started is None:
+                return
+            name, start = started
+            values = self._stats.setdefault(name, {"calls": 0, "errors": 0, "seconds": 0.0,
+                                                   "prompt_tokens": 0, "completion_tokens": 0})
+            values["calls"] += 1
+            values["errors"] += errors
+            values["seconds"] += time.perf_counter() - start
+            values["prompt_tokens"] += prompt_tokens
+            values["completion_tokens"] += completion_tokens
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from vizeval.evaluators.fastval import FastvalModel
 from vizeval.evaluators.gemma_shield import GemmaShieldModel
 from vizeval.evaluators.base import BaseEvaluator
@@ -12,6 +14,11 @@ class MedicalEvaluator(BaseEvaluator):
     def __init__(self):
         self.fastval = FastvalModel(model_path="./models/fastval.pt")
         self.gemma_shield = GemmaShieldModel(model_path="./models/gemma_shield.pt")
+    
+    def warmup(self) -> None:
+        fastval_seconds = self.fastval.prepare()
+        shield_seconds = self.gemma_shield.prepare()
+        print(f"Warmed up fastval in {fastval_seconds:.2f}s and gemma_shield in {shield_seconds:.2f}s")
             
     def fast_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
         """
@@ -33,9 +40,28 @@ class MedicalEvaluator(BaseEvaluator):
                 evaluator=self.name,
             )
 
-    def detailed_evaluate(self, request: EvaluationRequest) -> EvaluationResult:
+    def fast_evaluate_batch(self, requests: List[EvaluationRequest]) -> List[EvaluationResult]:
+        """
+        Score all requests with a single Fastval forward pass.
+        """
+        risk_scores = self.fastval.evaluate_batch(requests)
+        return [
+            EvaluationResult(
+                score=risk_score,
+                feedback=None if risk_score >= 0 else "Error at fast_evaluate_batch",
+                evaluator=self.name,
+            )
+            for risk_score in risk_scores
+        ]
+
+    def detailed_evaluate(self, request: EvaluationRequest,
+                          fast_result: Optional[EvaluationResult] = None) -> EvaluationResult:
         try:
-            feedback = self.fastval.evaluate(request)
+            # The queued fast result already holds the Fastval score
+            if fast_result is not None and fast_result.score is not None and fast_result.score >= 0:
+                feedback = fast_result.score
+            else:
+                feedback = self.fastval.evaluate(request)
             risk_score = self.gemma_shield.evaluate(request)
             
             return EvaluationResult(
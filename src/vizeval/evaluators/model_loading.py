@@ -0,0 +1,163 @@
+import os
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import torch
+
+SHARED_WEIGHTS_ENV = "VIZEVAL_SHARED_WEIGHTS"
+MODEL_CACHE_DIR_ENV = "VIZEVAL_MODEL_CACHE_DIR"
+OPTIMIZE_ENV = "VIZEVAL_OPTIMIZE_MODELS"
+
+
+def _env_flag(name: str, default: str = "") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def shared_weights_enabled(shared_weights: Optional[bool] = None) -> bool:
+    """Resolve `shared_weights`, defaulting to the VIZEVAL_SHARED_WEIGHTS env var."""
+    return _env_flag(SHARED_WEIGHTS_ENV) if shared_weights is None else shared_weights
+
+
+def load_torchscript(model_path: str, device: torch.device, shared_weights: Optional[bool] = None,
+                     cache_dir: Optional[str] = None):
+    """Load a TorchScript model for inference.
+
+    With shared weights, the model is split once into a weightless skeleton and
+    a weights file next to it (or in `cache_dir`). Every process then loads the
+    small skeleton and memory-maps the weights read-only, so all processes on a
+    host share one copy of the weights in the page cache. Without them, each
+    process holds its own copy. Shared weights only apply on CPU.
+
+    Args:
+        model_path: Path to the TorchScript model file
+        device: Device to load the model on
+        shared_weights: Memory-map the weights; defaults to the VIZEVAL_SHARED_WEIGHTS env var
+        cache_dir: Where split models are written; defaults to VIZEVAL_MODEL_CACHE_DIR,
+            then to the directory of the model
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found at {model_path}")
+    if not shared_weights_enabled(shared_weights) or device.type != "cpu":
+        model = torch.jit.load(model_path, map_location=device)
+        model.eval()
+        return model
+
+    skeleton_path, weights_path = split_paths(model_path, cache_dir or os.getenv(MODEL_CACHE_DIR_ENV))
+    if not (os.path.exists(skeleton_path) and os.path.exists(weights_path)):
+        split_model(model_path, skeleton_path, weights_path)
+
+    model = torch.jit.load(skeleton_path, map_location=device)
+    try:
+        weights = torch.load(weights_path, mmap=True, weights_only=True)
+    except TypeError as e:
+        raise RuntimeError("Shared model weights need torch>=2.1 for memory-mapped loading") from e
+    with torch.no_grad():
+        for name, tensor in _named_tensors(model):
+            tensor.data = weights[name]
+    model.eval()
+    return model
+
+
+def optimize_for_inference(model, optimize: Optional[bool] = None,
+                           shared_weights: Optional[bool] = None):
+    """Freeze a TorchScript model and optimize its graph for inference.
+
+    Freezing inlines parameters and attributes as constants, which lets
+    `torch.jit.optimize_for_inference` fold and fuse operators for CPU. The
+    model can no longer be trained or quantized afterwards. Models of other
+    backends are returned as is, and so are models with shared weights, since
+    folding writes weights into private copies and would undo the sharing.
+
+    Args:
+        model: Loaded model, in eval mode
+        optimize: Whether to optimize; defaults to VIZEVAL_OPTIMIZE_MODELS, then to true
+        shared_weights: Whether the weights are memory-mapped (see `load_torchscript`)
+    """
+    optimize = _env_flag(OPTIMIZE_ENV, "true") if optimize is None else optimize
+    if not optimize or not isinstance(model, torch.jit.ScriptModule) or shared_weights_enabled(shared_weights):
+        return model
+    return torch.jit.optimize_for_inference(torch.jit.freeze(model.eval()))
+
+
+def warmup_batch_sizes(max_batch_size: int) -> List[int]:
+    """Batch sizes to warm up a model served by a micro-batcher of `max_batch_size`.
+
+    The batcher produces any size up to `max_batch_size`; powers of two and
+    the largest size stand in for them, so warmup stays short for large batches.
+    """
+    sizes = []
+    size = 1
+    while size < max_batch_size:
+        sizes.append(size)
+        size *= 2
+    sizes.append(max_batch_size)
+    return sizes
+
+
+def warmup_model(model, device: torch.device, lengths: Sequence[int],
+                 batch_sizes: Sequence[int] = (1,), runs: int = 2) -> float:
+    """Run synthetic batches through a model before it serves requests.
+
+    TorchScript profiles the first runs of a graph and only then compiles an
+    optimized plan, and the allocator grows its caches on the first batches of
+    each size. Running every padded shape here moves those costs out of the
+    first requests.
+
+    Args:
+        model: Model called as model(input_ids, attention_mask)
+        device: Device the model runs on
+        lengths: Sequence lengths inputs are padded to, e.g. the tokenizer buckets
+        batch_sizes: Batch sizes to run at each length
+        runs: Runs per shape; TorchScript needs two to profile and then optimize
+
+    Returns:
+        float: Seconds spent warming up
+    """
+    start = time.perf_counter()
+    with torch.no_grad():
+        for length in lengths:
+            for batch_size in batch_sizes:
+                input_ids = torch.ones((batch_size, length), dtype=torch.long, device=device)
+                for _ in range(runs):
+                    model(input_ids, torch.ones_like(input_ids))
+    return time.perf_counter() - start
+
+
+def split_paths(model_path: str, cache_dir: Optional[str] = None) -> Tuple[str, str]:
+    """Paths of the skeleton and weights files of a model.
+
+    They are named after the size and modification time of the model file, so
+    replacing the model splits it again instead of reusing stale weights.
+    """
+    stat = os.stat(model_path)
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    prefix = os.path.join(cache_dir or os.path.dirname(os.path.abspath(model_path)),
+                          f"{stem}-{stat.st_size}-{stat.st_mtime_ns}")
+    return f"{prefix}.skeleton.pt", f"{prefix}.weights"
+
+
+def split_model(model_path: str, skeleton_path: str, weights_path: str) -> None:
+    """Write the weights of a TorchScript model and the model without them.
+
+    Files are written under temporary names and renamed, so processes splitting
+    the same model at once never read a partial file.
+    """
+    model = torch.jit.load(model_path, map_location="cpu")
+    weights = {name: tensor.detach().contiguous() for name, tensor in _named_tensors(model)}
+
+    os.makedirs(os.path.dirname(os.path.abspath(weights_path)), exist_ok=True)
+    temporary = f"{weights_path}.{os.getpid()}.tmp"
+    torch.save(weights, temporary)
+    os.replace(temporary, weights_path)
+
+    with torch.no_grad():
+        for _, tensor in _named_tensors(model):
+            tensor.data = torch.empty(0, dtype=tensor.dtype)
+    temporary = f"{skeleton_path}.{os.getpid()}.tmp"
+    model.save(temporary)
+    os.replace(temporary, skeleton_path)
+
+
+def _named_tensors(model) -> Iterator[Tuple[str, torch.Tensor]]:
+    yield from model.named_parameters()
+    yield from model.named_buffers()
@@ -0,0 +1,166 @@
+"""ONNX Runtime inference backend, and the tool exporting TorchScript models for it.
+
+Export the models once, next to the `.pt` files:
+
+    python -m vizeval.evaluators.onnx_runtime ./models/fastval.pt ./models/gemma_shield.pt
+
+Needs the `onnx` extra: `pip install vizeval[onnx]`.
+"""
+import argparse
+import inspect
+import os
+import sys
+from typing import List, Optional
+
+import torch
+
+INTRA_OP_THREADS_ENV = "VIZEVAL_ONNX_INTRA_OP_THREADS"
+INTER_OP_THREADS_ENV = "VIZEVAL_ONNX_INTER_OP_THREADS"
+OPTIMIZATION_ENV = "VIZEVAL_ONNX_OPTIMIZATION"
+
+INPUT_NAMES = ["input_ids", "attention_mask"]
+OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
+def _onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError("The onnx inference backend needs onnxruntime: pip install vizeval[onnx]") from e
+    return onnxruntime
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+class OnnxRuntimeModel:
+    """An exported model run by ONNX Runtime, called like the TorchScript model."""
+
+    def __init__(self, onnx_path: str, device: torch.device = torch.device("cpu"),
+                 intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None,
+                 optimization: Optional[str] = None):
+        """
+        Args:
+            onnx_path: Path to the exported model
+            device: Runs on CUDA when it is a CUDA device and onnxruntime-gpu is installed
+            intra_op_threads: Threads used inside an operator; defaults to
+                VIZEVAL_ONNX_INTRA_OP_THREADS, then to ONNX Runtime's choice (one per core)
+            inter_op_threads: Threads running independent operators in parallel;
+                defaults to VIZEVAL_ONNX_INTER_OP_THREADS, then to sequential execution
+            optimization: Graph optimizations applied when the session is created,
+                "disable", "basic", "extended" or "all"; defaults to VIZEVAL_ONNX_OPTIMIZATION,
+                then to "all"
+        """
+        ort = _onnxruntime()
+        optimization = optimization or os.getenv(OPTIMIZATION_ENV) or "all"
+        if optimization not in OPTIMIZATION_LEVELS:
+            raise ValueError(f"Unknown ONNX optimization '{optimization}', "
+                             f"expected one of {list(OPTIMIZATION_LEVELS)}")
+        intra_op_threads = intra_op_threads or _env_int(INTRA_OP_THREADS_ENV)
+        inter_op_threads = inter_op_threads or _env_int(INTER_OP_THREADS_ENV)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel,
+                                                   OPTIMIZATION_LEVELS[optimization])
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+            if inter_op_threads > 1:
+                options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+
+        providers = ["CPUExecutionProvider"]
+        if device.type == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        self.session = ort.InferenceSession(onnx_path, options, providers=providers)
+
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        inputs = {"input_ids": input_ids.cpu().numpy(), "attention_mask": attention_mask.cpu().numpy()}
+        return torch.from_numpy(self.session.run(None, inputs)[0])
+
+
+def onnx_path(model_path: str) -> str:
+    """Path of the ONNX export of a TorchScript model: the same name with `.onnx`."""
+    if model_path.endswith(".onnx"):
+        return model_path
+    return os.path.splitext(model_path)[0] + ".onnx"
+
+
+def load_onnx(model_path: str, device: torch.device) -> OnnxRuntimeModel:
+    """Load the ONNX export of a model.
+
+    Raises:
+        FileNotFoundError: If the model has not been exported
+    """
+    path = onnx_path(model_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ONNX model not found at {path}, export it with "
+                                f"`python -m vizeval.evaluators.onnx_runtime {model_path}`")
+    return OnnxRuntimeModel(path, device)
+
+
+def export_onnx(model_path: str, output_path: Optional[str] = None, opset: int = 17) -> str:
+    """Export a TorchScript model to ONNX with dynamic batch and sequence length.
+
+    Args:
+        model_path: Path to the TorchScript model file
+        output_path: Where to write the export; defaults to `onnx_path(model_path)`
+        opset: ONNX opset version
+
+    Returns:
+        str: Path of the exported model
+    """
+    output_path = output_path or onnx_path(model_path)
+    model = torch.jit.load(model_path, map_location="cpu").eval()
+    input_ids = torch.ones((2, 16), dtype=torch.long)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES}
+    dynamic_axes["scores"] = {0: "batch"}
+    kwargs = {}
+    # Newer torch defaults to the dynamo exporter, which cannot read TorchScript
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+
+    temporary = f"{output_path}.{os.getpid()}.tmp"
+    with torch.no_grad():
+        torch.onnx.export(model, (input_ids, torch.ones_like(input_ids)), temporary,
+                          input_names=INPUT_NAMES, output_names=["scores"],
+                          dynamic_axes=dynamic_axes, opset_version=opset, **kwargs)
+    os.replace(temporary, output_path)
+    return output_path
+
+
+def max_score_difference(model_path: str, exported_path: str, batch_size: int = 4,
+                         sequence_length: int = 64) -> float:
+    """Largest score difference between a TorchScript model and its export on random inputs."""
+    model = torch.jit.load(model_path, map_location="cpu").eval()
+    exported = OnnxRuntimeModel(exported_path)
+    input_ids = torch.randint(1000, 2000, (batch_size, sequence_length))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[0, sequence_length // 2:] = 0
+    with torch.no_grad():
+        expected = model(input_ids, attention_mask)
+    return (expected - exported(input_ids, attention_mask)).abs().max().item()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("models", nargs="+", help="TorchScript model files")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args(argv)
+
+    for model_path in args.models:
+        exported_path = export_onnx(model_path, opset=args.opset)
+        difference = max_score_difference(model_path, exported_path)
+        print(f"{model_path} -> {exported_path} (max score difference {difference:.2e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
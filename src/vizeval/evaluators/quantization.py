@@ -0,0 +1,108 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import torch
+
+from vizeval.core.entities import EvaluationRequest
+
+INT8_MODELS_ENV = "VIZEVAL_INT8_MODELS"
+INT8_REFERENCE_ENV = "VIZEVAL_INT8_REFERENCE"
+INT8_MAX_DRIFT_ENV = "VIZEVAL_INT8_MAX_DRIFT"
+
+
+@dataclass
+class QuantizationReport:
+    """Scores of an int8 model compared with its fp32 original on the same requests."""
+    samples: int
+    max_drift: float
+    mean_drift: float
+    fp32_seconds: float
+    int8_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.fp32_seconds / self.int8_seconds if self.int8_seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.samples} requests, score drift max {self.max_drift:.4f} "
+                f"mean {self.mean_drift:.4f}, fp32 {self.fp32_seconds:.2f}s "
+                f"int8 {self.int8_seconds:.2f}s ({self.speedup:.2f}x)")
+
+
+def int8_enabled(model_name: str) -> bool:
+    """Whether VIZEVAL_INT8_MODELS, e.g. `fastval,gemma_shield`, names the model."""
+    names = os.getenv(INT8_MODELS_ENV, "")
+    return model_name in {name.strip() for name in names.split(",")}
+
+
+def default_int8_reference() -> Optional[str]:
+    return os.getenv(INT8_REFERENCE_ENV) or None
+
+
+def default_int8_max_drift() -> float:
+    return float(os.getenv(INT8_MAX_DRIFT_ENV, "0.02"))
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of the linear layers of a TorchScript model.
+
+    Weights are quantized once; activations are quantized on the fly per batch,
+    so no calibration data is needed. The result runs on CPU only.
+    """
+    from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic_jit
+
+    with torch.no_grad():
+        quantized = quantize_dynamic_jit(model, {"": default_dynamic_qconfig})
+    quantized.eval()
+    return quantized
+
+
+def compare_scores(fp32: Callable[[list], List[float]], int8: Callable[[list], List[float]],
+                   batches: Iterable[list]) -> QuantizationReport:
+    """Score the same batches with both models and measure drift and time.
+
+    Args:
+        fp32: Scores a batch with the original model
+        int8: Scores a batch with the quantized model
+        batches: Held-out inputs, in the batches they are scored in
+
+    Returns:
+        QuantizationReport: Absolute score differences and time spent by each model
+    """
+    drifts = []
+    fp32_seconds = int8_seconds = 0.0
+    for batch in batches:
+        start = time.perf_counter()
+        expected = fp32(batch)
+        fp32_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = int8(batch)
+        int8_seconds += time.perf_counter() - start
+        drifts.extend(abs(a - b) for a, b in zip(expected, actual))
+    return QuantizationReport(
+        samples=len(drifts),
+        max_drift=max(drifts, default=0.0),
+        mean_drift=sum(drifts) / len(drifts) if drifts else 0.0,
+        fp32_seconds=fp32_seconds,
+        int8_seconds=int8_seconds,
+    )
+
+
+def load_requests(path: str) -> List[EvaluationRequest]:
+    """Read requests from a JSONL file of system_prompt, user_prompt and response objects."""
+    requests = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                requests.append(EvaluationRequest(system_prompt=row.get("system_prompt", ""),
+                                                  user_prompt=row.get("user_prompt", ""),
+                                                  response=row.get("response", "")))
+    return requests
+
+
+def batched(items: Sequence, batch_size: int) -> List[Sequence]:
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
@@ -0,0 +1,268 @@
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from vizeval.core.interfaces import EvaluatorUnavailableError
+
+LLM_RPM_ENV = "VIZEVAL_LLM_RPM"
+LLM_TPM_ENV = "VIZEVAL_LLM_TPM"
+LLM_MAX_CONCURRENCY_ENV = "VIZEVAL_LLM_MAX_CONCURRENCY"
+LLM_MAX_RETRIES_ENV = "VIZEVAL_LLM_MAX_RETRIES"
+LLM_MAX_WAIT_ENV = "VIZEVAL_LLM_MAX_WAIT"
+
+T = TypeVar("T")
+
+
+class LLMRateLimitError(EvaluatorUnavailableError):
+    """Raised when an LLM call would wait longer than allowed for its budget, or the provider kept answering 429."""
+
+
+class TokenBucket:
+    """Budget refilled continuously at `per_minute` units a minute, holding `burst_seconds` worth.
+
+    Callers reserve what they need up front and the balance may go negative:
+    `reserve` returns how long the caller has to wait for its share, so
+    reservations are served in the order they were made. Not thread-safe.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 1.0):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+        self._available = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` from the bucket and return the seconds until it is covered."""
+        self._refill()
+        self._available -= amount
+        return max(0.0, -self._available / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Give back part of a reservation; a negative amount charges more."""
+        self._refill()
+        self._available = min(self.capacity, self._available + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class LLMRateLimiter:
+    """Requests and tokens per minute budgets, a concurrency cap and retries for the calls to one LLM.
+
+    A call first waits for a free slot, then for its share of both budgets,
+    and fails with `LLMRateLimitError` instead if that would take longer than
+    `max_wait` seconds. Answers with status 429 or 5xx, and `transient_errors`,
+    are retried up to `max_retries` times with jittered exponential backoff,
+    or after the provider's Retry-After. A 429 pauses every caller, not just
+    the one that got it. Budgets left unset are not enforced.
+
+    Providers enforce per-minute limits over shorter windows too, so the
+    budgets only let `burst_seconds` worth of calls through at once.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, max_retries: int = 3,
+                 max_wait: float = 30.0, backoff: float = 0.5, max_backoff: float = 20.0,
+                 burst_seconds: float = 1.0):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._requests = TokenBucket(requests_per_minute, burst_seconds) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._stats = {"calls": 0, "retries": 0, "throttled": 0, "rejected": 0, "failed": 0,
+                       "in_flight": 0, "queued": 0, "queue_seconds": 0.0, "max_queue_seconds": 0.0,
+                       "tokens_reserved": 0, "tokens_used": 0}
+
+    def call(self, fn: Callable[[], T], tokens: int = 0,
+             used_tokens: Optional[Callable[[T], Optional[int]]] = None,
+             transient_errors: Tuple[type, ...] = ()) -> T:
+        """Run `fn` within the budgets, retrying throttled and failed attempts.
+
+        Args:
+            fn: The LLM call
+            tokens: Estimated prompt plus completion tokens, reserved before the call
+            used_tokens: Reads the tokens actually used from the result, to
+                settle the reservation
+            transient_errors: Exceptions without a status code that are also retried
+
+        Raises:
+            LLMRateLimitError: If the call could not get its budget in time, or
+                was still throttled after the last retry
+            EvaluatorUnavailableError: If the provider still failed after the last retry
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire(tokens)
+            try:
+                result = fn()
+            except Exception as error:
+                self._release()
+                status = getattr(error, "status_code", None)
+                if not (status == 429 or (status is not None and status >= 500)
+                        or isinstance(error, transient_errors)):
+                    self._count("failed")
+                    raise
+                delay = self._backoff(attempt, _retry_after(error))
+                if status == 429:
+                    self._count("throttled")
+                    self._pause(delay)
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    if status == 429:
+                        raise LLMRateLimitError(
+                            f"LLM provider is still rate limiting after {attempt + 1} attempts",
+                            retry_after=delay,
+                        ) from error
+                    raise EvaluatorUnavailableError(
+                        f"LLM provider failed after {attempt + 1} attempts: {error}", retry_after=delay
+                    ) from error
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            self._release()
+            actual = used_tokens(result) if used_tokens is not None else None
+            if actual is not None:
+                self._settle(tokens, actual)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(requests_per_minute=self.requests_per_minute,
+                     tokens_per_minute=self.tokens_per_minute,
+                     max_concurrency=self.max_concurrency)
+        stats["average_queue_seconds"] = stats["queue_seconds"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+    def _acquire(self, tokens: int) -> None:
+        start = time.monotonic()
+        with self._lock:
+            self._stats["queued"] += 1
+        try:
+            if self._slots is not None and not self._slots.acquire(timeout=self.max_wait):
+                self._count("rejected")
+                raise LLMRateLimitError(
+                    f"No free LLM call slot within {self.max_wait:g}s "
+                    f"({self.max_concurrency} calls in flight)",
+                    retry_after=self.max_wait,
+                )
+
+            with self._lock:
+                now = time.monotonic()
+                wait = max(0.0, self._paused_until - now)
+                if self._requests is not None:
+                    wait = max(wait, self._requests.reserve(1))
+                if self._tokens is not None and tokens:
+                    wait = max(wait, self._tokens.reserve(tokens))
+                if now - start + wait > self.max_wait:
+                    # Give the budget back to the callers that can still make it
+                    if self._requests is not None:
+                        self._requests.refund(1)
+                    if self._tokens is not None and tokens:
+                        self._tokens.refund(tokens)
+                    self._stats["rejected"] += 1
+                    if self._slots is not None:
+                        self._slots.release()
+                    raise LLMRateLimitError(
+                        f"LLM budget exhausted: the call would wait {wait:.1f}s, "
+                        f"more than {self.max_wait:g}s",
+                        retry_after=wait,
+                    )
+                self._stats["tokens_reserved"] += tokens
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._stats["queued"] -= 1
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["queue_seconds"] += waited
+            self._stats["max_queue_seconds"] = max(self._stats["max_queue_seconds"], waited)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._stats["in_flight"] -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _settle(self, reserved: int, used: int) -> None:
+        with self._lock:
+            self._stats["tokens_used"] += used
+            if self._tokens is not None:
+                self._tokens.refund(reserved - used)
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter spreads the retries of callers throttled at the same moment
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+# One limiter per model, shared by every evaluator of the process, since
+# provider limits apply per model and API key
+_limiters: Dict[str, LLMRateLimiter] = {}
+_lock = threading.Lock()
+
+
+def _env_number(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_llm_limiter(model_name: str) -> LLMRateLimiter:
+    """The shared rate limiter of a model, configured by the VIZEVAL_LLM_* variables."""
+    with _lock:
+        limiter = _limiters.get(model_name)
+        if limiter is None:
+            max_concurrency = os.getenv(LLM_MAX_CONCURRENCY_ENV)
+            limiter = LLMRateLimiter(
+                requests_per_minute=_env_number(LLM_RPM_ENV),
+                tokens_per_minute=_env_number(LLM_TPM_ENV),
+                max_concurrency=int(max_concurrency) if max_concurrency else None,
+                max_retries=int(os.getenv(LLM_MAX_RETRIES_ENV, "3")),
+                max_wait=float(os.getenv(LLM_MAX_WAIT_ENV, "30")),
+            )
+            _limiters[model_name] = limiter
+        return limiter
+
+
+def llm_limiter_stats() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Statistics of each model's limiter, or None if no LLM call was made."""
+    with _lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()} or None
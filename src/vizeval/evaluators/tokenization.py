@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import torch
+
+PADDING_MODES = ("max_length", "longest", "bucket")
+
+
+def bucket_length(length: int, buckets: Sequence[int], max_length: int) -> int:
+    """Return the smallest bucket that fits `length`, capped at `max_length`."""
+    for bucket in sorted(buckets):
+        if bucket >= length:
+            return min(bucket, max_length)
+    return max_length
+
+
+def default_buckets(max_length: int, smallest: int = 64) -> List[int]:
+    """Powers of two from `smallest` up to and including `max_length`."""
+    buckets = []
+    bucket = smallest
+    while bucket < max_length:
+        buckets.append(bucket)
+        bucket *= 2
+    buckets.append(max_length)
+    return buckets
+
+
+def padded_lengths(max_length: int, padding: str = "bucket",
+                   buckets: Optional[Sequence[int]] = None) -> List[int]:
+    """Sequence lengths `tokenize_batch` pads inputs to, e.g. to warm up a model.
+
+    In "longest" mode any length is possible, so powers of two stand in for them.
+    In "bucket" mode inputs longer than every bucket are padded to `max_length`.
+    """
+    if padding == "max_length":
+        return [max_length]
+    if padding == "bucket" and buckets:
+        return sorted({min(bucket, max_length) for bucket in buckets} | {max_length})
+    return default_buckets(max_length)
+
+
+def tokenize_batch(tokenizer,
+                   texts: Union[str, List[str]],
+                   max_length: int,
+                   padding: str = "bucket",
+                   buckets: Optional[Sequence[int]] = None) -> Dict[str, torch.Tensor]:
+    """
+    Tokenize texts into padded `input_ids` / `attention_mask` tensors.
+
+    Args:
+        tokenizer: A Hugging Face tokenizer
+        texts: A single text or a batch of texts
+        max_length: Truncation length, and the padded length in "max_length" mode
+        padding: "max_length" pads every input to `max_length`; "longest" pads to
+            the longest sequence in the batch; "bucket" pads to the smallest bucket
+            that fits the longest sequence, so the model only sees a few shapes
+        buckets: Bucket lengths for "bucket" mode, defaults to powers of two
+
+    Returns:
+        Dict[str, torch.Tensor]: `input_ids` and `attention_mask` of shape [batch, length]
+    """
+    if padding not in PADDING_MODES:
+        raise ValueError(f"Unknown padding mode '{padding}', expected one of {PADDING_MODES}")
+
+    if isinstance(texts, str):
+        texts = [texts]
+
+    if padding == "max_length":
+        encoded = tokenizer(texts,
+                            truncation=True,
+                            padding="max_length",
+                            max_length=max_length,
+                            return_tensors="pt")
+    else:
+        encoded = tokenizer(texts, truncation=True, max_length=max_length)
+        longest = max(len(input_ids) for input_ids in encoded["input_ids"])
+        target_length = longest
+        if padding == "bucket":
+            target_length = bucket_length(longest, buckets or default_buckets(max_length), max_length)
+        encoded = tokenizer.pad(encoded,
+                                padding="max_length",
+                                max_length=target_length,
+                                return_tensors="pt")
+
+    return {
+        "input_ids": encoded["input_ids"],
+        "attention_mask": encoded["attention_mask"],
+    }
@@ -0,0 +1,3 @@
+from .memory_cache import MemoryResultCache
+from .sqlite_cache import SqliteResultCache
+from .api_key_cache import MemoryApiKeyCache
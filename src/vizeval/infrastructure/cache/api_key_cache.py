@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from vizeval.core.entities import User
+from vizeval.core.interfaces.api_key_cache import ApiKeyCache
+
+
+class MemoryApiKeyCache(ApiKeyCache):
+    """Bounded in-memory LRU cache of API key lookups with TTLs.
+
+    Valid keys are kept for `ttl_seconds`, so a revoked key stops working in
+    every process after at most that long. Invalid keys are cached too, for the
+    shorter `negative_ttl_seconds`, so a flood of requests with a wrong key does
+    not reach the repository. Invalid keys live in their own LRU of at most
+    `max_negative_entries`, so guessing many keys cannot evict valid ones.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0,
+                 negative_ttl_seconds: float = 30.0, max_negative_entries: Optional[int] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_negative_entries = max_negative_entries or max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._users: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._invalid: "OrderedDict[str, float]" = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str) -> Tuple[bool, Optional[User]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(api_key)
+            if entry is not None:
+                user, expires_at = entry
+                if now < expires_at:
+                    self._users.move_to_end(api_key)
+                    self.hits += 1
+                    return True, user
+                del self._users[api_key]
+
+            expires_at = self._invalid.get(api_key)
+            if expires_at is not None:
+                if now < expires_at:
+                    self.negative_hits += 1
+                    return True, None
+                del self._invalid[api_key]
+
+            self.misses += 1
+            return False, None
+
+    def set(self, api_key: str, user: Optional[User], version: Optional[int] = None) -> None:
+        if user is None:
+            self._put(self._invalid, api_key, time.monotonic() + self.negative_ttl_seconds,
+                      self.max_negative_entries, version)
+        else:
+            self._put(self._users, api_key, (user, time.monotonic() + self.ttl_seconds),
+                      self.max_entries, version)
+
+    def version(self) -> int:
+        with self._lock:
+            return self._invalidations
+
+    def invalidate(self, api_key: str) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._users.pop(api_key, None)
+            self._invalid.pop(api_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._invalid.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "entries": len(self._users),
+                "negative_entries": len(self._invalid),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
+
+    def _put(self, entries: "OrderedDict[str, Any]", api_key: str, value: Any, max_entries: int,
+             version: Optional[int]) -> None:
+        with self._lock:
+            if version is not None and version != self._invalidations:
+                # A key changed while this one was looked up, e.g. by add_user
+                return
+            # A key is either valid or invalid, whichever was looked up last
+            self._users.pop(api_key, None)
+            self._invalid.pop(api_key, None)
+            entries[api_key] = value
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
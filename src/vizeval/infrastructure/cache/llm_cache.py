@@ -0,0 +1,122 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+
+class SqliteLLMCache(BaseCache):
+    """Persistent LangChain LLM response cache stored in a local SQLite file.
+
+    Entries are keyed by the LLM string, which holds the model name and its
+    parameters, and the rendered prompt, which holds the output parser's format
+    instructions. The least recently used rows are evicted once the table
+    grows past `max_entries`, and entries older than `ttl_seconds` are ignored.
+    Several processes can share one file.
+    """
+    # No __len__: LangChain treats a cache that is falsy as switched off
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl_seconds: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        # Trim often enough that small caches stay close to their bound
+        self._evict_every = max(1, min(1000, max_entries // 10))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                generations TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS llm_responses_accessed_at ON llm_responses (accessed_at)"
+        )
+
+    @staticmethod
+    def key_for(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.key_for(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT generations, stored_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] >= self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        now = time.time()
+        generations = dumps(list(return_val))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                (self.key_for(prompt, llm_string), generations, now, now),
+            )
+            self.writes += 1
+            if self.writes % self._evict_every == 0:
+                self._evict()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
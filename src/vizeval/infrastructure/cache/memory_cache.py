@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from vizeval.core.interfaces.result_cache import ResultCache
+from vizeval.core.entities import EvaluationResult
+
+
+class MemoryResultCache(ResultCache):
+    """Bounded in-memory LRU cache with optional TTL and a persistent tier.
+
+    Misses fall through to `persistent` when one is configured; results found
+    there are promoted into memory, keeping the age they had there so they
+    still expire on time. Writes go to both tiers. The async methods only wait
+    for the persistent tier.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = None,
+                 persistent: Optional[ResultCache] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self._entries: "OrderedDict[str, Tuple[EvaluationResult, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[EvaluationResult]:
+        with self._lock:
+            result = self._get_fresh(key)
+        if result is not None:
+            return result
+
+        entry = self.persistent.get_entry(key) if self.persistent else None
+        with self._lock:
+            return self._promote(key, entry)
+
+    def set(self, key: str, result: EvaluationResult) -> None:
+        with self._lock:
+            self._put(key, result)
+        if self.persistent:
+            self.persistent.set(key, result)
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[EvaluationResult]]:
+        with self._lock:
+            results = [self._get_fresh(key) for key in keys]
+        missing = [index for index, result in enumerate(results) if result is None]
+        entries = [None] * len(missing)
+        if self.persistent and missing:
+            entries = await self.persistent.aget_entries([keys[index] for index in missing])
+        with self._lock:
+            for index, entry in zip(missing, entries):
+                results[index] = self._promote(keys[index], entry)
+        return results
+
+    async def aset_many(self, items: List[Tuple[str, EvaluationResult]]) -> None:
+        with self._lock:
+            for key, result in items:
+                self._put(key, result)
+        if self.persistent:
+            await self.persistent.aset_many(items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.persistent_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.ttl_seconds is None or time.monotonic() - stored_at < self.ttl_seconds
+
+    def _get_fresh(self, key: str) -> Optional[EvaluationResult]:
+        """Return the result held in memory, counting a hit. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            result, stored_at = entry
+            if self._is_fresh(stored_at):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        return None
+
+    def _promote(self, key: str, entry: Optional[Tuple[EvaluationResult, float]]) -> Optional[EvaluationResult]:
+        """Count a memory miss and keep what the persistent tier found. Caller holds the lock."""
+        if entry is None:
+            self.misses += 1
+            return None
+        result, age = entry
+        self.persistent_hits += 1
+        self._put(key, result, age)
+        return result
+
+    def _put(self, key: str, result: EvaluationResult, age: float = 0.0) -> None:
+        self._entries[key] = (result, time.monotonic() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from vizeval.core.interfaces.result_cache import ResultCache
+from vizeval.core.entities import EvaluationResult
+
+
+class SqliteResultCache(ResultCache):
+    """Persistent result cache stored in a local SQLite file.
+
+    Entries older than `ttl_seconds` are ignored and the least recently used
+    rows are evicted once the table grows past `max_entries`.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1000000, ttl_seconds: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fast_results (
+                key TEXT PRIMARY KEY,
+                evaluator TEXT NOT NULL,
+                score REAL,
+                feedback TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS fast_results_accessed_at ON fast_results (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[EvaluationResult]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[EvaluationResult, float]]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT evaluator, score, feedback, stored_at FROM fast_results WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            evaluator, score, feedback, stored_at = row
+            if self.ttl_seconds is not None and now - stored_at >= self.ttl_seconds:
+                self._connection.execute("DELETE FROM fast_results WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute(
+                "UPDATE fast_results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return EvaluationResult(evaluator=evaluator, score=score, feedback=feedback), now - stored_at
+
+    def set(self, key: str, result: EvaluationResult) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO fast_results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, result.evaluator, result.score, result.feedback, now, now),
+            )
+            self._writes += 1
+            # Trimming on every write would turn each set into a table scan
+            if self._writes % 1000 == 0:
+                self._evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM fast_results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM fast_results WHERE key IN "
+                "(SELECT key FROM fast_results ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
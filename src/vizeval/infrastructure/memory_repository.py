@@ -1,24 +1,85 @@
-from typing import Dict, List, Optional, Any
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+import threading
 import uuid
 
 from vizeval.core.interfaces.vizeval_repository import VizevalRepository
-from vizeval.core.entities import Evaluation, User
+from vizeval.core.entities import Evaluation, EvaluationFilter, EvaluationPage, User
+
+_Position = Tuple[datetime, str]
+# Sorts after every id, so (t, _LAST_ID) follows all positions created at t
+_LAST_ID = chr(0x10FFFF)
 
 
 class MemoryRepository(VizevalRepository):
+    """In-process repository.
+
+    Evaluations are indexed per user and per (user, evaluator) by their
+    (created_at, id) position, so listing a page costs O(log n + limit)
+    instead of a scan over every stored evaluation.
+    """
+
     def __init__(self):
         self.evaluations: Dict[str, Evaluation] = {}
         self.users: Dict[str, User] = {}
         self.api_keys: Dict[str, str] = {}
+        self._by_user: Dict[str, List[_Position]] = {}
+        self._by_user_evaluator: Dict[Tuple[str, str], List[_Position]] = {}
+        self._lock = threading.Lock()
     
     def store_evaluation(self, evaluation: Evaluation) -> str:
-        evaluation_id = str(uuid.uuid4())
-        self.evaluations[evaluation_id] = evaluation
-        return evaluation_id
+        evaluation.id = evaluation.id or str(uuid.uuid4())
+        evaluation.created_at = evaluation.created_at or datetime.now(timezone.utc)
+        position = (evaluation.created_at, evaluation.id)
+        with self._lock:
+            self.evaluations[evaluation.id] = evaluation
+            _insert(self._by_user.setdefault(evaluation.user_id, []), position)
+            _insert(self._by_user_evaluator.setdefault((evaluation.user_id, evaluation.evaluator), []),
+                    position)
+        return evaluation.id
     
     def list_evaluations(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Evaluation]:
-        user_evaluations = [eval for eval in self.evaluations.values() if eval.user_id == user_id]
-        return user_evaluations[offset:offset + limit]
+        positions = self._by_user.get(user_id, [])
+        return [self.evaluations[evaluation_id] for _, evaluation_id in positions[offset:offset + limit]]
+
+    def list_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                              evaluator: Optional[str] = None,
+                              filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        if evaluator is None:
+            positions = self._by_user.get(user_id, [])
+        else:
+            positions = self._by_user_evaluator.get((user_id, evaluator), [])
+
+        start, end = 0, len(positions)
+        if cursor is not None:
+            start = bisect_right(positions, self.decode_cursor(cursor))
+        if filters is not None:
+            # Time bounds narrow the index range, score bounds are checked per evaluation
+            if filters.created_after is not None:
+                start = max(start, bisect_right(positions, (filters.created_after, _LAST_ID)))
+            if filters.created_before is not None:
+                end = bisect_left(positions, (filters.created_before, ""), start)
+
+        if filters is None or filters.min_score is None and filters.max_score is None:
+            page = [self.evaluations[evaluation_id]
+                    for _, evaluation_id in positions[start:min(end, start + limit)]]
+            more = start + limit < end
+        else:
+            page = []
+            more = False
+            for index in range(start, end):
+                evaluation = self.evaluations[positions[index][1]]
+                if filters.matches(evaluation):
+                    if len(page) == limit:
+                        more = True
+                        break
+                    page.append(evaluation)
+
+        next_cursor = None
+        if page and more:
+            next_cursor = self.encode_cursor(page[-1])
+        return EvaluationPage(evaluations=page, next_cursor=next_cursor)
     
     def get_user_from_api_key(self, api_key: str) -> Optional[User]:
         user_id = self.api_keys.get(api_key)
@@ -35,3 +96,34 @@ class MemoryRepository(VizevalRepository):
         self.api_keys[api_key] = user_id
         
         return api_key
+
+    # Every call only touches memory, so the async versions run inline
+    # instead of waiting for a thread
+
+    async def astore_evaluation(self, evaluation: Evaluation) -> str:
+        return self.store_evaluation(evaluation)
+
+    async def alist_evaluations(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Evaluation]:
+        return self.list_evaluations(user_id, limit, offset)
+
+    async def alist_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                                     evaluator: Optional[str] = None,
+                                     filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        return self.list_evaluations_page(user_id, limit, cursor, evaluator, filters)
+
+    async def aget_user_from_api_key(self, api_key: str) -> Optional[User]:
+        return self.get_user_from_api_key(api_key)
+
+    async def aadd_user(self, user: User) -> str:
+        return self.add_user(user)
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+def _insert(positions: List[_Position], position: _Position) -> None:
+    # Positions almost always arrive in order, so appending is the common case
+    if not positions or positions[-1] <= position:
+        positions.append(position)
+    else:
+        insort(positions, position)
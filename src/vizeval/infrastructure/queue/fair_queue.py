@@ -0,0 +1,155 @@
+import heapq
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from vizeval.core.entities.evaluation_job import EvaluationJob
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+
+DEFAULT_PRIORITIES = ("interactive", "bulk")
+
+
+def parse_tenant_map(spec: str, value_type: Callable[[str], Any] = str) -> Dict[str, Any]:
+    """Parse per-tenant settings written as "user-a=4,user-b=0.5"."""
+    values = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        user_id, _, value = item.partition("=")
+        if not value:
+            raise ValueError(f"Invalid tenant setting '{item}', expected user_id=value")
+        values[user_id.strip()] = value_type(value.strip())
+    return values
+
+
+class FairQueue(MemoryQueue):
+    """In-process queue with priority classes and weighted fair queuing across tenants.
+
+    Each job belongs to a priority class, taken from `job.priority`, then from
+    `request.metadata["priority"]`, then from `tenant_priorities`, and finally
+    `default_priority`. Classes are served in the order of `priorities`: a
+    "bulk" job only runs when no "interactive" job is waiting.
+
+    Within a class, jobs are ordered by self-clocked weighted fair queuing over
+    `request.user_id`. Every job gets a virtual finish tag of
+    max(class virtual time, the tenant's previous tag) + 1 / weight, and the
+    smallest tag is served first. A tenant with 50k queued jobs therefore
+    takes turns with a tenant that just enqueued one, instead of running ahead
+    of it, and a tenant with weight 2 gets twice as many turns.
+    """
+
+    def __init__(self,
+                 priorities: Sequence[str] = DEFAULT_PRIORITIES,
+                 default_priority: Optional[str] = None,
+                 tenant_weights: Optional[Dict[str, float]] = None,
+                 tenant_priorities: Optional[Dict[str, str]] = None,
+                 wait_samples: int = 1000,
+                 **kwargs):
+        """
+        Args:
+            priorities: Priority classes, highest first
+            default_priority: Class of jobs that do not name one, defaults to the
+                lowest class
+            tenant_weights: Scheduling weight per user_id, 1 when missing
+            tenant_priorities: Default class per user_id, e.g. by API-key tier
+            wait_samples: Number of recent wait times kept per tenant for the
+                percentiles in `stats`
+            **kwargs: Capacity limits, see MemoryQueue
+        """
+        super().__init__(**kwargs)
+        if not priorities:
+            raise ValueError("At least one priority class is required")
+        self.priorities = list(priorities)
+        self.default_priority = default_priority or self.priorities[-1]
+        if self.default_priority not in self.priorities:
+            raise ValueError(f"Unknown default priority '{self.default_priority}'")
+        self.tenant_weights = dict(tenant_weights or {})
+        self.tenant_priorities = dict(tenant_priorities or {})
+        if any(weight <= 0 for weight in self.tenant_weights.values()):
+            raise ValueError("Tenant weights must be positive")
+
+        self._heaps: Dict[str, List[Tuple[float, int, EvaluationJob]]] = {
+            priority: [] for priority in self.priorities
+        }
+        self._virtual_time: Dict[str, float] = {priority: 0.0 for priority in self.priorities}
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._class_depth: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._sequence = 0
+        self._size = 0
+
+        self._dequeued: Dict[str, int] = defaultdict(int)
+        self._waits: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=wait_samples))
+        self._max_wait: Dict[str, float] = defaultdict(float)
+
+    def priority_of(self, job: EvaluationJob) -> str:
+        metadata = job.request.metadata or {}
+        for priority in (job.priority, metadata.get("priority"),
+                         self.tenant_priorities.get(job.request.user_id)):
+            if priority in self._heaps:
+                return priority
+        return self.default_priority
+
+    def size(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = super().stats()
+            stats["priorities"] = {priority: len(heap) for priority, heap in self._heaps.items()}
+            stats["tenants"] = {
+                user_id: self._tenant_stats(user_id)
+                for user_id in set(self._tenant_depth) | set(self._dequeued)
+            }
+            return stats
+
+    def _tenant_stats(self, user_id: str) -> Dict[str, Any]:
+        waits = sorted(self._waits.get(user_id, ()))
+        return {
+            "depth": self._tenant_depth.get(user_id, 0),
+            "dequeued": self._dequeued.get(user_id, 0),
+            "weight": self.tenant_weights.get(user_id, 1.0),
+            "wait_mean": sum(waits) / len(waits) if waits else 0.0,
+            "wait_p50": waits[(len(waits) - 1) // 2] if waits else 0.0,
+            "wait_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "wait_max": self._max_wait.get(user_id, 0.0),
+        }
+
+    def _put(self, job: EvaluationJob) -> None:
+        priority = self.priority_of(job)
+        tenant = (priority, job.request.user_id)
+        weight = self.tenant_weights.get(job.request.user_id, 1.0)
+        start = max(self._virtual_time[priority], self._last_finish.get(tenant, 0.0))
+        finish = start + 1.0 / weight
+
+        self._last_finish[tenant] = finish
+        self._class_depth[tenant] += 1
+        self._sequence += 1
+        self._size += 1
+        heapq.heappush(self._heaps[priority], (finish, self._sequence, job))
+
+    def _take(self, max_items: int) -> List[EvaluationJob]:
+        jobs = []
+        now = time.time()
+        for priority in self.priorities:
+            heap = self._heaps[priority]
+            while heap and len(jobs) < max_items:
+                finish, _, job = heapq.heappop(heap)
+                self._virtual_time[priority] = finish
+                self._release(priority, job.request.user_id)
+                self._record_wait(job, now)
+                jobs.append(job)
+        self._size -= len(jobs)
+        return jobs
+
+    def _release(self, priority: str, user_id: str) -> None:
+        tenant = (priority, user_id)
+        self._class_depth[tenant] -= 1
+        if not self._class_depth[tenant]:
+            del self._class_depth[tenant]
+            # An idle tenant restarts from the virtual time, so its tag is no longer needed
+            self._last_finish.pop(tenant, None)
+
+    def _record_wait(self, job: EvaluationJob, now: float) -> None:
+        user_id = job.request.user_id
+        wait = max(0.0, now - job.enqueued_at)
+        self._dequeued[user_id] += 1
+        self._waits[user_id].append(wait)
+        self._max_wait[user_id] = max(self._max_wait[user_id], wait)
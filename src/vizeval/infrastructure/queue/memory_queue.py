@@ -1,21 +1,239 @@
-from collections import deque
-from typing import Optional
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-from vizeval.core.interfaces.evaluation_queue import EvaluationQueue
-from vizeval.core.entities.evaluation_request import EvaluationRequest
+from vizeval.core.interfaces.evaluation_queue import EvaluationQueue, QueueFullError
+from vizeval.core.entities.evaluation_job import EvaluationJob
 
 
 class MemoryQueue(EvaluationQueue):
-    def __init__(self):
-        self.queue = deque()
-        
-    def enqueue(self, evaluation_request: EvaluationRequest) -> None:
-        self.queue.append(evaluation_request)
-        
-    def dequeue(self) -> Optional[EvaluationRequest]:
-        if self.is_empty():
-            return None
-        return self.queue.popleft()
-        
+    """In-process FIFO queue.
+
+    Consumers block on a condition variable (or an asyncio future for
+    `adequeue`) and are woken as soon as a job is enqueued, so idle workers
+    use no CPU and pick up new jobs without polling delay.
+
+    The queue is unbounded by default. With `max_size` and/or `max_per_tenant`
+    set, `enqueue` raises QueueFullError once the limit is reached, carrying
+    `retry_after` as a hint for clients.
+
+    Nacked jobs are put back after their `retry_after` delay, without counting
+    against those limits since they were already admitted. After
+    `max_deliveries` failed attempts a job is dropped.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_per_tenant: Optional[int] = None,
+                 retry_after: float = 5.0, max_deliveries: int = 5):
+        self.queue: Deque[EvaluationJob] = deque()
+        self.max_size = max_size
+        self.max_per_tenant = max_per_tenant
+        self.retry_after = retry_after
+        self.max_deliveries = max_deliveries
+        self.rejected = 0
+        self.dropped = 0
+        self._failures: Dict[str, int] = {}
+        self._delayed = 0
+        self._tenant_depth: Dict[str, int] = defaultdict(int)
+        self._condition = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def enqueue(self, job: EvaluationJob) -> None:
+        with self._condition:
+            error = self._capacity_error(job.request.user_id)
+            if error is not None:
+                self.rejected += 1
+                raise error
+            self._put(job)
+            self._tenant_depth[job.request.user_id] += 1
+            self._condition.notify()
+            self._wake_async_waiter()
+
+    def enqueue_many(self, jobs: List[EvaluationJob]) -> None:
+        """Add all jobs, or none of them if they do not all fit."""
+        with self._condition:
+            error = self._capacity_error(None, len(jobs))
+            per_tenant: Dict[str, int] = defaultdict(int)
+            for job in jobs:
+                per_tenant[job.request.user_id] += 1
+            for user_id, count in per_tenant.items():
+                error = error or self._capacity_error(user_id, count)
+            if error is not None:
+                self.rejected += len(jobs)
+                raise error
+
+            for job in jobs:
+                self._put(job)
+                self._tenant_depth[job.request.user_id] += 1
+            self._condition.notify(len(jobs))
+            for _ in range(len(jobs)):
+                self._wake_async_waiter()
+
+    def dequeue(self, timeout: Optional[float] = 0) -> Optional[EvaluationJob]:
+        with self._condition:
+            if not self._wait_for_jobs(timeout):
+                return None
+            return self._take_jobs(1)[0]
+
+    def dequeue_many(self, max_items: int, timeout: Optional[float] = 0) -> List[EvaluationJob]:
+        with self._condition:
+            if not self._wait_for_jobs(timeout):
+                return []
+            return self._take_jobs(max_items)
+
+    async def adequeue(self, timeout: Optional[float] = None) -> Optional[EvaluationJob]:
+        jobs = await self.adequeue_many(1, timeout)
+        return jobs[0] if jobs else None
+
+    async def adequeue_many(self, max_items: int, timeout: Optional[float] = None) -> List[EvaluationJob]:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            with self._condition:
+                if self.size():
+                    return self._take_jobs(max_items)
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return []
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except BaseException as e:
+                with self._condition:
+                    self._discard_async_waiter(loop, waiter)
+                if isinstance(e, asyncio.TimeoutError):
+                    return []
+                raise
+
+    def ack(self, job: EvaluationJob) -> None:
+        with self._condition:
+            self._failures.pop(job.id, None)
+
+    def nack(self, job: EvaluationJob, retry_after: float = 0.0) -> None:
+        with self._condition:
+            failures = self._failures.get(job.id, 0) + 1
+            if failures >= self.max_deliveries:
+                self._failures.pop(job.id, None)
+                self.dropped += 1
+                print(f"Dropping evaluation job {job.id} after {failures} failed attempts")
+                return
+            self._failures[job.id] = failures
+            self._delayed += 1
+        if retry_after > 0:
+            timer = threading.Timer(retry_after, self._requeue, (job,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._requeue(job)
+
+    def check_capacity(self, user_id: Optional[str] = None, count: int = 1) -> None:
+        with self._condition:
+            error = self._capacity_error(user_id, count)
+        if error is not None:
+            raise error
+
+    # Enqueueing only takes the lock for a moment, so the async versions run inline
+
+    async def aenqueue(self, job: EvaluationJob) -> None:
+        self.enqueue(job)
+
+    async def aenqueue_many(self, jobs: List[EvaluationJob]) -> None:
+        self.enqueue_many(jobs)
+
+    async def acheck_capacity(self, user_id: Optional[str] = None, count: int = 1) -> None:
+        self.check_capacity(user_id, count)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "size": self.size(),
+                "max_size": self.max_size,
+                "max_per_tenant": self.max_per_tenant,
+                "rejected": self.rejected,
+                "retrying": self._delayed,
+                "dropped": self.dropped,
+            }
+
     def is_empty(self) -> bool:
-        return len(self.queue) == 0
+        """Whether there are no jobs, counting nacked jobs waiting to be put back."""
+        return self.size() == 0 and not self._delayed
+
+    def size(self) -> int:
+        return len(self.queue)
+
+    def _requeue(self, job: EvaluationJob) -> None:
+        with self._condition:
+            self._delayed -= 1
+            self._put(job)
+            self._tenant_depth[job.request.user_id] += 1
+            self._condition.notify()
+            self._wake_async_waiter()
+
+    def _put(self, job: EvaluationJob) -> None:
+        """Store a job. Caller holds the lock."""
+        self.queue.append(job)
+
+    def _take(self, max_items: int) -> List[EvaluationJob]:
+        """Remove up to `max_items` jobs in dequeue order. Caller holds the lock."""
+        return [self.queue.popleft() for _ in range(min(max_items, len(self.queue)))]
+
+    def _take_jobs(self, max_items: int) -> List[EvaluationJob]:
+        jobs = self._take(max_items)
+        for job in jobs:
+            user_id = job.request.user_id
+            self._tenant_depth[user_id] -= 1
+            if not self._tenant_depth[user_id]:
+                del self._tenant_depth[user_id]
+        return jobs
+
+    def _capacity_error(self, user_id: Optional[str], count: int = 1) -> Optional[QueueFullError]:
+        """Return the error to raise if `count` jobs for `user_id` do not fit. Caller holds the lock."""
+        if self.max_size is not None and self.size() + count > self.max_size:
+            return QueueFullError(f"Evaluation queue is full ({self.max_size} jobs)",
+                                  retry_after=self.retry_after)
+        if (self.max_per_tenant is not None and user_id is not None
+                and self._tenant_depth.get(user_id, 0) + count > self.max_per_tenant):
+            return QueueFullError(f"Too many queued evaluations for user {user_id} "
+                                  f"({self.max_per_tenant} jobs)", retry_after=self.retry_after)
+        return None
+
+    def _wait_for_jobs(self, timeout: Optional[float]) -> bool:
+        """Wait on the condition until a job is available. Caller holds the lock."""
+        if timeout is None:
+            while not self.size():
+                self._condition.wait()
+            return True
+
+        deadline = time.monotonic() + timeout
+        while not self.size():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._condition.wait(remaining)
+        return True
+
+    def _discard_async_waiter(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future) -> None:
+        """Withdraw a waiter that gave up. Caller holds the lock."""
+        if (loop, waiter) in self._async_waiters:
+            self._async_waiters.remove((loop, waiter))
+        elif self.size():
+            # It was already woken for a job it will not take; pass the wakeup on
+            self._wake_async_waiter()
+
+    def _wake_async_waiter(self) -> None:
+        """Wake one pending `adequeue` call. Caller holds the lock."""
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(_resolve, waiter)
+            return
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,294 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from vizeval.core.interfaces.evaluation_queue import EvaluationQueue, QueueFullError
+from vizeval.core.entities import EvaluationJob, EvaluationRequest, EvaluationResult
+
+
+def serialize_job(job: EvaluationJob) -> str:
+    return json.dumps(asdict(job))
+
+
+def deserialize_job(payload: str) -> EvaluationJob:
+    data = json.loads(payload)
+    data["request"] = EvaluationRequest(**data["request"])
+    if data.get("fast_result") is not None:
+        data["fast_result"] = EvaluationResult(**data["fast_result"])
+    return EvaluationJob(**data)
+
+
+class SqliteQueue(EvaluationQueue):
+    """Durable evaluation queue stored in a SQLite database in WAL mode.
+
+    Dequeued jobs stay in the database, invisible to other consumers, until
+    they are acknowledged. Jobs that are not acknowledged within
+    `visibility_timeout` seconds (the worker crashed or the process was
+    restarted) are delivered again. After `max_deliveries` attempts a job
+    is moved to the `dead_jobs` table instead.
+
+    With the default synchronous=NORMAL, commits are appended to the WAL
+    without an fsync, and fsyncs are batched at checkpoints. A process crash
+    loses nothing, and a power loss can only lose the last few commits. Use
+    "FULL" to fsync every commit.
+    """
+
+    def __init__(self,
+                 path: str,
+                 visibility_timeout: float = 300.0,
+                 max_deliveries: int = 5,
+                 max_size: Optional[int] = None,
+                 max_per_tenant: Optional[int] = None,
+                 retry_after: float = 5.0,
+                 synchronous: str = "NORMAL",
+                 compact_every: int = 1000,
+                 poll_interval: float = 0.5):
+        """
+        Args:
+            path: SQLite database file
+            visibility_timeout: Seconds a dequeued job stays hidden before it is
+                redelivered unless acknowledged
+            max_deliveries: Deliveries after which a job is dead-lettered
+            max_size: Maximum number of unacknowledged jobs, unbounded if None
+            max_per_tenant: Maximum number of unacknowledged jobs per user
+            retry_after: Hint carried by QueueFullError
+            synchronous: SQLite synchronous pragma, "NORMAL" or "FULL"
+            compact_every: Acknowledgements between two compactions
+            poll_interval: How often blocked consumers re-check the database for
+                jobs enqueued by other processes or whose visibility expired
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_deliveries = max_deliveries
+        self.max_size = max_size
+        self.max_per_tenant = max_per_tenant
+        self.retry_after = retry_after
+        self.compact_every = compact_every
+        self.poll_interval = poll_interval
+        self.rejected = 0
+        self._acks_since_compaction = 0
+        self._condition = threading.Condition()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                                           timeout=30.0)
+        # auto_vacuum only takes effect on a new database, before the first table
+        self._connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                user_id TEXT,
+                payload TEXT NOT NULL,
+                visible_at REAL NOT NULL DEFAULT 0,
+                deliveries INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS jobs_visible_at ON jobs (visible_at, seq);
+            CREATE INDEX IF NOT EXISTS jobs_user_id ON jobs (user_id);
+            CREATE TABLE IF NOT EXISTS dead_jobs (
+                id TEXT PRIMARY KEY,
+                user_id TEXT,
+                payload TEXT NOT NULL,
+                deliveries INTEGER NOT NULL,
+                failed_at REAL NOT NULL
+            );
+            """
+        )
+
+    def enqueue(self, job: EvaluationJob) -> None:
+        self.enqueue_many([job])
+
+    def enqueue_many(self, jobs: List[EvaluationJob]) -> None:
+        if not jobs:
+            return
+
+        rows = [(job.id, job.request.user_id, serialize_job(job)) for job in jobs]
+        with self._condition:
+            with self._transaction():
+                self._check_room(jobs)
+                self._connection.executemany(
+                    "INSERT INTO jobs (id, user_id, payload) VALUES (?, ?, ?)", rows
+                )
+            self._condition.notify_all()
+
+    def check_capacity(self, user_id: Optional[str] = None, count: int = 1) -> None:
+        with self._condition:
+            error = self._capacity_error(user_id, count)
+        if error is not None:
+            raise error
+
+    def dequeue(self, timeout: Optional[float] = 0) -> Optional[EvaluationJob]:
+        jobs = self.dequeue_many(1, timeout)
+        return jobs[0] if jobs else None
+
+    def dequeue_many(self, max_items: int, timeout: Optional[float] = 0) -> List[EvaluationJob]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                jobs = self._claim(max_items)
+                if jobs:
+                    return jobs
+
+                wait = self.poll_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    wait = min(wait, remaining)
+                self._condition.wait(wait)
+
+    def ack(self, job: EvaluationJob) -> None:
+        with self._condition:
+            self._connection.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+            self._acks_since_compaction += 1
+            if self._acks_since_compaction >= self.compact_every:
+                self.compact()
+
+    def nack(self, job: EvaluationJob, retry_after: float = 0.0) -> None:
+        with self._condition:
+            self._connection.execute("UPDATE jobs SET visible_at = ? WHERE id = ?",
+                                     (time.time() + retry_after if retry_after > 0 else 0, job.id))
+            self._condition.notify()
+
+    def extend_lease(self, jobs: List[EvaluationJob]) -> None:
+        now = time.time()
+        with self._condition, self._transaction():
+            # Only jobs still leased: a job given back in the meantime must stay visible
+            self._connection.executemany(
+                "UPDATE jobs SET visible_at = ? WHERE id = ? AND visible_at > ?",
+                [(now + self.visibility_timeout, job.id, now) for job in jobs],
+            )
+
+    def compact(self) -> None:
+        """Fold the WAL back into the database and return freed pages to the OS."""
+        with self._condition:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._connection.execute("PRAGMA incremental_vacuum")
+            self._acks_since_compaction = 0
+
+    def is_empty(self) -> bool:
+        return self.size() == 0
+
+    def size(self) -> int:
+        """Number of jobs not yet acknowledged, including jobs being processed."""
+        with self._condition:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._condition:
+            (in_flight,) = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE visible_at > ?", (now,)
+            ).fetchone()
+            (dead,) = self._connection.execute("SELECT COUNT(*) FROM dead_jobs").fetchone()
+            size = self.size()
+        return {
+            "size": size,
+            "pending": size - in_flight,
+            "in_flight": in_flight,
+            "dead": dead,
+            "max_size": self.max_size,
+            "max_per_tenant": self.max_per_tenant,
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        with self._condition:
+            self._connection.close()
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._connection)
+
+    def _claim(self, max_items: int) -> List[EvaluationJob]:
+        """Make up to `max_items` visible jobs invisible and return them. Caller holds the lock."""
+        now = time.time()
+        with self._transaction():
+            while True:
+                rows = self._connection.execute(
+                    "SELECT seq, id, user_id, payload, deliveries FROM jobs "
+                    "WHERE visible_at <= ? ORDER BY seq LIMIT ?",
+                    (now, max_items),
+                ).fetchall()
+
+                claimed, dead = [], []
+                for seq, job_id, user_id, payload, deliveries in rows:
+                    if deliveries >= self.max_deliveries:
+                        dead.append((seq, job_id, user_id, payload, deliveries))
+                    else:
+                        claimed.append((seq, payload))
+
+                if dead:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO dead_jobs VALUES (?, ?, ?, ?, ?)",
+                        [(job_id, user_id, payload, deliveries, now)
+                         for _, job_id, user_id, payload, deliveries in dead],
+                    )
+                    self._connection.executemany(
+                        "DELETE FROM jobs WHERE seq = ?", [(seq,) for seq, *_ in dead]
+                    )
+                # Live jobs may be waiting behind rows that were all dead-lettered
+                if claimed or not dead:
+                    break
+            if claimed:
+                self._connection.executemany(
+                    "UPDATE jobs SET visible_at = ?, deliveries = deliveries + 1 WHERE seq = ?",
+                    [(now + self.visibility_timeout, seq) for seq, _ in claimed],
+                )
+
+        return [deserialize_job(payload) for _, payload in claimed]
+
+    def _check_room(self, jobs: List[EvaluationJob]) -> None:
+        """Raise QueueFullError unless all jobs fit. Caller holds the lock."""
+        error = self._capacity_error(None, len(jobs))
+        if error is None and self.max_per_tenant is not None:
+            new_per_tenant: Dict[str, int] = {}
+            for job in jobs:
+                new_per_tenant[job.request.user_id] = new_per_tenant.get(job.request.user_id, 0) + 1
+            for user_id, count in new_per_tenant.items():
+                error = self._capacity_error(user_id, count)
+                if error is not None:
+                    break
+        if error is not None:
+            self.rejected += len(jobs)
+            raise error
+
+    def _capacity_error(self, user_id: Optional[str], count: int) -> Optional[QueueFullError]:
+        if self.max_size is not None:
+            (size,) = self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+            if size + count > self.max_size:
+                return QueueFullError(f"Evaluation queue is full ({self.max_size} jobs)",
+                                      retry_after=self.retry_after)
+        if self.max_per_tenant is not None and user_id is not None:
+            (depth,) = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if depth + count > self.max_per_tenant:
+                return QueueFullError(f"Too many queued evaluations for user {user_id} "
+                                      f"({self.max_per_tenant} jobs)", retry_after=self.retry_after)
+        return None
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent processes serialize their writes."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.types import ReturnMethod
+
+from vizeval.core.entities import Evaluation, EvaluationFilter, EvaluationPage, User
+from vizeval.core.executor import run_io
+from vizeval.infrastructure.supabase.supabase_store import SupabaseStore
+
+
+class AsyncSupabaseStore(SupabaseStore):
+    """SupabaseStore whose async methods do not block the event loop.
+
+    The `a*` methods talk to PostgREST through one pooled `httpx.AsyncClient`
+    that keeps up to `pool_size` connections alive, so concurrent requests
+    share connections instead of each paying for a new one. The sync methods
+    of SupabaseStore remain for callers outside the event loop, such as the
+    detailed evaluation workers.
+
+    The async client binds its connections to the event loop that first uses
+    it, so use the async methods from a single event loop.
+    """
+
+    def __init__(self, supabase_url: str, supabase_key: str, pool_size: int = 20,
+                 timeout: float = 10.0, **kwargs):
+        """
+        Args:
+            supabase_url: Supabase project URL
+            supabase_key: Supabase API key
+            pool_size: Maximum concurrent connections to Supabase, all kept alive
+            timeout: Seconds before a request to Supabase fails
+            **kwargs: Write buffer settings passed to SupabaseStore
+        """
+        super().__init__(supabase_url, supabase_key, **kwargs)
+        rest_url = f"{supabase_url.rstrip('/')}/rest/v1"
+        self.http_client = httpx.AsyncClient(
+            base_url=rest_url,
+            headers={"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(timeout),
+        )
+        self.async_client = AsyncPostgrestClient(rest_url, http_client=self.http_client)
+
+    async def astore_evaluation(self, evaluation: Evaluation) -> str:
+        if self.write_buffer is not None:
+            # Buffering is quick, but blocks while the buffer is full
+            return await run_io(self.store_evaluation, evaluation)
+
+        await self.async_client.table("evaluations").upsert(
+            self._to_row(evaluation), ignore_duplicates=True, returning=ReturnMethod.minimal,
+        ).execute()
+        return evaluation.id
+
+    async def alist_evaluations(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Evaluation]:
+        query = self.async_client.table("evaluations").select("*").eq("user_id", user_id)
+        response = await query.range(offset, offset + limit - 1).execute()
+        return [self._to_evaluation(evaluation_data) for evaluation_data in response.data or []]
+
+    async def alist_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                                     evaluator: Optional[str] = None,
+                                     filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        query = self._page_query(self.async_client.table("evaluations"), user_id, limit, cursor, evaluator,
+                                 filters)
+        return self._to_page((await query.execute()).data, limit)
+
+    async def aget_user_from_api_key(self, api_key: str) -> Optional[User]:
+        response = await self.async_client.table("users").select("*").eq("api_key", api_key).execute()
+        if not response.data:
+            return None
+        return self._to_user(response.data[0])
+
+    async def aadd_user(self, user: User) -> str:
+        await self.async_client.table("users").insert(self._user_row(user)).execute()
+        return user.api_key
+
+    async def aclose(self) -> None:
+        await run_io(self.close)
+        await self.http_client.aclose()
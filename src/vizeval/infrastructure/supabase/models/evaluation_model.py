@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
@@ -12,3 +13,4 @@ class EvaluationModel(BaseModel):
     score: Optional[float] = None
     feedback: Optional[str] = None
     metadata: Dict[str, Any] = {}
+    created_at: Optional[datetime] = None
@@ -1,22 +1,68 @@
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
 
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 
 from vizeval.core.interfaces import VizevalRepository
-from vizeval.core.entities import Evaluation, User
+from vizeval.core.entities import Evaluation, EvaluationFilter, EvaluationPage, User
 from vizeval.infrastructure.supabase.models.evaluation_model import EvaluationModel
+from vizeval.infrastructure.supabase.models.user_model import UserModel
+from vizeval.infrastructure.supabase.write_buffer import WriteBuffer
 
 
 class SupabaseStore(VizevalRepository):
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, write_batch_size: int = 100,
+                 flush_interval: float = 1.0, max_buffered_writes: int = 10000):
+        """
+        Args:
+            supabase_url: Supabase project URL
+            supabase_key: Supabase API key
+            write_batch_size: Evaluations written per insert. Above 1, writes go
+                through a write-behind buffer and `store_evaluation` returns before
+                the row is written. Use 1 to insert synchronously.
+            flush_interval: Maximum seconds an evaluation waits in the buffer
+            max_buffered_writes: Maximum evaluations held in the buffer
+        """
         self.client: Client = create_client(supabase_url, supabase_key)
+        self.write_buffer: Optional[WriteBuffer] = None
+        if write_batch_size > 1:
+            self.write_buffer = WriteBuffer(
+                self._insert_evaluations,
+                max_batch_size=write_batch_size,
+                flush_interval=flush_interval,
+                max_buffered=max(max_buffered_writes, write_batch_size),
+                name="supabase-write-buffer",
+            )
     
     def store_evaluation(self, evaluation: Evaluation) -> str:
-        evaluation_id = str(uuid4())
+        evaluation_data = self._to_row(evaluation)
+        
+        if self.write_buffer is not None:
+            self.write_buffer.add(evaluation_data)
+        else:
+            self._insert_evaluations([evaluation_data])
         
-        evaluation_data = {
-            "id": evaluation_id,
+        return evaluation.id
+
+    def close(self) -> None:
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+
+    def _insert_evaluations(self, rows: List[Dict[str, Any]]) -> None:
+        # A retried batch may already be stored if only the response was lost
+        self.client.table("evaluations").upsert(rows, ignore_duplicates=True,
+                                                returning=ReturnMethod.minimal).execute()
+
+    @staticmethod
+    def _to_row(evaluation: Evaluation) -> Dict[str, Any]:
+        """Assign the id and creation time of a new evaluation and return its table row."""
+        evaluation.id = evaluation.id or str(uuid4())
+        evaluation.created_at = evaluation.created_at or datetime.now(timezone.utc)
+        return {
+            "id": evaluation.id,
+            "created_at": evaluation.created_at.isoformat(),
             "system_prompt": evaluation.system_prompt,
             "user_prompt": evaluation.user_prompt,
             "response": evaluation.response,
@@ -26,10 +72,6 @@ class SupabaseStore(VizevalRepository):
             "feedback": evaluation.feedback,
             "metadata": evaluation.metadata
         }
-        
-        self.client.table("evaluations").insert(evaluation_data).execute()
-        
-        return evaluation_id
     
     def get_evaluation(self, evaluation_id: str) -> Optional[Evaluation]:
         response = self.client.table("evaluations").select("*").eq("id", evaluation_id).execute()
@@ -37,19 +79,7 @@ class SupabaseStore(VizevalRepository):
         if not response.data:
             return None
         
-        evaluation_data = response.data[0]
-        evaluation_model = EvaluationModel(**evaluation_data)
-        
-        return Evaluation(
-            system_prompt=evaluation_model.system_prompt,
-            user_prompt=evaluation_model.user_prompt,
-            response=evaluation_model.response,
-            user_id=evaluation_model.user_id,
-            evaluator=evaluation_model.evaluator,
-            score=evaluation_model.score,
-            feedback=evaluation_model.feedback,
-            metadata=evaluation_model.metadata
-        )
+        return self._to_evaluation(response.data[0])
     
     def list_evaluations(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Evaluation]:
         response = self.client.table("evaluations").select("*").eq("user_id", user_id).range(offset, offset + limit - 1).execute()
@@ -59,36 +89,90 @@ class SupabaseStore(VizevalRepository):
         
         evaluations = []
         for evaluation_data in response.data:
-            evaluation_model = EvaluationModel(**evaluation_data)
-            evaluation = Evaluation(
-                system_prompt=evaluation_model.system_prompt,
-                user_prompt=evaluation_model.user_prompt,
-                response=evaluation_model.response,
-                user_id=evaluation_model.user_id,
-                evaluator=evaluation_model.evaluator,
-                score=evaluation_model.score,
-                feedback=evaluation_model.feedback,
-                metadata=evaluation_model.metadata
-            )
-            evaluations.append(evaluation)
+            evaluations.append(self._to_evaluation(evaluation_data))
         
         return evaluations
+
+    def list_evaluations_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                              evaluator: Optional[str] = None,
+                              filters: Optional[EvaluationFilter] = None) -> EvaluationPage:
+        query = self._page_query(self.client.table("evaluations"), user_id, limit, cursor, evaluator,
+                                 filters)
+        return self._to_page(query.execute().data, limit)
+
+    @classmethod
+    def _page_query(cls, table, user_id: str, limit: int, cursor: Optional[str],
+                    evaluator: Optional[str], filters: Optional[EvaluationFilter] = None):
+        """Build the keyset query for a page on a sync or async postgrest table."""
+        # Served by an index on evaluations (user_id, created_at, id), or
+        # (user_id, evaluator, created_at, id) when filtering by evaluator
+        query = table.select("*").eq("user_id", user_id)
+        if evaluator is not None:
+            query = query.eq("evaluator", evaluator)
+        if filters is not None:
+            if filters.min_score is not None:
+                query = query.gte("score", filters.min_score)
+            if filters.max_score is not None:
+                query = query.lte("score", filters.max_score)
+            if filters.created_after is not None:
+                query = query.gt("created_at", filters.created_after.isoformat())
+            if filters.created_before is not None:
+                query = query.lt("created_at", filters.created_before.isoformat())
+        if cursor is not None:
+            created_at, evaluation_id = cls.decode_cursor(cursor)
+            created_at = created_at.isoformat()
+            query = query.or_(f'created_at.gt."{created_at}",'
+                              f'and(created_at.eq."{created_at}",id.gt."{evaluation_id}")')
+        # One extra row tells whether another page follows
+        return query.order("created_at").order("id").limit(limit + 1)
+
+    @classmethod
+    def _to_page(cls, rows: Optional[List[Dict[str, Any]]], limit: int) -> EvaluationPage:
+        evaluations = [cls._to_evaluation(evaluation_data) for evaluation_data in rows or []]
+        next_cursor = None
+        if len(evaluations) > limit:
+            evaluations = evaluations[:limit]
+            next_cursor = cls.encode_cursor(evaluations[-1])
+        return EvaluationPage(evaluations=evaluations, next_cursor=next_cursor)
+
+    @staticmethod
+    def _to_evaluation(evaluation_data: Dict[str, Any]) -> Evaluation:
+        evaluation_model = EvaluationModel(**evaluation_data)
+        return Evaluation(
+            system_prompt=evaluation_model.system_prompt,
+            user_prompt=evaluation_model.user_prompt,
+            response=evaluation_model.response,
+            user_id=evaluation_model.user_id,
+            evaluator=evaluation_model.evaluator,
+            score=evaluation_model.score,
+            feedback=evaluation_model.feedback,
+            metadata=evaluation_model.metadata,
+            id=evaluation_model.id,
+            created_at=evaluation_model.created_at,
+        )
     
-    def get_user_from_api_key(self, api_key: str) -> Optional[str]:
-        response = self.client.table("users").select("id").eq("api_key", api_key).execute()
+    def get_user_from_api_key(self, api_key: str) -> Optional[User]:
+        response = self.client.table("users").select("*").eq("api_key", api_key).execute()
         
         if not response.data:
             return None
         
-        return response.data[0]["id"]
+        return self._to_user(response.data[0])
+
+    @staticmethod
+    def _to_user(user_data: Dict[str, Any]) -> User:
+        user_model = UserModel(**user_data)
+        return User(name=user_model.name, api_key=user_model.api_key, id=user_model.id)
     
     def add_user(self, user: User) -> str:
-        user_data = {
+        self.client.table("users").insert(self._user_row(user)).execute()
+        
+        return user.api_key
+
+    @staticmethod
+    def _user_row(user: User) -> Dict[str, Any]:
+        return {
             "id": user.id,
             "name": user.name,
             "api_key": user.api_key
         }
-        
-        self.client.table("users").insert(user_data).execute()
-        
-        return user.api_key
@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+Row = Dict[str, Any]
+
+
+class WriteBufferFullError(Exception):
+    """Raised when rows cannot be buffered because the buffer stayed full."""
+
+
+class WriteBuffer:
+    """Write-behind buffer that turns single-row writes into multi-row inserts.
+
+    `add` returns as soon as the row is buffered. A background thread flushes
+    up to `max_batch_size` rows at a time with `insert_fn`, as soon as a full
+    batch is waiting or `flush_interval` seconds after the oldest buffered row
+    arrived. Failed inserts are retried with exponential backoff and jitter.
+    After `max_retries` failed attempts the batch is dropped and counted in
+    `stats()["dropped"]`.
+
+    At most `max_buffered` rows are held. When the buffer is full, `add` blocks
+    for up to `put_timeout` seconds and then raises WriteBufferFullError.
+    """
+
+    def __init__(self,
+                 insert_fn: Callable[[List[Row]], None],
+                 max_batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 max_buffered: int = 10000,
+                 put_timeout: float = 5.0,
+                 max_retries: int = 5,
+                 backoff_base: float = 0.2,
+                 backoff_max: float = 10.0,
+                 name: str = "write-buffer"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_buffered < max_batch_size:
+            raise ValueError("max_buffered must be at least max_batch_size")
+
+        self.insert_fn = insert_fn
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._rows: Deque[Tuple[float, Row]] = deque()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._flush_requested = False
+        self._counters = {"flushed": 0, "batches": 0, "retries": 0, "dropped": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def add(self, row: Row) -> None:
+        """Buffer a row for the next flush.
+
+        Raises:
+            WriteBufferFullError: If the buffer stayed full for `put_timeout` seconds
+            RuntimeError: If the buffer is closed
+        """
+        deadline = time.monotonic() + self.put_timeout
+        with self._condition:
+            while len(self._rows) >= self.max_buffered and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WriteBufferFullError(f"Write buffer is full ({self.max_buffered} rows)")
+                self._condition.wait(remaining)
+            if self._closed:
+                raise RuntimeError("WriteBuffer is closed")
+
+            self._rows.append((time.monotonic(), row))
+            # The first row starts the flush timer, a full batch is flushed at once
+            if len(self._rows) == 1 or len(self._rows) >= self.max_batch_size:
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write out every buffered row now and wait until done.
+
+        Returns:
+            bool: False if rows were still pending after `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._rows or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = 30.0) -> bool:
+        """Flush the remaining rows and stop the background thread.
+
+        Returns:
+            bool: False if rows were still pending after `timeout` seconds
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
+        return flushed
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {"buffered": len(self._rows) + self._in_flight, **self._counters}
+
+    def _next_batch(self) -> Optional[List[Row]]:
+        with self._condition:
+            while True:
+                if self._rows:
+                    due = self._rows[0][0] + self.flush_interval
+                    if (len(self._rows) >= self.max_batch_size or self._flush_requested
+                            or self._closed or time.monotonic() >= due):
+                        break
+                    self._condition.wait(due - time.monotonic())
+                elif self._closed:
+                    return None
+                else:
+                    self._flush_requested = False
+                    self._condition.wait()
+
+            size = min(len(self._rows), self.max_batch_size)
+            batch = [self._rows.popleft()[1] for _ in range(size)]
+            self._in_flight = size
+            # Room was freed for blocked writers
+            self._condition.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._write(batch)
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _write(self, batch: List[Row]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.insert_fn(batch)
+                with self._condition:
+                    self._counters["flushed"] += len(batch)
+                    self._counters["batches"] += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"Dropping {len(batch)} rows after {attempt + 1} failed writes: {str(e)}")
+                    with self._condition:
+                        self._counters["dropped"] += len(batch)
+                    return
+                with self._condition:
+                    self._counters["retries"] += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
@@ -1,6 +1,11 @@
+import asyncio
+import threading
+from dataclasses import asdict
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
-import threading
+import os
 
 # Routes
 from vizeval.app.api.routes.evaluation import router as evaluation_router
@@ -9,6 +14,13 @@ from vizeval.app.api.routes.user import router as user_router
 # Services and dependencies
 from vizeval.infrastructure.memory_repository import MemoryRepository
 from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+from vizeval.infrastructure.queue.sqlite_queue import SqliteQueue
+from vizeval.infrastructure.queue.fair_queue import FairQueue, parse_tenant_map
+from vizeval.infrastructure.cache import MemoryResultCache, SqliteResultCache, MemoryApiKeyCache
+from vizeval.core.executor import configure_executor, configure_io_executor, run_blocking, DEFAULT_MAX_WORKERS
+from vizeval.evaluators import evaluator_stats, warmup
+from vizeval.evaluators.llm_cache import llm_cache_stats
+from vizeval.evaluators.rate_limit import llm_limiter_stats
 
 # Load environment variables
 load_dotenv()
@@ -20,20 +32,104 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Thread pool that runs blocking evaluator calls off the event loop
+configure_executor(int(os.getenv("VIZEVAL_EVALUATION_THREADS", str(DEFAULT_MAX_WORKERS))))
+# and a separate one for blocking repository, result cache and queue calls
+configure_io_executor(int(os.getenv("VIZEVAL_IO_THREADS", str(DEFAULT_MAX_WORKERS))))
+
 # Initialize dependencies
-repository = MemoryRepository()
-queue = MemoryQueue()
+repository_backend = os.getenv("VIZEVAL_REPOSITORY", "memory")
+if repository_backend == "supabase":
+    # Imported here so the supabase client is only loaded when used
+    from vizeval.infrastructure.supabase.async_supabase_store import AsyncSupabaseStore
+    # Async routes use a pooled keep-alive client, workers the buffered sync writes
+    repository = AsyncSupabaseStore(
+        os.environ["SUPABASE_URL"],
+        os.environ["SUPABASE_KEY"],
+        pool_size=int(os.getenv("VIZEVAL_SUPABASE_POOL_SIZE", "20")),
+        timeout=float(os.getenv("VIZEVAL_SUPABASE_TIMEOUT", "10")),
+        write_batch_size=int(os.getenv("VIZEVAL_SUPABASE_WRITE_BATCH_SIZE", "100")),
+    )
+elif repository_backend == "memory":
+    repository = MemoryRepository()
+else:
+    raise ValueError(f"Unknown repository '{repository_backend}', expected 'memory' or 'supabase'")
+queue_max_size = os.getenv("VIZEVAL_QUEUE_MAX_SIZE")
+queue_max_per_tenant = os.getenv("VIZEVAL_QUEUE_MAX_PER_TENANT")
+queue_limits = dict(
+    max_size=int(queue_max_size) if queue_max_size else None,
+    max_per_tenant=int(queue_max_per_tenant) if queue_max_per_tenant else None,
+    retry_after=float(os.getenv("VIZEVAL_QUEUE_RETRY_AFTER", "5")),
+    max_deliveries=int(os.getenv("VIZEVAL_QUEUE_MAX_DELIVERIES", "5")),
+)
+queue_backend = os.getenv("VIZEVAL_QUEUE_BACKEND", "memory")
+queue_scheduler = os.getenv("VIZEVAL_QUEUE_SCHEDULER", "fifo")
+if queue_backend == "sqlite" and queue_scheduler == "fair":
+    raise ValueError("VIZEVAL_QUEUE_SCHEDULER=fair needs VIZEVAL_QUEUE_BACKEND=memory")
+if queue_backend == "sqlite":
+    # Durable queue: jobs survive restarts and unacknowledged jobs are redelivered
+    queue = SqliteQueue(
+        os.getenv("VIZEVAL_QUEUE_PATH", "vizeval_queue.db"),
+        visibility_timeout=float(os.getenv("VIZEVAL_QUEUE_VISIBILITY_TIMEOUT", "300")),
+        **queue_limits,
+    )
+elif queue_backend == "memory" and queue_scheduler == "fair":
+    # Priority classes first, then weighted fair queuing across users
+    queue = FairQueue(
+        priorities=os.getenv("VIZEVAL_QUEUE_PRIORITIES", "interactive,bulk").split(","),
+        default_priority=os.getenv("VIZEVAL_QUEUE_DEFAULT_PRIORITY") or None,
+        tenant_weights=parse_tenant_map(os.getenv("VIZEVAL_TENANT_WEIGHTS", ""), float),
+        tenant_priorities=parse_tenant_map(os.getenv("VIZEVAL_TENANT_PRIORITIES", "")),
+        **queue_limits,
+    )
+elif queue_backend == "memory":
+    queue = MemoryQueue(**queue_limits)
+else:
+    raise ValueError(f"Unknown queue backend '{queue_backend}', expected 'memory' or 'sqlite'")
+
+# Fast evaluation result cache, optionally backed by a local SQLite file
+result_cache_ttl = float(os.getenv("VIZEVAL_RESULT_CACHE_TTL", "0")) or None
+result_cache_path = os.getenv("VIZEVAL_RESULT_CACHE_PATH")
+result_cache = MemoryResultCache(
+    max_entries=int(os.getenv("VIZEVAL_RESULT_CACHE_SIZE", "10000")),
+    ttl_seconds=result_cache_ttl,
+    persistent=SqliteResultCache(result_cache_path, ttl_seconds=result_cache_ttl)
+    if result_cache_path else None,
+)
+
+# API key lookups, so authenticating a request rarely queries the repository
+api_key_cache = MemoryApiKeyCache(
+    max_entries=int(os.getenv("VIZEVAL_API_KEY_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("VIZEVAL_API_KEY_CACHE_TTL", "300")),
+    negative_ttl_seconds=float(os.getenv("VIZEVAL_API_KEY_CACHE_NEGATIVE_TTL", "30")),
+)
 
 # Initialize services
 from vizeval.app.services.service_provider import initialize_services, get_evaluation_service
-initialize_services(repository, queue)
+from vizeval.app.services.worker_pool import WorkerPool, parse_concurrency_limits
+initialize_services(
+    repository,
+    queue,
+    result_cache,
+    overload_policy=os.getenv("VIZEVAL_OVERLOAD_POLICY", "reject"),
+    api_key_cache=api_key_cache,
+)
 
 # Include routers
 app.include_router(evaluation_router)
 app.include_router(user_router)
 
-# Start the evaluation worker in a separate thread
-worker_thread = None
+# Detailed evaluations are processed by a pool of background workers:
+# threads for I/O-bound evaluators, processes for CPU-bound torch evaluators
+worker_pool = WorkerPool(
+    get_evaluation_service(),
+    num_workers=int(os.getenv("VIZEVAL_WORKERS", "4")),
+    mode=os.getenv("VIZEVAL_WORKER_MODE", "thread"),
+    evaluator_concurrency=parse_concurrency_limits(os.getenv("VIZEVAL_EVALUATOR_CONCURRENCY", "")),
+)
+
+# Set once the evaluators in VIZEVAL_WARMUP_EVALUATORS are loaded and warmed up
+models_ready = threading.Event()
 
 
 @app.get("/")
@@ -46,26 +142,57 @@ async def health_check():
     return {"status": "healthy"}
 
 
-def start_worker_thread():
-    evaluation_service = get_evaluation_service()
-    evaluation_service.start_worker()
+@app.get("/ready")
+async def readiness_check():
+    # /health answers as soon as the process is up, /ready once it can serve quickly
+    if not models_ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready"}
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "result_cache": result_cache.stats(),
+        "api_key_cache": api_key_cache.stats(),
+        "queue": queue.stats(),
+        "workers": asdict(worker_pool.stats()),
+        "evaluators": evaluator_stats(),
+        "llm_cache": llm_cache_stats(),
+        "llm_rate_limits": llm_limiter_stats(),
+    }
+
+
+async def warm_up_evaluators(names):
+    try:
+        for name, seconds in (await run_blocking(warmup, names)).items():
+            print(f"Warmed up evaluator '{name}' in {seconds:.2f}s")
+    except Exception as e:
+        print(f"Warmup failed, not ready: {e}")
+        return
+    models_ready.set()
 
 
 @app.on_event("startup")
 async def startup_event():
-    global worker_thread
-    worker_thread = threading.Thread(target=start_worker_thread, daemon=True)
-    worker_thread.start()
-    print("Evaluation worker started in background thread")
+    # Other evaluators are loaded by their first request
+    warmup_evaluators = [name for name in os.getenv("VIZEVAL_WARMUP_EVALUATORS", "").split(",") if name]
+    unknown = [name for name in warmup_evaluators if name not in evaluator_stats()]
+    if unknown:
+        raise ValueError(f"Unknown evaluators in VIZEVAL_WARMUP_EVALUATORS: {unknown}")
+    # In the background, so /health answers while models load and warm up
+    app.state.warmup_task = asyncio.create_task(warm_up_evaluators(warmup_evaluators))
+    worker_pool.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    evaluation_service = get_evaluation_service()
-    evaluation_service.stop_worker()
-    if worker_thread and worker_thread.is_alive():
-        worker_thread.join(timeout=5.0)
-    print("Evaluation worker stopped")
+    worker_pool.shutdown(
+        drain=True,
+        timeout=float(os.getenv("VIZEVAL_WORKER_DRAIN_TIMEOUT", "30")),
+    )
+    # After the workers, so their last evaluations are written out too
+    await repository.aclose()
 
 
 if __name__ == "__main__":
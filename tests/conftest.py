@@ -0,0 +1,5 @@
+import os
+
+# The LangChain-backed medical evaluator refuses to load without a key.
+# No test talks to OpenAI.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
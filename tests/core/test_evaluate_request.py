@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.core.use_cases import EvaluateRequest
+from vizeval.evaluators.base import BaseEvaluator
+from vizeval.core.interfaces import ResultCache
+from vizeval.infrastructure.cache import MemoryResultCache
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+class CountingEvaluator(BaseEvaluator):
+    name = "counting"
+
+    def __init__(self, score=0.5):
+        self.score = score
+        self.fast_calls = 0
+
+    def fast_evaluate(self, request):
+        self.fast_calls += 1
+        return EvaluationResult(evaluator=self.name, score=self.score)
+
+
+def make_request(response="Python is a programming language."):
+    return EvaluationRequest(system_prompt="You are a helpful assistant.",
+                             user_prompt="Tell me about Python.",
+                             response=response)
+
+
+def test_identical_requests_are_served_from_cache():
+    evaluator = CountingEvaluator()
+    use_case = EvaluateRequest(evaluator, MemoryRepository(), MemoryResultCache())
+
+    first = use_case.execute_fast_eval(make_request())
+    second = use_case.execute_fast_eval(make_request())
+    use_case.execute_fast_eval(make_request(response="Something else."))
+
+    assert first == second
+    assert evaluator.fast_calls == 2
+
+
+def test_failed_evaluations_are_not_cached():
+    evaluator = CountingEvaluator(score=-1)
+    use_case = EvaluateRequest(evaluator, MemoryRepository(), MemoryResultCache())
+
+    use_case.execute_fast_eval(make_request())
+    use_case.execute_fast_eval(make_request())
+
+    assert evaluator.fast_calls == 2
+
+
+def test_evaluates_every_request_without_cache():
+    evaluator = CountingEvaluator()
+    use_case = EvaluateRequest(evaluator, MemoryRepository())
+
+    use_case.execute_fast_eval(make_request())
+    use_case.execute_fast_eval(make_request())
+
+    assert evaluator.fast_calls == 2
+
+
+class ThreadRecordingCache(ResultCache):
+    """A blocking persistent tier that records the threads it is called on."""
+
+    def __init__(self):
+        self.entries = {}
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread().name)
+        return self.entries.get(key)
+
+    def set(self, key, result):
+        self.threads.append(threading.current_thread().name)
+        self.entries[key] = result
+
+
+def test_async_paths_use_the_persistent_tier_off_the_event_loop():
+    persistent = ThreadRecordingCache()
+    use_case = EvaluateRequest(CountingEvaluator(), MemoryRepository(), MemoryResultCache(persistent=persistent))
+
+    asyncio.run(use_case.aexecute_fast_eval(make_request()))
+    asyncio.run(use_case.aexecute_fast_eval_batch([make_request("a"), make_request("b")]))
+
+    assert len(persistent.threads) == 6
+    assert all(thread.startswith("vizeval-io") for thread in persistent.threads)
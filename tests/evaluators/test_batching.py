@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from vizeval.evaluators.batching import MicroBatcher
+
+
+def test_concurrent_calls_are_coalesced_into_one_batch():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=200)
+    results = {}
+
+    def call(i):
+        results[i] = batcher(i)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert len(batches) == 1
+    assert sorted(batches[0]) == list(range(8))
+
+
+def test_batch_is_flushed_after_max_wait():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=32, max_wait_ms=10)
+
+    start = time.monotonic()
+    assert batcher("only") == "only"
+    elapsed = time.monotonic() - start
+    batcher.close()
+
+    assert elapsed < 1.0
+    assert batcher.batches == 1
+
+
+def test_batches_never_exceed_max_batch_size():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(10)]
+
+    assert [future.result() for future in futures] == list(range(10))
+    batcher.close()
+    assert max(sizes) <= 4
+    assert sum(sizes) == 10
+
+
+def test_batch_errors_are_raised_to_every_caller():
+    def batch_fn(items):
+        raise ValueError("model failure")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=1)
+    futures = [batcher.submit(i) for i in range(3)]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="model failure"):
+            future.result()
+    batcher.close()
+
+
+def test_closed_batcher_rejects_new_items():
+    batcher = MicroBatcher(lambda items: items)
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit(1)
@@ -6,6 +6,8 @@ Demonstra como usar o evaluator médico para detectar alucinações
 
 import os
 import sys
+
+import pytest
 sys.path.insert(0, 'src')
 
 # Carregar variáveis do arquivo .env
@@ -14,6 +16,7 @@ load_dotenv()
 
 from vizeval.evaluators import get_evaluator
 from vizeval.core.entities import EvaluationRequest
+from vizeval.core.interfaces import EvaluatorUnavailableError
 
 def test_medical_evaluator():
     """Testa o MedicalEvaluator com diferentes cenários"""
@@ -30,7 +33,11 @@ def test_medical_evaluator():
         evaluator="medical"
     )
     
-    result1 = evaluator.fast_evaluate(request1)
+    try:
+        result1 = evaluator.fast_evaluate(request1)
+    except EvaluatorUnavailableError as e:
+        # Sem acesso à OpenAI não há score a verificar
+        pytest.skip(f"LLM provider unavailable: {e}")
     print(f"Score: {result1.score:.2f}")
     print(f"Feedback:\n{result1.feedback}")
     print("\n" + "="*50 + "\n")
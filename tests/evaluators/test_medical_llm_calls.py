@@ -0,0 +1,230 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vizeval.core.entities import EvaluationRequest
+
+REQUEST = EvaluationRequest(
+    system_prompt="You are a medical assistant.",
+    user_prompt="What is diabetes?",
+    response="Diabetes is a chronic condition with high blood glucose.",
+    evaluator="medical",
+)
+
+
+class ChatCompletionsStub(ThreadingHTTPServer):
+    """OpenAI chat completions stub answering the medical risk, feedback and combined prompts."""
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), ChatCompletionsHandler)
+        self.latency = latency
+        self.prompts = []
+        # Statuses answered instead of a completion, in turn, like a throttling provider
+        self.failures = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+        with self.server.lock:
+            self.server.prompts.append(prompt)
+            failure = self.server.failures.pop(0) if self.server.failures else None
+        if failure is not None:
+            self._reply({"error": {"message": "Rate limit reached", "type": "requests"}}, failure,
+                        headers={"Retry-After": "0.1"})
+            return
+        time.sleep(self.server.latency)
+
+        answer = {}
+        if '"score"' in prompt:
+            answer.update(score=0.75, reasoning="Accurate")
+        if '"feedback"' in prompt:
+            answer = {key: value for key, value in answer.items() if key != "reasoning"}
+            answer["feedback"] = "No misinformation found"
+        content = json.dumps(answer)
+        self._reply({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()),
+                      "total_tokens": len(prompt.split()) + len(content.split())},
+        })
+
+    def _reply(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    import vizeval.evaluators.rate_limit as rate_limit
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    server = ChatCompletionsStub(latency=0.3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_BASE", server.url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_evaluator(mode):
+    from vizeval.evaluators.medical_temp import MedicalEvaluator
+    return MedicalEvaluator(mode=mode)
+
+
+def test_parallel_mode_runs_risk_and_feedback_concurrently(stub):
+    evaluator = make_evaluator("parallel")
+
+    start = time.perf_counter()
+    result = evaluator.detailed_evaluate(REQUEST)
+    elapsed = time.perf_counter() - start
+
+    assert (result.score, result.feedback) == (0.75, "No misinformation found")
+    assert len(stub.prompts) == 2
+    # Two 0.3s calls, at the same time
+    assert elapsed < 0.55
+    calls = evaluator.stats()["llm_calls"]
+    assert calls["risk"]["calls"] == calls["feedback"]["calls"] == 1
+    assert calls["risk"]["prompt_tokens"] > 0 and calls["risk"]["average_seconds"] >= 0.3
+
+
+def test_parallel_mode_reuses_the_fast_score(stub):
+    evaluator = make_evaluator("parallel")
+
+    fast_result = evaluator.fast_evaluate(REQUEST)
+    result = evaluator.detailed_evaluate(REQUEST, fast_result)
+
+    assert fast_result.feedback is None
+    assert (result.score, result.feedback) == (0.75, "No misinformation found")
+    assert sorted(evaluator.stats()["llm_calls"]) == ["feedback", "risk"]
+    assert len(stub.prompts) == 2
+
+
+def test_combined_mode_makes_one_call_per_evaluation(stub):
+    evaluator = make_evaluator("combined")
+
+    fast_result = evaluator.fast_evaluate(REQUEST)
+    result = evaluator.detailed_evaluate(REQUEST, fast_result)
+    without_fast_result = evaluator.detailed_evaluate(REQUEST)
+
+    assert (result.score, result.feedback) == (0.75, "No misinformation found")
+    assert (without_fast_result.score, without_fast_result.feedback) == (0.75, "No misinformation found")
+    assert len(stub.prompts) == 2
+    assert list(evaluator.stats()["llm_calls"]) == ["combined"]
+    assert evaluator.stats()["llm_calls"]["combined"]["calls"] == 2
+
+
+def test_repeated_prompts_are_answered_from_the_llm_cache(stub, tmp_path, monkeypatch):
+    import vizeval.evaluators.llm_cache as llm_cache
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    monkeypatch.setenv("VIZEVAL_LLM_CACHE_PATH", str(tmp_path / "llm.db"))
+
+    first = make_evaluator("parallel").detailed_evaluate(REQUEST)
+    # A new evaluator, as in another worker, shares the cache
+    second = make_evaluator("parallel").detailed_evaluate(REQUEST)
+
+    assert (first.score, first.feedback) == (second.score, second.feedback)
+    assert len(stub.prompts) == 2
+    assert llm_cache.llm_cache_stats()["hits"] == 2
+
+    monkeypatch.setenv("VIZEVAL_LLM_CACHE_BYPASS", "true")
+    make_evaluator("parallel").detailed_evaluate(REQUEST)
+    assert len(stub.prompts) == 4
+
+
+def test_throttled_calls_are_retried(stub):
+    from vizeval.evaluators.rate_limit import llm_limiter_stats
+    stub.failures = [429, 500]
+    evaluator = make_evaluator("combined")
+
+    result = evaluator.fast_evaluate(REQUEST)
+
+    assert (result.score, result.feedback) == (0.75, "No misinformation found")
+    limits = llm_limiter_stats()["gpt-4o-mini"]
+    assert (limits["calls"], limits["retries"], limits["throttled"]) == (3, 2, 1)
+    assert limits["tokens_used"] > 0
+
+
+def test_throttling_surfaces_as_an_error_not_a_score(stub, monkeypatch):
+    from vizeval.evaluators.rate_limit import LLMRateLimitError
+    monkeypatch.setenv("VIZEVAL_LLM_MAX_RETRIES", "1")
+    stub.failures = [429] * 6
+    evaluator = make_evaluator("parallel")
+
+    with pytest.raises(LLMRateLimitError):
+        evaluator.fast_evaluate(REQUEST)
+    with pytest.raises(LLMRateLimitError):
+        evaluator.detailed_evaluate(REQUEST)
+
+
+def test_calls_beyond_the_request_budget_are_rejected(stub, monkeypatch):
+    from vizeval.evaluators.rate_limit import LLMRateLimitError
+    monkeypatch.setenv("VIZEVAL_LLM_RPM", "1")
+    monkeypatch.setenv("VIZEVAL_LLM_MAX_WAIT", "1")
+    evaluator = make_evaluator("combined")
+
+    assert evaluator.fast_evaluate(REQUEST).score == 0.75
+    with pytest.raises(LLMRateLimitError) as error:
+        evaluator.fast_evaluate(REQUEST)
+    assert error.value.retry_after > 50
+    assert len(stub.prompts) == 1
+
+
+def test_batch_runs_llm_calls_concurrently_and_keeps_order(stub):
+    evaluator = make_evaluator("combined")
+    requests = [EvaluationRequest(system_prompt="s", user_prompt="u", response=str(i), evaluator="medical")
+                for i in range(4)]
+
+    start = time.perf_counter()
+    results = evaluator.fast_evaluate_batch(requests)
+    elapsed = time.perf_counter() - start
+
+    assert [(result.score, result.feedback) for result in results] == [(0.75, "No misinformation found")] * 4
+    # Four 0.3s calls, at the same time
+    assert elapsed < 0.9
+    assert len(stub.prompts) == 4
+
+
+def test_batch_returns_the_error_of_throttled_items_only(stub, monkeypatch):
+    from vizeval.evaluators.rate_limit import LLMRateLimitError
+    monkeypatch.setenv("VIZEVAL_LLM_MAX_RETRIES", "0")
+    stub.failures = [429]
+    evaluator = make_evaluator("parallel")
+    evaluator.batch_concurrency = 1
+
+    results = evaluator.fast_evaluate_batch([REQUEST, REQUEST])
+
+    assert isinstance(results[0], LLMRateLimitError)
+    assert (results[1].score, results[1].feedback) == (0.75, None)
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    with pytest.raises(ValueError, match="Unknown LLM mode"):
+        make_evaluator("sequential")
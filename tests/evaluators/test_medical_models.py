@@ -0,0 +1,39 @@
+from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.evaluators.medical import MedicalEvaluator
+
+REQUEST = EvaluationRequest(system_prompt="s", user_prompt="u", response="r", evaluator="medical")
+
+
+class FakeModel:
+    def __init__(self, score):
+        self.score = score
+        self.calls = 0
+
+    def evaluate(self, request):
+        self.calls += 1
+        return self.score
+
+
+def make_evaluator():
+    evaluator = MedicalEvaluator.__new__(MedicalEvaluator)
+    evaluator.fastval = FakeModel(0.2)
+    evaluator.gemma_shield = FakeModel(0.9)
+    return evaluator
+
+
+def test_detailed_score_comes_from_gemma_shield():
+    evaluator = make_evaluator()
+
+    result = evaluator.detailed_evaluate(REQUEST)
+
+    assert (result.score, result.feedback) == (0.9, 0.2)
+    assert evaluator.fastval.calls == 1
+
+
+def test_detailed_evaluation_reuses_the_fast_score():
+    evaluator = make_evaluator()
+
+    result = evaluator.detailed_evaluate(REQUEST, EvaluationResult(evaluator="medical", score=0.3))
+
+    assert (result.score, result.feedback) == (0.9, 0.3)
+    assert evaluator.fastval.calls == 0
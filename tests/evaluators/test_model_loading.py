@@ -0,0 +1,92 @@
+import os
+
+import torch
+from torch import nn
+
+from vizeval.evaluators.model_loading import (load_torchscript, optimize_for_inference, split_paths,
+                                             warmup_batch_sizes, warmup_model)
+
+
+class TinyScorer(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embeddings = nn.Embedding(10000, 32)
+        self.norm = nn.BatchNorm1d(32)
+        self.head = nn.Linear(32, 1)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        hidden = self.embeddings(input_ids).mean(1)
+        return torch.sigmoid(self.head(self.norm(hidden)))
+
+
+def save_model(path):
+    torch.jit.script(TinyScorer().eval()).save(str(path))
+    return str(path)
+
+
+def inputs():
+    input_ids = torch.randint(0, 100, (3, 5))
+    return input_ids, torch.ones_like(input_ids)
+
+
+def test_shared_weights_give_the_same_scores(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+    plain = load_torchscript(model_path, torch.device("cpu"), shared_weights=False)
+    shared = load_torchscript(model_path, torch.device("cpu"), shared_weights=True,
+                              cache_dir=str(tmp_path / "cache"))
+
+    with torch.no_grad():
+        input_ids, attention_mask = inputs()
+        assert torch.allclose(plain(input_ids, attention_mask), shared(input_ids, attention_mask))
+
+    skeleton_path, weights_path = split_paths(model_path, str(tmp_path / "cache"))
+    assert os.path.getsize(skeleton_path) < os.path.getsize(weights_path)
+
+
+def test_split_is_reused_until_the_model_changes(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+    load_torchscript(model_path, torch.device("cpu"), shared_weights=True)
+    first = split_paths(model_path)
+    written_at = os.stat(first[1]).st_mtime_ns
+
+    load_torchscript(model_path, torch.device("cpu"), shared_weights=True)
+    assert os.stat(first[1]).st_mtime_ns == written_at
+
+    save_model(tmp_path / "scorer.pt")
+    os.utime(model_path, ns=(written_at + 10 ** 9, written_at + 10 ** 9))
+    load_torchscript(model_path, torch.device("cpu"), shared_weights=True)
+    assert split_paths(model_path) != first
+    assert all(os.path.exists(path) for path in split_paths(model_path))
+
+
+def test_optimized_model_is_frozen_and_scores_the_same(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+    model = load_torchscript(model_path, torch.device("cpu"), shared_weights=False)
+    optimized = optimize_for_inference(model, optimize=True, shared_weights=False)
+
+    assert list(optimized.parameters()) == []
+    with torch.no_grad():
+        input_ids, attention_mask = inputs()
+        assert torch.allclose(model(input_ids, attention_mask), optimized(input_ids, attention_mask))
+
+    assert optimize_for_inference(model, optimize=False) is model
+    # Folding would copy memory-mapped weights
+    assert optimize_for_inference(model, optimize=True, shared_weights=True) is model
+
+
+def test_warmup_runs_every_shape():
+    shapes = []
+
+    def model(input_ids, attention_mask):
+        shapes.append(tuple(input_ids.shape))
+        return torch.zeros(input_ids.size(0), 1)
+
+    warmup_model(model, torch.device("cpu"), lengths=[64, 128], batch_sizes=[1, 8], runs=2)
+
+    assert shapes == [(1, 64), (1, 64), (8, 64), (8, 64), (1, 128), (1, 128), (8, 128), (8, 128)]
+
+
+def test_warmup_batch_sizes_reach_the_largest_batch():
+    assert warmup_batch_sizes(1) == [1]
+    assert warmup_batch_sizes(32) == [1, 2, 4, 8, 16, 32]
+    assert warmup_batch_sizes(24) == [1, 2, 4, 8, 16, 24]
@@ -0,0 +1,79 @@
+import pytest
+import torch
+from torch import nn
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from vizeval.evaluators.backends import load_model  # noqa: E402
+from vizeval.evaluators.onnx_runtime import OnnxRuntimeModel, export_onnx, onnx_path  # noqa: E402
+
+
+class AttentionScorer(nn.Module):
+    def __init__(self, hidden: int = 32):
+        super().__init__()
+        self.embeddings = nn.Embedding(100, hidden)
+        self.query = nn.Linear(hidden, hidden)
+        self.key = nn.Linear(hidden, hidden)
+        self.value = nn.Linear(hidden, hidden)
+        self.norm = nn.LayerNorm(hidden)
+        self.head = nn.Linear(hidden, 1)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        hidden = self.embeddings(input_ids)
+        bias = (1.0 - attention_mask[:, None, :].to(hidden.dtype)) * -10000.0
+        weights = torch.softmax(self.query(hidden) @ self.key(hidden).transpose(1, 2) + bias, -1)
+        hidden = self.norm(hidden + weights @ self.value(hidden))
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        return torch.sigmoid(self.head((hidden * mask).sum(1) / mask.sum(1)))
+
+
+def save_model(path):
+    torch.manual_seed(0)
+    input_ids = torch.randint(0, 100, (2, 8))
+    with torch.no_grad():
+        traced = torch.jit.trace(AttentionScorer().eval(), (input_ids, torch.ones_like(input_ids)))
+    traced.save(str(path))
+    return str(path)
+
+
+def test_onnx_scores_match_torchscript(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+    assert export_onnx(model_path) == onnx_path(model_path) == str(tmp_path / "scorer.onnx")
+
+    torchscript = load_model(model_path, torch.device("cpu"), backend="torchscript")
+    onnx = load_model(model_path, torch.device("cpu"), backend="onnx")
+    assert isinstance(onnx, OnnxRuntimeModel)
+
+    # Batch size and sequence length differ from the export example
+    input_ids = torch.randint(0, 100, (5, 23))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[0, 10:] = 0
+    with torch.no_grad():
+        expected = torchscript(input_ids, attention_mask)
+    assert torch.allclose(expected, onnx(input_ids, attention_mask), atol=1e-5)
+
+
+def test_onnx_backend_needs_an_export(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+
+    with pytest.raises(FileNotFoundError, match="onnx_runtime"):
+        load_model(model_path, torch.device("cpu"), backend="onnx")
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        load_model(save_model(tmp_path / "scorer.pt"), torch.device("cpu"), backend="tensorrt")
+
+
+def test_session_options(tmp_path):
+    model_path = save_model(tmp_path / "scorer.pt")
+    model = OnnxRuntimeModel(export_onnx(model_path), intra_op_threads=1, inter_op_threads=2,
+                             optimization="basic")
+
+    options = model.session.get_session_options()
+    assert options.intra_op_num_threads == 1
+    assert options.inter_op_num_threads == 2
+
+    with pytest.raises(ValueError, match="Unknown ONNX optimization"):
+        OnnxRuntimeModel(onnx_path(model_path), optimization="fastest")
@@ -0,0 +1,64 @@
+import json
+
+import torch
+from torch import nn
+
+from vizeval.evaluators.quantization import (compare_scores, int8_enabled, load_requests,
+                                             quantize_int8)
+
+
+class Scorer(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embeddings = nn.Embedding(100, 64)
+        self.hidden = nn.Linear(64, 64)
+        self.head = nn.Linear(64, 1)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        hidden = torch.relu(self.hidden(self.embeddings(input_ids))).mean(1)
+        return torch.sigmoid(self.head(hidden))
+
+
+def test_quantize_int8_replaces_linear_layers_and_keeps_scores_close():
+    torch.manual_seed(0)
+    model = torch.jit.script(Scorer().eval())
+    quantized = quantize_int8(model)
+
+    assert "quantized::linear_dynamic" in str(quantized.graph)
+    input_ids = torch.randint(0, 100, (8, 12))
+    with torch.no_grad():
+        expected = model(input_ids, torch.ones_like(input_ids))
+        actual = quantized(input_ids, torch.ones_like(input_ids))
+    assert torch.allclose(expected, actual, atol=0.02)
+
+
+def test_compare_scores_reports_drift():
+    report = compare_scores(lambda batch: [0.5] * len(batch),
+                            lambda batch: [0.5 + x for x in batch],
+                            [[0.0, 0.1], [0.02]])
+
+    assert report.samples == 3
+    assert abs(report.max_drift - 0.1) < 1e-9
+    assert abs(report.mean_drift - 0.04) < 1e-9
+    assert report.speedup > 0
+
+
+def test_int8_enabled_reads_model_names(monkeypatch):
+    monkeypatch.setenv("VIZEVAL_INT8_MODELS", "fastval, gemma_shield")
+    assert int8_enabled("fastval")
+    assert int8_enabled("gemma_shield")
+    assert not int8_enabled("medical")
+
+    monkeypatch.delenv("VIZEVAL_INT8_MODELS")
+    assert not int8_enabled("fastval")
+
+
+def test_load_requests_reads_jsonl(tmp_path):
+    path = tmp_path / "heldout.jsonl"
+    rows = [{"system_prompt": "s", "user_prompt": "u", "response": "r"}, {"response": "only"}]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n")
+
+    requests = load_requests(str(path))
+
+    assert [request.response for request in requests] == ["r", "only"]
+    assert requests[0].system_prompt == "s" and requests[1].user_prompt == ""
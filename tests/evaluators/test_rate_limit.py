@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from vizeval.core.interfaces import EvaluatorUnavailableError
+from vizeval.evaluators.rate_limit import LLMRateLimiter, LLMRateLimitError
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def failing(*statuses):
+    """A call raising the given statuses in turn, then answering "ok"."""
+    remaining = list(statuses)
+
+    def call():
+        if remaining:
+            raise StatusError(remaining.pop(0))
+        return "ok"
+    return call
+
+
+def test_requests_beyond_the_budget_wait_or_are_rejected():
+    limiter = LLMRateLimiter(requests_per_minute=60, max_wait=2.0)
+    limiter.call(lambda: None)
+
+    start = time.perf_counter()
+    limiter.call(lambda: None)
+    # One request a second
+    assert 0.9 < time.perf_counter() - start < 1.5
+    assert limiter.stats()["max_queue_seconds"] > 0.9
+
+    limiter.max_wait = 0.5
+    with pytest.raises(LLMRateLimitError) as error:
+        limiter.call(lambda: None)
+    assert error.value.retry_after > 0.5
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_token_reservations_are_settled_with_the_real_usage():
+    limiter = LLMRateLimiter(tokens_per_minute=600, max_wait=1.0, burst_seconds=60)
+
+    limiter.call(lambda: 100, tokens=500, used_tokens=lambda used: used)
+    # 400 of the 500 reserved tokens came back
+    limiter.call(lambda: 500, tokens=450)
+    with pytest.raises(LLMRateLimitError):
+        limiter.call(lambda: None, tokens=100)
+
+    stats = limiter.stats()
+    assert (stats["tokens_reserved"], stats["tokens_used"]) == (950, 100)
+
+
+def test_concurrency_is_capped():
+    limiter = LLMRateLimiter(max_concurrency=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.pop()
+
+    threads = [threading.Thread(target=limiter.call, args=(call,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert limiter.stats()["calls"] == 5
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_throttled_and_failed_calls_are_retried():
+    limiter = LLMRateLimiter(backoff=0.01)
+
+    assert limiter.call(failing(429, 503)) == "ok"
+
+    stats = limiter.stats()
+    assert (stats["calls"], stats["retries"], stats["throttled"]) == (3, 2, 1)
+
+
+def test_exhausted_retries_raise_unavailable_errors():
+    limiter = LLMRateLimiter(max_retries=1, backoff=0.01)
+
+    with pytest.raises(LLMRateLimitError):
+        limiter.call(failing(429, 429))
+    with pytest.raises(EvaluatorUnavailableError) as error:
+        limiter.call(failing(500, 502))
+    assert not isinstance(error.value, LLMRateLimitError)
+    # Other errors are not retried
+    with pytest.raises(StatusError):
+        limiter.call(failing(400))
+    assert limiter.stats()["failed"] == 3
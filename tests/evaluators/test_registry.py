@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import vizeval.evaluators as evaluators
+from vizeval.evaluators import evaluator_stats, get_evaluator, register_evaluator, warmup
+from vizeval.evaluators.dummy import DummyEvaluator
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    for registry in ("_factories", "_evaluators", "_load_seconds"):
+        monkeypatch.setattr(evaluators, registry, dict(getattr(evaluators, registry)))
+
+
+class SlowEvaluator(DummyEvaluator):
+    name = "slow"
+    builds = 0
+
+    def __init__(self):
+        type(self).builds += 1
+        time.sleep(0.05)
+
+
+def test_importing_does_not_load_heavy_evaluators():
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, vizeval.evaluators; print('langchain' in sys.modules)"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_evaluator_is_built_once_on_first_use():
+    SlowEvaluator.builds = 0
+    register_evaluator(SlowEvaluator.name, SlowEvaluator)
+    assert evaluator_stats()["slow"] == {"loaded": False, "load_seconds": None}
+
+    loaded = []
+    threads = [threading.Thread(target=lambda: loaded.append(get_evaluator("slow"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SlowEvaluator.builds == 1
+    assert all(evaluator is loaded[0] for evaluator in loaded)
+    assert evaluator_stats()["slow"]["load_seconds"] >= 0.05
+
+
+def test_warmup_loads_and_reports_timings():
+    register_evaluator(SlowEvaluator.name, SlowEvaluator)
+
+    timings = warmup(["slow"])
+
+    assert timings["slow"] >= 0.05
+    assert evaluator_stats()["slow"]["loaded"]
+
+
+class WarmedEvaluator(DummyEvaluator):
+    name = "warmed"
+
+    def __init__(self):
+        self.warmups = 0
+
+    def warmup(self):
+        self.warmups += 1
+
+
+def test_evaluator_is_warmed_up_once_before_use():
+    register_evaluator(WarmedEvaluator.name, WarmedEvaluator)
+
+    warmup(["warmed"])
+
+    assert get_evaluator("warmed").warmups == 1
+
+
+def test_warmup_rejects_unknown_evaluators():
+    with pytest.raises(ValueError):
+        warmup(["nope"])
+
+
+def test_unknown_evaluator_falls_back_to_dummy():
+    assert isinstance(get_evaluator("nope"), DummyEvaluator)
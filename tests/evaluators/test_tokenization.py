@@ -0,0 +1,74 @@
+import pytest
+from transformers import BertTokenizerFast
+
+from vizeval.evaluators.tokenization import (bucket_length, default_buckets, padded_lengths,
+                                             tokenize_batch)
+
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    vocab_file = tmp_path / "vocab.txt"
+    words = [f"w{i}" for i in range(100)]
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words) + "\n")
+    return BertTokenizerFast(str(vocab_file))
+
+
+def text(num_words):
+    return " ".join(f"w{i % 100}" for i in range(num_words))
+
+
+def test_bucket_length_picks_smallest_fitting_bucket():
+    buckets = [64, 128, 256, 512]
+
+    assert bucket_length(1, buckets, 512) == 64
+    assert bucket_length(64, buckets, 512) == 64
+    assert bucket_length(65, buckets, 512) == 128
+    assert bucket_length(600, buckets, 512) == 512
+    assert bucket_length(100, [64, 1024], 512) == 512
+
+
+def test_default_buckets_end_at_max_length():
+    assert default_buckets(512) == [64, 128, 256, 512]
+    assert default_buckets(1000) == [64, 128, 256, 512, 1000]
+
+
+def test_max_length_mode_pads_to_max_length(tokenizer):
+    encoded = tokenize_batch(tokenizer, text(10), max_length=512, padding="max_length")
+
+    assert encoded["input_ids"].shape == (1, 512)
+
+
+def test_longest_mode_pads_to_longest_in_batch(tokenizer):
+    encoded = tokenize_batch(tokenizer, [text(5), text(30)], max_length=512, padding="longest")
+
+    # 30 words plus [CLS] and [SEP]
+    assert encoded["input_ids"].shape == (2, 32)
+    assert encoded["attention_mask"][0].sum().item() == 7
+    assert encoded["attention_mask"][1].sum().item() == 32
+
+
+def test_bucket_mode_pads_to_bucket(tokenizer):
+    encoded = tokenize_batch(tokenizer, [text(5), text(70)], max_length=512,
+                             padding="bucket", buckets=[64, 128, 256, 512])
+
+    assert encoded["input_ids"].shape == (2, 128)
+    assert encoded["input_ids"][0, 7:].eq(tokenizer.pad_token_id).all()
+
+
+def test_bucket_mode_truncates_to_max_length(tokenizer):
+    encoded = tokenize_batch(tokenizer, text(1000), max_length=512, padding="bucket")
+
+    assert encoded["input_ids"].shape == (1, 512)
+
+
+def test_unknown_padding_mode_is_rejected(tokenizer):
+    with pytest.raises(ValueError):
+        tokenize_batch(tokenizer, text(3), max_length=512, padding="dynamic")
+
+
+def test_padded_lengths_cover_every_padding_mode():
+    assert padded_lengths(512, "bucket", [256, 64, 1024]) == [64, 256, 512]
+    # Longer inputs fall back to max_length, which is not a bucket here
+    assert padded_lengths(512, "bucket", [64, 128]) == [64, 128, 512]
+    assert padded_lengths(512, "max_length") == [512]
+    assert padded_lengths(512, "longest") == [64, 128, 256, 512]
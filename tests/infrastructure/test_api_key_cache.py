@@ -0,0 +1,78 @@
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.core.entities import User
+from vizeval.infrastructure.cache import api_key_cache, MemoryApiKeyCache
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+class CountingRepository(MemoryRepository):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def get_user_from_api_key(self, api_key):
+        self.lookups += 1
+        return super().get_user_from_api_key(api_key)
+
+
+def test_valid_and_invalid_keys_expire_after_their_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(api_key_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryApiKeyCache(ttl_seconds=60, negative_ttl_seconds=5)
+    user = User(name="a", api_key="key-a", id="user-a")
+    cache.set("key-a", user)
+    cache.set("bogus", None)
+
+    now[0] = 4
+    assert cache.get("key-a") == (True, user)
+    assert cache.get("bogus") == (True, None)
+
+    now[0] = 6
+    assert cache.get("key-a") == (True, user)
+    assert cache.get("bogus") == (False, None)
+
+    now[0] = 61
+    assert cache.get("key-a") == (False, None)
+
+
+def test_invalid_keys_cannot_evict_valid_ones():
+    cache = MemoryApiKeyCache(max_entries=2, max_negative_entries=2)
+    cache.set("key-a", User(name="a", api_key="key-a", id="user-a"))
+    for i in range(10):
+        cache.set(f"guess-{i}", None)
+
+    assert cache.get("key-a")[0]
+    assert cache.stats()["negative_entries"] == 2
+
+
+def test_repository_service_caches_lookups_and_invalidates_on_add_user():
+    repository = CountingRepository()
+    service = RepositoryService(repository, MemoryApiKeyCache())
+
+    # MemoryRepository hands out the mock API key
+    assert service.get_user_from_api_key("mock-api-key") is None
+    assert service.get_user_from_api_key("mock-api-key") is None
+    assert repository.lookups == 1
+
+    api_key = service.add_user(User(name="a"))
+    assert service.get_user_from_api_key(api_key).name == "a"
+    assert service.get_user_from_api_key(api_key).name == "a"
+    assert repository.lookups == 2
+
+    stats = service.api_key_cache.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (1, 1, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lookup_racing_add_user_does_not_cache_the_key_as_invalid():
+    class RacingRepository(MemoryRepository):
+        def get_user_from_api_key(self, api_key):
+            user = super().get_user_from_api_key(api_key)
+            if not self.users:
+                # The user is added after the lookup read the repository
+                service.add_user(User(name="a"))
+            return user
+
+    service = RepositoryService(RacingRepository(), MemoryApiKeyCache())
+
+    assert service.get_user_from_api_key("mock-api-key") is None
+    assert service.get_user_from_api_key("mock-api-key").name == "a"
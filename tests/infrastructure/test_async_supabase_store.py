@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from vizeval.core.entities import Evaluation, User
+from vizeval.infrastructure.supabase.async_supabase_store import AsyncSupabaseStore
+
+
+class PostgrestStub(ThreadingHTTPServer):
+    """Keep-alive PostgREST stub supporting inserts and `eq` / `limit` selects."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.tables = {"users": [], "evaluations": []}
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            self.server.tables[self._table()].extend(body if isinstance(body, list) else [body])
+        self._reply(201, [])
+
+    def do_GET(self):
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            rows = list(self.server.tables[self._table()])
+        for column, value in params.items():
+            if value.startswith("eq."):
+                rows = [row for row in rows if str(row[column]) == value[3:]]
+        rows.sort(key=lambda row: (row.get("created_at", ""), row["id"]))
+        if "limit" in params:
+            rows = rows[:int(params["limit"])]
+        self._reply(200, rows)
+
+    def _table(self):
+        return urlsplit(self.path).path.rsplit("/", 1)[-1]
+
+    def _reply(self, status, rows):
+        body = json.dumps(rows).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = PostgrestStub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_users_round_trip(stub):
+    async def scenario():
+        store = AsyncSupabaseStore(stub.url, "test-key")
+        await store.aadd_user(User(name="Test User", api_key="key-a", id="user-a"))
+        found = await store.aget_user_from_api_key("key-a")
+        missing = await store.aget_user_from_api_key("unknown")
+        await store.aclose()
+        return found, missing
+
+    found, missing = asyncio.run(scenario())
+
+    assert found == User(name="Test User", api_key="key-a", id="user-a")
+    assert missing is None
+
+
+def test_evaluations_are_stored_and_paged(stub):
+    async def scenario():
+        store = AsyncSupabaseStore(stub.url, "test-key", write_batch_size=1)
+        for i in range(5):
+            await store.astore_evaluation(Evaluation(system_prompt="s", user_prompt="u", response=str(i),
+                                                     user_id="user-a", evaluator="dummy", score=0.5))
+        page = await store.alist_evaluations_page("user-a", limit=3)
+        await store.aclose()
+        return page
+
+    page = asyncio.run(scenario())
+
+    assert [evaluation.response for evaluation in page.evaluations] == ["0", "1", "2"]
+    assert page.next_cursor is not None
+
+
+def test_concurrent_requests_share_the_connection_pool(stub):
+    async def scenario():
+        store = AsyncSupabaseStore(stub.url, "test-key", pool_size=4)
+        users = await asyncio.gather(*(store.aget_user_from_api_key(f"key-{i}") for i in range(50)))
+        await store.aclose()
+        return users
+
+    assert asyncio.run(scenario()) == [None] * 50
+    assert len(stub.connections) <= 4
@@ -0,0 +1,92 @@
+import pytest
+
+from vizeval.core.entities import EvaluationJob, EvaluationRequest
+from vizeval.core.interfaces import QueueFullError
+from vizeval.infrastructure.queue.fair_queue import FairQueue, parse_tenant_map
+
+
+def make_job(user_id, response="r", priority=None, metadata=None):
+    return EvaluationJob(request=EvaluationRequest(system_prompt="s", user_prompt="u", response=response,
+                                                   user_id=user_id, metadata=metadata),
+                         priority=priority)
+
+
+def drain(queue):
+    return [job.request.user_id for job in queue.dequeue_many(queue.size())]
+
+
+def test_tenants_take_turns_instead_of_fifo():
+    queue = FairQueue()
+    for i in range(5):
+        queue.enqueue(make_job("bulk-user", str(i)))
+    queue.enqueue(make_job("small-user"))
+
+    # The late tenant is served right after the first job, not after all five
+    assert drain(queue)[:2] == ["bulk-user", "small-user"]
+
+
+def test_weights_share_turns_proportionally():
+    queue = FairQueue(tenant_weights={"a": 2})
+    for _ in range(6):
+        queue.enqueue(make_job("a"))
+        queue.enqueue(make_job("b"))
+
+    assert drain(queue)[:6].count("a") == 4
+
+
+def test_higher_priority_class_is_served_first():
+    queue = FairQueue(tenant_priorities={"vip": "interactive"})
+    queue.enqueue(make_job("a"))
+    queue.enqueue(make_job("b", metadata={"priority": "interactive"}))
+    queue.enqueue(make_job("c", priority="interactive"))
+    queue.enqueue(make_job("vip"))
+    queue.enqueue(make_job("d", metadata={"priority": "unknown"}))
+
+    assert drain(queue) == ["b", "c", "vip", "a", "d"]
+
+
+def test_idle_tenant_does_not_bank_credit():
+    queue = FairQueue()
+    for _ in range(4):
+        queue.enqueue(make_job("a"))
+    queue.dequeue_many(4)
+
+    for _ in range(3):
+        queue.enqueue(make_job("a"))
+    queue.enqueue(make_job("b"))
+
+    assert drain(queue)[:2] == ["a", "b"]
+
+
+def test_stats_report_per_tenant_depth_and_wait():
+    queue = FairQueue()
+    queue.enqueue(make_job("a"))
+    queue.enqueue(make_job("a"))
+    queue.enqueue(make_job("b"))
+    queue.dequeue()
+
+    stats = queue.stats()
+
+    assert stats["size"] == 2
+    assert stats["priorities"] == {"interactive": 0, "bulk": 2}
+    assert stats["tenants"]["a"]["depth"] == 1
+    assert stats["tenants"]["a"]["dequeued"] == 1
+    assert stats["tenants"]["a"]["wait_max"] >= 0
+    assert stats["tenants"]["b"]["dequeued"] == 0
+
+
+def test_capacity_limits_still_apply():
+    queue = FairQueue(max_per_tenant=1)
+    queue.enqueue(make_job("a"))
+
+    with pytest.raises(QueueFullError):
+        queue.enqueue(make_job("a"))
+    queue.enqueue(make_job("b"))
+    assert queue.size() == 2
+
+
+def test_parse_tenant_map():
+    assert parse_tenant_map("a=2, b=0.5", float) == {"a": 2.0, "b": 0.5}
+    assert parse_tenant_map("") == {}
+    with pytest.raises(ValueError):
+        parse_tenant_map("a")
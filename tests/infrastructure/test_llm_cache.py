@@ -0,0 +1,55 @@
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from vizeval.infrastructure.cache.llm_cache import SqliteLLMCache
+
+LLM = "gpt-4o-mini temperature=0"
+
+
+def generations(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_round_trip_and_persistence(tmp_path):
+    path = str(tmp_path / "llm.db")
+    cache = SqliteLLMCache(path)
+    assert cache.lookup("prompt", LLM) is None
+
+    cache.update("prompt", LLM, generations('{"score": 0.8}'))
+    cache.close()
+
+    reopened = SqliteLLMCache(path)
+    cached = reopened.lookup("prompt", LLM)
+    assert cached[0].message.content == '{"score": 0.8}'
+    assert reopened.stats()["hits"] == 1
+
+
+def test_key_depends_on_prompt_and_model(tmp_path):
+    cache = SqliteLLMCache(str(tmp_path / "llm.db"))
+    cache.update("prompt", LLM, generations("a"))
+
+    assert cache.lookup("other prompt", LLM) is None
+    assert cache.lookup("prompt", "gpt-4o temperature=0") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SqliteLLMCache(str(tmp_path / "llm.db"), max_entries=10)
+    for i in range(10):
+        cache.update(f"prompt {i}", LLM, generations(str(i)))
+    cache.lookup("prompt 0", LLM)
+
+    for i in range(10, 15):
+        cache.update(f"prompt {i}", LLM, generations(str(i)))
+
+    assert cache.stats()["entries"] <= 11
+    assert cache.lookup("prompt 0", LLM) is not None
+    assert cache.lookup("prompt 1", LLM) is None
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = SqliteLLMCache(str(tmp_path / "llm.db"), ttl_seconds=0)
+    cache.update("prompt", LLM, generations("a"))
+
+    assert cache.lookup("prompt", LLM) is None
+    assert cache.stats()["entries"] == 0
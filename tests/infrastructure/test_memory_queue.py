@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from vizeval.core.entities import EvaluationJob, EvaluationRequest
+from vizeval.core.interfaces import QueueFullError
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+
+
+def make_job(response="r", user_id="mock-user-id"):
+    return EvaluationJob(request=EvaluationRequest(system_prompt="s", user_prompt="u", response=response,
+                                                   user_id=user_id))
+
+
+def enqueue_later(queue, job, delay):
+    timer = threading.Timer(delay, queue.enqueue, args=(job,))
+    timer.start()
+    return timer
+
+
+def test_dequeue_without_timeout_does_not_block():
+    queue = MemoryQueue()
+
+    assert queue.dequeue() is None
+    assert queue.dequeue_many(5) == []
+
+
+def test_blocking_dequeue_wakes_up_on_enqueue():
+    queue = MemoryQueue()
+    job = make_job()
+    enqueue_later(queue, job, 0.05)
+
+    start = time.monotonic()
+    assert queue.dequeue(timeout=5) is job
+    assert time.monotonic() - start < 1.0
+
+
+def test_blocking_dequeue_times_out():
+    queue = MemoryQueue()
+
+    start = time.monotonic()
+    assert queue.dequeue(timeout=0.05) is None
+    assert time.monotonic() - start >= 0.05
+
+
+def test_dequeue_many_returns_available_jobs_in_order():
+    queue = MemoryQueue()
+    jobs = [make_job(str(i)) for i in range(5)]
+    for job in jobs:
+        queue.enqueue(job)
+
+    assert queue.dequeue_many(3, timeout=1) == jobs[:3]
+    assert queue.dequeue_many(10, timeout=1) == jobs[3:]
+    assert queue.is_empty()
+
+
+def test_each_job_is_delivered_to_exactly_one_consumer():
+    queue = MemoryQueue()
+    received = []
+    lock = threading.Lock()
+
+    def consumer():
+        while True:
+            job = queue.dequeue(timeout=0.2)
+            if job is None:
+                return
+            with lock:
+                received.append(job.id)
+
+    consumers = [threading.Thread(target=consumer) for _ in range(4)]
+    for thread in consumers:
+        thread.start()
+    jobs = [make_job(str(i)) for i in range(200)]
+    for job in jobs:
+        queue.enqueue(job)
+    for thread in consumers:
+        thread.join()
+
+    assert sorted(received) == sorted(job.id for job in jobs)
+
+
+def test_adequeue_wakes_up_on_enqueue_from_another_thread():
+    queue = MemoryQueue()
+    job = make_job()
+
+    async def scenario():
+        enqueue_later(queue, job, 0.05)
+        return await queue.adequeue(timeout=5)
+
+    start = time.monotonic()
+    assert asyncio.run(scenario()) is job
+    assert time.monotonic() - start < 1.0
+
+
+def test_adequeue_times_out():
+    queue = MemoryQueue()
+
+    assert asyncio.run(queue.adequeue(timeout=0.05)) is None
+    assert asyncio.run(queue.adequeue_many(3, timeout=0.05)) == []
+
+
+def test_bounded_queue_rejects_jobs_over_max_size():
+    queue = MemoryQueue(max_size=2, retry_after=7)
+    queue.enqueue(make_job("1"))
+    queue.enqueue(make_job("2"))
+
+    with pytest.raises(QueueFullError) as error:
+        queue.enqueue(make_job("3"))
+    assert error.value.retry_after == 7
+    assert queue.size() == 2
+
+    queue.dequeue()
+    queue.enqueue(make_job("3"))
+    assert queue.stats()["rejected"] == 1
+
+
+def test_per_tenant_cap_only_limits_that_tenant():
+    queue = MemoryQueue(max_per_tenant=1)
+    queue.enqueue(make_job("a", user_id="alice"))
+
+    with pytest.raises(QueueFullError):
+        queue.check_capacity("alice")
+    with pytest.raises(QueueFullError):
+        queue.enqueue(make_job("b", user_id="alice"))
+    queue.check_capacity("bob")
+    queue.enqueue(make_job("c", user_id="bob"))
+
+    queue.dequeue_many(2)
+    queue.enqueue(make_job("d", user_id="alice"))
+
+
+def test_enqueue_many_is_all_or_nothing():
+    queue = MemoryQueue(max_size=4, max_per_tenant=2)
+    queue.enqueue(make_job(user_id="a"))
+
+    with pytest.raises(QueueFullError):
+        queue.enqueue_many([make_job(user_id="a"), make_job(user_id="a")])
+    queue.enqueue_many([make_job(user_id="a"), make_job(user_id="b")])
+
+    assert queue.size() == 3
+    assert queue.stats()["rejected"] == 2
+
+
+def test_nacked_job_comes_back_after_its_delay_even_when_full():
+    queue = MemoryQueue(max_size=1)
+    job = make_job()
+    queue.enqueue(job)
+    queue.nack(queue.dequeue())
+    assert queue.dequeue() is job
+
+    queue.enqueue(make_job("other"))
+    queue.nack(job, retry_after=0.2)
+    assert queue.dequeue().request.response == "other"
+    assert queue.dequeue() is None and not queue.is_empty()
+    assert queue.dequeue(timeout=2) is job
+    assert queue.size() == 0
+
+
+def test_job_is_dropped_after_max_deliveries():
+    queue = MemoryQueue(max_deliveries=2)
+    queue.enqueue(make_job())
+
+    for _ in range(2):
+        queue.nack(queue.dequeue())
+
+    assert queue.dequeue() is None
+    assert queue.is_empty()
+    assert queue.stats()["dropped"] == 1
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vizeval.core.entities import Evaluation, EvaluationFilter
+from vizeval.core.interfaces import VizevalRepository
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+def make_evaluation(user_id="user-a", evaluator="dummy", response="r", created_at=None, score=0.5):
+    return Evaluation(system_prompt="s", user_prompt="u", response=response, user_id=user_id,
+                      evaluator=evaluator, score=score, created_at=created_at)
+
+
+def collect_pages(repository, user_id, limit, evaluator=None, filters=None):
+    pages, cursor = [], None
+    while True:
+        page = repository.list_evaluations_page(user_id, limit=limit, cursor=cursor, evaluator=evaluator,
+                                                filters=filters)
+        pages.append([evaluation.response for evaluation in page.evaluations])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_store_assigns_id_and_created_at():
+    repository = MemoryRepository()
+    evaluation = make_evaluation()
+
+    evaluation_id = repository.store_evaluation(evaluation)
+
+    assert evaluation.id == evaluation_id
+    assert evaluation.created_at is not None
+
+
+def test_pages_walk_a_users_evaluations_in_insertion_order():
+    repository = MemoryRepository()
+    for i in range(7):
+        repository.store_evaluation(make_evaluation(response=str(i)))
+        repository.store_evaluation(make_evaluation(user_id="user-b", response=f"b{i}"))
+
+    assert collect_pages(repository, "user-a", limit=3) == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert collect_pages(repository, "user-a", limit=7) == [[str(i) for i in range(7)]]
+    assert collect_pages(repository, "nobody", limit=3) == [[]]
+
+
+def test_pages_can_be_filtered_by_evaluator():
+    repository = MemoryRepository()
+    for i in range(6):
+        repository.store_evaluation(make_evaluation(evaluator="medical" if i % 2 else "dummy",
+                                                    response=str(i)))
+
+    assert collect_pages(repository, "user-a", limit=2, evaluator="medical") == [["1", "3"], ["5"]]
+
+
+def test_pages_can_be_filtered_by_score_and_time():
+    repository = MemoryRepository()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(10):
+        repository.store_evaluation(make_evaluation(response=str(i), score=None if i == 5 else i / 10,
+                                                    created_at=start + timedelta(seconds=i)))
+
+    in_time = EvaluationFilter(created_after=start + timedelta(seconds=1),
+                               created_before=start + timedelta(seconds=6))
+    in_score = EvaluationFilter(min_score=0.3, max_score=0.8)
+
+    assert collect_pages(repository, "user-a", limit=2, filters=in_time) == [["2", "3"], ["4", "5"]]
+    assert collect_pages(repository, "user-a", limit=2, filters=in_score) == [["3", "4"], ["6", "7"], ["8"]]
+
+
+def test_cursor_stays_valid_while_evaluations_are_added():
+    repository = MemoryRepository()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(4):
+        repository.store_evaluation(make_evaluation(response=str(i), created_at=start + timedelta(seconds=i)))
+
+    first = repository.list_evaluations_page("user-a", limit=2)
+    # A late write with an older timestamp lands before the cursor and is not repeated
+    repository.store_evaluation(make_evaluation(response="late", created_at=start - timedelta(seconds=1)))
+    repository.store_evaluation(make_evaluation(response="new", created_at=start + timedelta(seconds=9)))
+    second = repository.list_evaluations_page("user-a", limit=10, cursor=first.next_cursor)
+
+    assert [evaluation.response for evaluation in second.evaluations] == ["2", "3", "new"]
+    assert [evaluation.response for evaluation in repository.list_evaluations("user-a", limit=2)] == ["late", "0"]
+
+
+def test_invalid_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        MemoryRepository().list_evaluations_page("user-a", cursor="not-a-cursor")
+
+
+def test_cursor_round_trip():
+    evaluation = make_evaluation(created_at=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc))
+    evaluation.id = "abc"
+
+    cursor = VizevalRepository.encode_cursor(evaluation)
+
+    assert VizevalRepository.decode_cursor(cursor) == (evaluation.created_at, "abc")
+
+
+def test_blocking_repositories_run_async_calls_on_the_io_pool():
+    class BlockingRepository(MemoryRepository):
+        def get_user_from_api_key(self, api_key):
+            self.thread = threading.current_thread().name
+            return super().get_user_from_api_key(api_key)
+
+    # MemoryRepository itself answers inline, so go through the default version
+    repository = BlockingRepository()
+    asyncio.run(VizevalRepository.aget_user_from_api_key(repository, "mock-api-key"))
+
+    assert repository.thread.startswith("vizeval-io")
@@ -0,0 +1,90 @@
+from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.core.interfaces import ResultCache
+from vizeval.infrastructure.cache import memory_cache, MemoryResultCache, SqliteResultCache
+from vizeval.infrastructure.cache import sqlite_cache
+
+
+def result(score):
+    return EvaluationResult(evaluator="dummy", score=score)
+
+
+def test_key_depends_on_content_and_evaluator_version():
+    request = EvaluationRequest(system_prompt="s", user_prompt="u", response="r")
+    same = EvaluationRequest(system_prompt="s", user_prompt="u", response="r",
+                             metadata={"run": "2"}, user_id="other")
+    different = EvaluationRequest(system_prompt="s", user_prompt="u", response="r2")
+
+    key = ResultCache.key_for(request, "medical", "1")
+
+    assert key == ResultCache.key_for(same, "medical", "1")
+    assert key != ResultCache.key_for(different, "medical", "1")
+    assert key != ResultCache.key_for(request, "medical", "2")
+    assert key != ResultCache.key_for(request, "dummy", "1")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoryResultCache(max_entries=2)
+    cache.set("a", result(0.1))
+    cache.set("b", result(0.2))
+    cache.get("a")
+    cache.set("c", result(0.3))
+
+    assert cache.get("b") is None
+    assert cache.get("a").score == 0.1
+    assert cache.get("c").score == 0.3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryResultCache(ttl_seconds=10)
+    cache.set("a", result(0.5))
+
+    now[0] += 5
+    assert cache.get("a").score == 0.5
+    now[0] += 10
+    assert cache.get("a") is None
+
+
+def test_hit_and_miss_counters():
+    cache = MemoryResultCache()
+    cache.get("a")
+    cache.set("a", result(0.5))
+    cache.get("a")
+    cache.get("a")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = MemoryResultCache(persistent=SqliteResultCache(path))
+    cache.set("a", EvaluationResult(evaluator="medical", score=0.7, feedback="ok"))
+    cache.persistent.close()
+
+    restarted = MemoryResultCache(persistent=SqliteResultCache(path))
+    cached = restarted.get("a")
+
+    assert cached == EvaluationResult(evaluator="medical", score=0.7, feedback="ok")
+    assert restarted.stats()["persistent_hits"] == 1
+    # Promoted into memory on the first lookup
+    restarted.get("a")
+    assert restarted.stats()["hits"] == 1
+
+
+def test_promoted_entries_keep_their_persistent_expiry(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(sqlite_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.db")
+    SqliteResultCache(path, ttl_seconds=10).set("a", result(0.5))
+
+    now[0] += 8
+    cache = MemoryResultCache(ttl_seconds=10, persistent=SqliteResultCache(path, ttl_seconds=10))
+    assert cache.get("a").score == 0.5
+    # Stored 11 seconds ago, not 3
+    now[0] += 3
+    assert cache.get("a") is None
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from vizeval.core.entities import EvaluationJob, EvaluationRequest, EvaluationResult
+from vizeval.core.interfaces import QueueFullError
+from vizeval.infrastructure.queue.sqlite_queue import SqliteQueue
+
+
+def make_job(response="r", user_id="mock-user-id"):
+    return EvaluationJob(request=EvaluationRequest(system_prompt="s", user_prompt="u", response=response,
+                                                   user_id=user_id))
+
+
+def test_job_round_trips_through_the_database(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"))
+    job = make_job()
+    job.fast_result = EvaluationResult(score=0.5, feedback="fast", evaluator="dummy")
+    queue.enqueue(job)
+
+    dequeued = queue.dequeue()
+
+    assert dequeued == job
+    assert isinstance(dequeued.request, EvaluationRequest)
+    assert isinstance(dequeued.fast_result, EvaluationResult)
+
+
+def test_jobs_survive_reopening(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = SqliteQueue(path)
+    queue.enqueue_many([make_job("a"), make_job("b")])
+    queue.close()
+
+    reopened = SqliteQueue(path)
+
+    assert reopened.size() == 2
+    assert [job.request.response for job in reopened.dequeue_many(5)] == ["a", "b"]
+
+
+def test_unacknowledged_job_is_redelivered_after_visibility_timeout(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), visibility_timeout=0.1, poll_interval=0.02)
+    job = make_job()
+    queue.enqueue(job)
+
+    assert queue.dequeue().id == job.id
+    assert queue.dequeue() is None
+    assert queue.dequeue(timeout=2).id == job.id
+
+
+def test_ack_removes_job_and_nack_makes_it_visible(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"))
+    first, second = make_job("a"), make_job("b")
+    queue.enqueue_many([first, second])
+
+    jobs = queue.dequeue_many(2)
+    assert queue.stats()["in_flight"] == 2
+
+    queue.ack(jobs[0])
+    queue.nack(jobs[1])
+
+    assert queue.size() == 1
+    assert queue.dequeue().id == second.id
+
+
+def test_nack_with_retry_after_hides_the_job_until_then(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), poll_interval=0.02)
+    job = make_job()
+    queue.enqueue(job)
+
+    queue.nack(queue.dequeue(), retry_after=0.2)
+
+    assert queue.dequeue() is None
+    start = time.monotonic()
+    assert queue.dequeue(timeout=2).id == job.id
+    assert time.monotonic() - start > 0.1
+
+
+def test_job_is_dead_lettered_after_max_deliveries(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), max_deliveries=2)
+    queue.enqueue(make_job())
+
+    for _ in range(2):
+        queue.nack(queue.dequeue())
+
+    assert queue.dequeue() is None
+    assert queue.stats()["dead"] == 1
+    assert queue.is_empty()
+
+
+def test_dequeue_skips_past_dead_lettered_jobs_without_waiting(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), max_deliveries=1, poll_interval=5)
+    queue.enqueue_many([make_job("dead-1"), make_job("dead-2"), make_job("live")])
+    for job in queue.dequeue_many(2):
+        queue.nack(job)
+
+    start = time.monotonic()
+    job = queue.dequeue(timeout=1)
+
+    assert job.request.response == "live"
+    assert time.monotonic() - start < 0.5
+    assert queue.stats()["dead"] == 2
+
+
+def test_blocking_dequeue_wakes_up_on_enqueue(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), poll_interval=5)
+    job = make_job()
+    threading.Timer(0.05, queue.enqueue, args=(job,)).start()
+
+    start = time.monotonic()
+    assert queue.dequeue(timeout=5).id == job.id
+    assert time.monotonic() - start < 1.0
+
+
+def test_enqueue_many_is_all_or_nothing_when_bounded(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), max_size=3, max_per_tenant=2)
+    queue.enqueue(make_job(user_id="a"))
+
+    with pytest.raises(QueueFullError):
+        queue.enqueue_many([make_job(user_id="a"), make_job(user_id="a")])
+    with pytest.raises(QueueFullError):
+        queue.enqueue_many([make_job(user_id="b") for _ in range(3)])
+
+    assert queue.size() == 1
+    assert queue.stats()["rejected"] == 5
+
+
+def test_compaction_keeps_pending_jobs(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), compact_every=10)
+    queue.enqueue_many([make_job(str(i)) for i in range(25)])
+
+    for job in queue.dequeue_many(20):
+        queue.ack(job)
+
+    assert queue.size() == 5
+    assert len(queue.dequeue_many(10)) == 5
@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vizeval.core.entities import Evaluation
+from vizeval.infrastructure.supabase.supabase_store import SupabaseStore
+from vizeval.infrastructure.supabase.write_buffer import WriteBuffer, WriteBufferFullError
+
+
+class PostgrestStub(ThreadingHTTPServer):
+    """Accepts PostgREST inserts into /rest/v1/<table>, failing the first `failures` requests."""
+
+    def __init__(self, failures=0):
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.failures = failures
+        self.requests = []
+        self.rows = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        rows = body if isinstance(body, list) else [body]
+        self.server.requests.append((self.path, self.headers.get("Prefer", ""), len(rows)))
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        for row in rows:
+            self.server.rows.setdefault(row["id"], row)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = PostgrestStub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_evaluation(i):
+    return Evaluation(system_prompt="s", user_prompt="u", response=str(i), user_id="user-a",
+                      evaluator="dummy", score=0.5)
+
+
+def test_store_writes_multi_row_inserts(stub):
+    store = SupabaseStore(stub.url, "test-key", write_batch_size=10, flush_interval=5.0)
+
+    ids = [store.store_evaluation(make_evaluation(i)) for i in range(25)]
+    store.close()
+
+    assert sorted(stub.rows) == sorted(ids)
+    assert [size for _, _, size in stub.requests] == [10, 10, 5]
+    path, prefer, _ = stub.requests[0]
+    assert path.startswith("/rest/v1/evaluations")
+    assert "resolution=ignore-duplicates" in prefer
+
+
+def test_flush_interval_bounds_write_delay(stub):
+    store = SupabaseStore(stub.url, "test-key", write_batch_size=100, flush_interval=0.05)
+
+    evaluation_id = store.store_evaluation(make_evaluation(0))
+    deadline = time.monotonic() + 2
+    while evaluation_id not in stub.rows and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert evaluation_id in stub.rows
+    store.close()
+
+
+def test_failed_inserts_are_retried(stub):
+    stub.failures = 2
+    store = SupabaseStore(stub.url, "test-key", write_batch_size=5)
+    store.write_buffer.backoff_base = 0.01
+
+    for i in range(5):
+        store.store_evaluation(make_evaluation(i))
+    store.close()
+
+    assert len(stub.rows) == 5
+    assert store.write_buffer.stats()["retries"] == 2
+    assert store.write_buffer.stats()["dropped"] == 0
+
+
+def test_batch_is_dropped_after_max_retries():
+    def failing_insert(rows):
+        raise ConnectionError("unreachable")
+
+    buffer = WriteBuffer(failing_insert, max_batch_size=2, max_retries=1, backoff_base=0.01)
+    buffer.add({"id": 1})
+    buffer.add({"id": 2})
+
+    assert buffer.flush(timeout=5)
+    assert buffer.stats()["dropped"] == 2
+    buffer.close()
+
+
+def test_full_buffer_blocks_then_raises():
+    writing, release = threading.Event(), threading.Event()
+
+    def stuck_insert(rows):
+        writing.set()
+        release.wait()
+
+    buffer = WriteBuffer(stuck_insert, max_batch_size=1, max_buffered=2, put_timeout=0.05)
+    buffer.add({"id": 0})
+    assert writing.wait(timeout=2)
+    buffer.add({"id": 1})
+    buffer.add({"id": 2})
+
+    with pytest.raises(WriteBufferFullError):
+        buffer.add({"id": 3})
+
+    release.set()
+    assert buffer.close(timeout=5)
+    assert buffer.stats()["flushed"] == 3
+
+
+def test_synchronous_writes_without_buffer(stub):
+    store = SupabaseStore(stub.url, "test-key", write_batch_size=1)
+
+    evaluation_id = store.store_evaluation(make_evaluation(0))
+
+    assert store.write_buffer is None
+    assert evaluation_id in stub.rows
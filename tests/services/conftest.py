@@ -0,0 +1,32 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vizeval.app.api.routes.evaluation import router as evaluation_router
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.app.services.service_provider import get_evaluation_service, get_repository_service
+from vizeval.core.entities import User
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+@pytest.fixture
+def repository():
+    """A repository holding the user of "mock-api-key"."""
+    repository = MemoryRepository()
+    repository.add_user(User(name="Test User"))
+    return repository
+
+
+@pytest.fixture
+def make_client():
+    """Builds a client of the evaluation routes served by the given EvaluationService.
+
+    API keys are resolved against the service's repository.
+    """
+    def make(service):
+        app = FastAPI()
+        app.include_router(evaluation_router)
+        app.dependency_overrides[get_evaluation_service] = lambda: service
+        app.dependency_overrides[get_repository_service] = lambda: RepositoryService(service.repository)
+        return TestClient(app)
+    return make
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vizeval.app.services.evaluation_service import EvaluationService
+from vizeval.core.entities import User
+from vizeval.infrastructure.memory_repository import MemoryRepository
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+
+PAYLOAD = {
+    "system_prompt": "You are a helpful assistant.",
+    "user_prompt": "Tell me about Python.",
+    "response": "Python is a programming language.",
+    "evaluator": "dummy",
+    "api_key": "mock-api-key",
+}
+
+
+def make_service(repository, queue, overload_policy):
+    return EvaluationService(repository=repository, queue=queue, overload_policy=overload_policy)
+
+
+def test_saturated_queue_answers_429_with_retry_after(make_client, repository):
+    queue = MemoryQueue(max_size=20, retry_after=2.5)
+    client = make_client(make_service(repository, queue, "reject"))
+
+    # No workers are running, so the queue fills up and stays full
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: client.post("/evaluation/", json=PAYLOAD), range(100)))
+
+    accepted = [response for response in responses if response.status_code == 201]
+    rejected = [response for response in responses if response.status_code == 429]
+    assert len(accepted) == 20
+    assert len(rejected) == 80
+    assert all(response.headers["Retry-After"] == "3" for response in rejected)
+    assert queue.size() == 20
+
+
+def test_saturated_queue_degrades_to_fast_evaluation(make_client, repository):
+    queue = MemoryQueue(max_size=5)
+    client = make_client(make_service(repository, queue, "degrade"))
+
+    responses = [client.post("/evaluation/", json=PAYLOAD) for _ in range(10)]
+
+    assert all(response.status_code == 201 for response in responses)
+    assert all(response.json()["score"] is not None for response in responses)
+    statuses = [response.json()["detailed_evaluation"] for response in responses]
+    assert statuses == ["queued"] * 5 + ["skipped"] * 5
+    assert queue.size() == 5
+
+
+def test_busy_user_is_rejected_while_others_are_still_admitted(make_client, repository):
+    repository.users["other-user-id"] = User(id="other-user-id", name="Other User", api_key="other-api-key")
+    repository.api_keys["other-api-key"] = "other-user-id"
+    queue = MemoryQueue(max_per_tenant=2)
+    client = make_client(make_service(repository, queue, "reject"))
+
+    statuses = [client.post("/evaluation/", json=PAYLOAD).status_code for _ in range(3)]
+    other = client.post("/evaluation/", json={**PAYLOAD, "api_key": "other-api-key"})
+
+    assert statuses == [201, 201, 429]
+    assert other.status_code == 201
+    queued = sorted(queue.dequeue().request.user_id for _ in range(3))
+    assert queued == ["mock-user-id", "mock-user-id", "other-user-id"]
+
+
+def test_unknown_api_key_is_rejected(make_client, repository):
+    queue = MemoryQueue()
+    client = make_client(make_service(repository, queue, "reject"))
+
+    response = client.post("/evaluation/", json={**PAYLOAD, "api_key": "unknown-api-key"})
+
+    assert response.status_code == 400
+    assert queue.is_empty()
+
+
+def test_unknown_overload_policy_is_rejected():
+    with pytest.raises(ValueError):
+        EvaluationService(repository=MemoryRepository(), queue=MemoryQueue(), overload_policy="drop")
@@ -0,0 +1,274 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import vizeval.evaluators as evaluators
+from vizeval.app.services.evaluation_service import EvaluationService
+from vizeval.core.entities import EvaluationRequest, EvaluationResult
+from vizeval.core.interfaces import QueueFullError
+from vizeval.evaluators.base import BaseEvaluator
+from vizeval.infrastructure.memory_repository import MemoryRepository
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+from vizeval.infrastructure.queue.sqlite_queue import SqliteQueue
+
+
+class CountingEvaluator(BaseEvaluator):
+    name = "counting"
+
+    def __init__(self):
+        self.fast_calls = 0
+        self.detailed_calls = 0
+        self.fast_results_seen = []
+
+    def fast_evaluate(self, request):
+        self.fast_calls += 1
+        return EvaluationResult(evaluator=self.name, score=0.25)
+
+    def detailed_evaluate(self, request, fast_result=None):
+        self.detailed_calls += 1
+        self.fast_results_seen.append(fast_result)
+        return EvaluationResult(evaluator=self.name, score=0.9, feedback="looks safe")
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    counting = CountingEvaluator()
+    monkeypatch.setitem(evaluators._evaluators, counting.name, counting)
+    return counting
+
+
+@pytest.fixture
+def service(repository):
+    return EvaluationService(repository=repository, queue=MemoryQueue())
+
+
+@pytest.fixture
+def client(make_client, service):
+    return make_client(service)
+
+
+def test_each_request_is_fast_evaluated_once(client, service, evaluator):
+    payload = {
+        "system_prompt": "You are a helpful assistant.",
+        "user_prompt": "Tell me about Python.",
+        "response": "Python is a programming language.",
+        "evaluator": "counting",
+        "api_key": "mock-api-key",
+    }
+
+    response = client.post("/evaluation/", json=payload)
+    assert response.status_code == 201
+    assert response.json()["score"] == 0.25
+
+    job = service.queue.dequeue()
+    assert job.fast_result.score == 0.25
+    assert job.id
+
+    service.process_job(job)
+
+    assert evaluator.fast_calls == 1
+    assert evaluator.detailed_calls == 1
+    assert evaluator.fast_results_seen == [job.fast_result]
+
+    stored = service.repository.list_evaluations(user_id="mock-user-id")
+    assert len(stored) == 1
+    assert stored[0].score == 0.25
+    assert stored[0].feedback == "looks safe"
+
+
+class SlowEvaluator(BaseEvaluator):
+    name = "slow"
+
+    def fast_evaluate(self, request):
+        time.sleep(0.3)
+        return EvaluationResult(evaluator=self.name, score=0.5)
+
+
+def test_aevaluate_does_not_block_the_event_loop(monkeypatch, service):
+    monkeypatch.setitem(evaluators._evaluators, SlowEvaluator.name, SlowEvaluator())
+    request = EvaluationRequest(system_prompt="s", user_prompt="u", response="r", evaluator="slow")
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(service.aevaluate(request) for _ in range(4)))
+        ticker_task.cancel()
+        return results, ticks
+
+    started = time.monotonic()
+    results, ticks = asyncio.run(scenario())
+
+    assert [result.score for result in results] == [0.5] * 4
+    # Evaluations ran concurrently on the thread pool while the loop kept ticking
+    assert time.monotonic() - started < 1.0
+    assert ticks >= 10
+    queued = 0
+    while not service.queue.is_empty():
+        service.queue.dequeue()
+        queued += 1
+    assert queued == 4
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_loading_an_evaluator_does_not_block_the_event_loop(monkeypatch, service, batch):
+    def slow_factory():
+        time.sleep(0.5)
+        return CountingEvaluator()
+
+    monkeypatch.setitem(evaluators._factories, "slow-loading", slow_factory)
+    request = EvaluationRequest(system_prompt="s", user_prompt="u", response="r", evaluator="slow-loading")
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        if batch:
+            await service.aevaluate_batch([request, request], queue_detailed=False)
+        else:
+            await asyncio.gather(*(service.aevaluate(request, queue_detailed=False) for _ in range(2)))
+        ticker_task.cancel()
+        return ticks
+
+    try:
+        # Both requests wait for the same load, on the thread pool
+        assert asyncio.run(scenario()) >= 20
+    finally:
+        evaluators._evaluators.pop("slow-loading", None)
+        evaluators._load_seconds.pop("slow-loading", None)
+
+
+class BatchCountingEvaluator(CountingEvaluator):
+    name = "batch-counting"
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def fast_evaluate_batch(self, requests):
+        self.batches.append(len(requests))
+        return [EvaluationResult(evaluator=self.name, score=len(request.response) / 100)
+                for request in requests]
+
+
+class FailingEvaluator(BaseEvaluator):
+    name = "failing"
+
+    def fast_evaluate(self, request):
+        raise RuntimeError("model unavailable")
+
+
+def test_batch_endpoint_groups_by_evaluator_and_keeps_order(monkeypatch, client, service):
+    batching = BatchCountingEvaluator()
+    monkeypatch.setitem(evaluators._evaluators, batching.name, batching)
+    monkeypatch.setitem(evaluators._evaluators, FailingEvaluator.name, FailingEvaluator())
+    items = [
+        {"system_prompt": "s", "user_prompt": "u", "response": "r" * (i + 1),
+         "evaluator": "failing" if i == 2 else "batch-counting"}
+        for i in range(5)
+    ]
+
+    response = client.post("/evaluation/batch", json={"items": items, "api_key": "mock-api-key"})
+
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [result["score"] for result in results] == [0.01, 0.02, None, 0.04, 0.05]
+    assert results[2]["error"] == "model unavailable"
+    assert results[2]["detailed_evaluation"] == "skipped"
+    assert batching.batches == [4]
+    assert batching.fast_calls == 0
+    # Only the successful items were queued
+    assert [job.request.response for job in service.queue.dequeue_many(10)] == ["r", "rr", "rrrr", "rrrrr"]
+
+
+def test_batch_endpoint_rejects_whole_batch_when_queue_is_full(make_client, repository):
+    service = EvaluationService(repository=repository, queue=MemoryQueue(max_size=3))
+    items = [{"system_prompt": "s", "user_prompt": "u", "response": str(i), "evaluator": "dummy"}
+             for i in range(5)]
+
+    response = make_client(service).post("/evaluation/batch", json={"items": items, "api_key": "mock-api-key"})
+
+    assert response.status_code == 429
+    assert service.queue.is_empty()
+
+
+@pytest.mark.parametrize("queue", [MemoryQueue(max_size=3), MemoryQueue(max_per_tenant=2)])
+def test_batch_that_cannot_be_queued_is_rejected_before_scoring(evaluator, queue):
+    service = EvaluationService(repository=MemoryRepository(), queue=queue)
+    requests = [EvaluationRequest(system_prompt="s", user_prompt="u", response=str(i),
+                                  evaluator=evaluator.name, user_id="alice") for i in range(5)]
+
+    with pytest.raises(QueueFullError):
+        service.evaluate_batch(requests)
+    with pytest.raises(QueueFullError):
+        asyncio.run(service.aevaluate_batch(requests))
+
+    assert evaluator.fast_calls == 0
+    assert service.queue.is_empty()
+
+
+class ThreadRecordingQueue(SqliteQueue):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def check_capacity(self, user_id=None, count=1):
+        self.threads.append(threading.current_thread().name)
+        super().check_capacity(user_id, count)
+
+    def enqueue(self, job):
+        self.threads.append(threading.current_thread().name)
+        super().enqueue(job)
+
+    def enqueue_many(self, jobs):
+        self.threads.append(threading.current_thread().name)
+        super().enqueue_many(jobs)
+
+
+def test_async_paths_write_to_the_queue_off_the_event_loop(tmp_path, evaluator, repository):
+    queue = ThreadRecordingQueue(str(tmp_path / "queue.db"))
+    service = EvaluationService(repository=repository, queue=queue)
+    requests = [EvaluationRequest(system_prompt="s", user_prompt="u", response=str(i),
+                                  evaluator=evaluator.name, user_id="alice") for i in range(3)]
+
+    async def scenario():
+        await service.aevaluate(requests[0])
+        await service.aevaluate_batch(requests[1:])
+
+    asyncio.run(scenario())
+
+    assert queue.size() == 3
+    # Capacity checks and enqueues hit SQLite, so they must not run on the loop thread
+    assert queue.threads
+    assert all(name.startswith("vizeval-io") for name in queue.threads)
+
+
+def test_evaluate_batch_uses_cache_for_repeated_items(service):
+    from vizeval.infrastructure.cache import MemoryResultCache
+
+    batching = BatchCountingEvaluator()
+    service.cache = MemoryResultCache()
+    requests = [EvaluationRequest(system_prompt="s", user_prompt="u", response=str(i),
+                                  evaluator=batching.name) for i in range(3)]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(evaluators._evaluators, batching.name, batching)
+        service.evaluate_batch(requests[:2], queue_detailed=False)
+        results = service.evaluate_batch(requests, queue_detailed=False)
+
+    assert batching.batches == [2, 1]
+    assert [result.score for result in results] == [0.01, 0.01, 0.01]
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+import vizeval.app.api.routes.evaluation as evaluation_routes
+import vizeval.evaluators as evaluators
+from vizeval.app.services.evaluation_service import EvaluationService
+from vizeval.core.entities import EvaluationResult
+from vizeval.evaluators.base import BaseEvaluator
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+
+
+class TrackingEvaluator(BaseEvaluator):
+    """Scores by response length and records the largest number of items held at once."""
+    name = "tracking"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches = []
+
+    def fast_evaluate(self, request):
+        return self.fast_evaluate_batch([request])[0]
+
+    def fast_evaluate_batch(self, requests):
+        with self.lock:
+            self.batches.append(len(requests))
+        return [EvaluationResult(evaluator=self.name, score=len(request.response)) for request in requests]
+
+
+@pytest.fixture
+def tracking(monkeypatch):
+    evaluator = TrackingEvaluator()
+    monkeypatch.setitem(evaluators._evaluators, evaluator.name, evaluator)
+    return evaluator
+
+
+@pytest.fixture
+def client_for(make_client, repository):
+    return lambda queue: make_client(EvaluationService(repository=repository, queue=queue))
+
+
+def ndjson_lines(count):
+    for i in range(count):
+        item = {"system_prompt": "s", "user_prompt": "u", "response": "r" * (i % 7 + 1),
+                "evaluator": "tracking"}
+        yield (json.dumps(item) + "\n").encode()
+
+
+def test_stream_answers_every_line(monkeypatch, tracking, client_for):
+    monkeypatch.setattr(evaluation_routes, "STREAM_MAX_IN_FLIGHT", 16)
+    monkeypatch.setattr(evaluation_routes, "STREAM_BATCH_SIZE", 5)
+    queue = MemoryQueue()
+    client = client_for(queue)
+
+    body = b"".join(ndjson_lines(200))
+    response = client.post("/evaluation/stream?api_key=mock-api-key", content=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["index"] for result in results) == list(range(200))
+    assert all(result["score"] == i % 7 + 1 for i, result in sorted((r["index"], r) for r in results))
+    assert max(tracking.batches) <= 5
+    assert queue.size() == 200
+
+
+def test_stream_reports_invalid_lines_and_keeps_going(tracking, client_for):
+    client = client_for(MemoryQueue())
+    body = b"".join([
+        b'{"system_prompt": "s", "user_prompt": "u", "response": "abc", "evaluator": "tracking"}\n',
+        b"not json\n",
+        b'{"system_prompt": "s"}\n',
+        b"\n",
+        # The last line does not need a trailing newline
+        b'{"system_prompt": "s", "user_prompt": "u", "response": "ab", "evaluator": "tracking"}',
+    ])
+
+    response = client.post("/evaluation/stream?api_key=mock-api-key", content=body)
+
+    results = {result["index"]: result for result in map(json.loads, response.text.splitlines())}
+    assert results[0]["score"] == 3
+    assert "error" in results[1]
+    assert "user_prompt" in results[2]["error"]
+    assert results[3]["score"] == 2
+
+
+def test_stream_reports_queue_full_per_item(tracking, client_for):
+    client = client_for(MemoryQueue(max_size=0, retry_after=2))
+
+    response = client.post("/evaluation/stream?api_key=mock-api-key", content=b"".join(ndjson_lines(3)))
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert len(results) == 3
+    assert all(result["retry_after"] == 2 for result in results)
@@ -0,0 +1,96 @@
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vizeval.app.api.routes.user import router as user_router
+from vizeval.app.services.repository_service import RepositoryService
+from vizeval.app.services.service_provider import get_repository_service
+from vizeval.core.entities import Evaluation, User
+from vizeval.core.executor import DEFAULT_MAX_WORKERS, configure_executor
+from vizeval.infrastructure.memory_repository import MemoryRepository
+
+
+@pytest.fixture
+def repository():
+    repository = MemoryRepository()
+    repository.add_user(User(name="Test User"))
+    for i in range(5):
+        repository.store_evaluation(Evaluation(system_prompt="s", user_prompt="u", response=str(i),
+                                               user_id="mock-user-id", evaluator="dummy", score=0.1 * i))
+    return repository
+
+
+@pytest.fixture
+def client(repository):
+    app = FastAPI()
+    app.include_router(user_router)
+    app.dependency_overrides[get_repository_service] = lambda: RepositoryService(repository)
+    return TestClient(app)
+
+
+def test_evaluations_are_paginated_with_a_cursor_header(client):
+    first = client.get("/user/evaluations", params={"api_key": "mock-api-key", "limit": 3})
+    second = client.get("/user/evaluations", params={"api_key": "mock-api-key", "limit": 3,
+                                                     "cursor": first.headers["X-Next-Cursor"]})
+
+    assert [evaluation["response"] for evaluation in first.json()] == ["0", "1", "2"]
+    assert [evaluation["response"] for evaluation in second.json()] == ["3", "4"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_invalid_cursor_is_a_bad_request(client):
+    response = client.get("/user/evaluations", params={"api_key": "mock-api-key", "cursor": "bogus"})
+
+    assert response.status_code == 400
+
+
+def test_evaluations_are_filtered_and_projected(client):
+    response = client.get("/user/evaluations", params={"api_key": "mock-api-key", "min_score": 0.15,
+                                                       "max_score": 0.35, "fields": "score,evaluator"})
+
+    assert response.status_code == 200
+    assert [set(item) for item in response.json()] == [{"score", "evaluator"}] * 2
+    assert [item["score"] for item in response.json()] == pytest.approx([0.2, 0.3])
+
+
+def test_unknown_field_is_a_bad_request(client):
+    response = client.get("/user/evaluations", params={"api_key": "mock-api-key", "fields": "score,password"})
+
+    assert response.status_code == 400
+
+
+def test_evaluations_are_streamed_as_ndjson(client, repository):
+    created = [evaluation.created_at for evaluation in
+               repository.list_evaluations_page("mock-user-id").evaluations]
+
+    response = client.get("/user/evaluations/stream", params={
+        "api_key": "mock-api-key", "fields": "response",
+        "created_after": created[0].isoformat(), "created_before": created[4].isoformat(),
+    })
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"response": "1"}, {"response": "2"}, {"response": "3"}]
+
+
+def test_stream_rejects_invalid_api_key(client):
+    response = client.get("/user/evaluations/stream", params={"api_key": "bogus"})
+
+    assert response.status_code == 400
+
+
+def test_listing_does_not_wait_behind_busy_evaluation_threads(client):
+    executor = configure_executor(1)
+    try:
+        executor.submit(time.sleep, 1)
+
+        start = time.monotonic()
+        response = client.get("/user/evaluations?api_key=mock-api-key")
+
+        assert response.status_code == 200
+        assert time.monotonic() - start < 0.5
+    finally:
+        configure_executor(DEFAULT_MAX_WORKERS)
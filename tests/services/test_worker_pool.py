@@ -0,0 +1,227 @@
+import threading
+import time
+
+import pytest
+
+import vizeval.evaluators as evaluators
+from vizeval.app.services.evaluation_service import EvaluationService
+from vizeval.app.services.worker_pool import WorkerPool, parse_concurrency_limits
+from vizeval.core.entities import EvaluationJob, EvaluationRequest, EvaluationResult
+from vizeval.core.interfaces import EvaluatorUnavailableError
+from vizeval.evaluators.base import BaseEvaluator
+from vizeval.infrastructure.memory_repository import MemoryRepository
+from vizeval.infrastructure.queue.memory_queue import MemoryQueue
+from vizeval.infrastructure.queue.sqlite_queue import SqliteQueue
+
+
+class SleepingEvaluator(BaseEvaluator):
+    name = "sleeping"
+
+    def __init__(self, seconds=0.1):
+        self.seconds = seconds
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def fast_evaluate(self, request):
+        return EvaluationResult(evaluator=self.name, score=0.5)
+
+    def detailed_evaluate(self, request, fast_result=None):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+        return EvaluationResult(evaluator=self.name, score=0.5, feedback="done")
+
+
+class ThrottledEvaluator(SleepingEvaluator):
+    """Unavailable for its first `failures` detailed evaluations, like a throttled LLM."""
+    name = "throttled"
+
+    def __init__(self, failures=1):
+        super().__init__(seconds=0)
+        self.failures = failures
+        self.attempts = []
+
+    def detailed_evaluate(self, request, fast_result=None):
+        self.attempts.append(time.monotonic())
+        if len(self.attempts) <= self.failures:
+            raise EvaluatorUnavailableError("Rate limited", retry_after=0.3)
+        return super().detailed_evaluate(request, fast_result)
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    sleeping = SleepingEvaluator()
+    monkeypatch.setitem(evaluators._evaluators, sleeping.name, sleeping)
+    return sleeping
+
+
+@pytest.fixture
+def service():
+    return EvaluationService(repository=MemoryRepository(), queue=MemoryQueue())
+
+
+def enqueue_jobs(service, count, evaluator="sleeping"):
+    for i in range(count):
+        request = EvaluationRequest(system_prompt="s", user_prompt="u", response=str(i),
+                                    evaluator=evaluator)
+        service.queue.enqueue(EvaluationJob(request=request,
+                                            fast_result=EvaluationResult(evaluator=evaluator, score=0.5)))
+
+
+def test_parse_concurrency_limits():
+    assert parse_concurrency_limits("") == {}
+    assert parse_concurrency_limits("medical=2, dummy=8") == {"medical": 2, "dummy": 8}
+    with pytest.raises(ValueError):
+        parse_concurrency_limits("medical")
+
+
+def test_workers_process_jobs_concurrently(service, evaluator):
+    enqueue_jobs(service, 8)
+    pool = WorkerPool(service, num_workers=4, poll_interval=0.05)
+
+    start = time.monotonic()
+    pool.start()
+    pool.shutdown(drain=True, timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert len(service.repository.list_evaluations(user_id="mock-user-id")) == 8
+    assert evaluator.max_running == 4
+    assert elapsed < 0.8
+    stats = pool.stats()
+    assert stats.processed == 8
+    assert stats.failed == 0
+    assert stats.workers == 0
+
+
+def test_evaluator_concurrency_limit_is_respected(service, evaluator):
+    enqueue_jobs(service, 6)
+    pool = WorkerPool(service, num_workers=4, evaluator_concurrency={"sleeping": 2},
+                      poll_interval=0.05)
+
+    pool.start()
+    pool.shutdown(drain=True, timeout=5)
+
+    assert evaluator.max_running == 2
+    assert pool.stats().processed == 6
+
+
+def test_jobs_of_a_limited_evaluator_do_not_hold_up_other_evaluators(monkeypatch, service, evaluator):
+    evaluator.seconds = 0.5
+    quick = SleepingEvaluator(seconds=0)
+    quick.name = "quick"
+    monkeypatch.setitem(evaluators._evaluators, quick.name, quick)
+    enqueue_jobs(service, 3)
+    enqueue_jobs(service, 3, evaluator="quick")
+    pool = WorkerPool(service, num_workers=2, evaluator_concurrency={"sleeping": 1},
+                      poll_interval=0.05)
+
+    start = time.monotonic()
+    pool.start()
+    while len(service.repository.list_evaluations_page("mock-user-id", evaluator="quick").evaluations) < 3:
+        assert time.monotonic() - start < 5
+        time.sleep(0.01)
+    quick_done = time.monotonic() - start
+    assert pool.stats().deferred == 2
+    pool.shutdown(drain=True, timeout=5)
+
+    # The second worker set the sleeping jobs aside instead of waiting for the first one
+    assert quick_done < 0.4
+    assert evaluator.max_running == 1
+    assert pool.stats().processed == 6
+    assert pool.stats().deferred == 0
+
+
+def test_live_stats_report_busy_workers(service, evaluator):
+    evaluator.seconds = 0.3
+    enqueue_jobs(service, 2)
+    pool = WorkerPool(service, num_workers=3, poll_interval=0.05)
+
+    pool.start()
+    time.sleep(0.1)
+    stats = pool.stats()
+    pool.shutdown(drain=True, timeout=5)
+
+    assert stats.workers == 3
+    assert stats.busy == 2
+    assert stats.idle == 1
+    assert pool.stats().jobs_per_second > 0
+
+
+def test_shutdown_without_drain_leaves_queued_jobs(service, evaluator):
+    enqueue_jobs(service, 10)
+    pool = WorkerPool(service, num_workers=1, poll_interval=0.05)
+
+    pool.start()
+    time.sleep(0.05)
+    pool.shutdown(drain=False, timeout=5)
+
+    assert pool.stats().processed < 10
+    assert service.queue.size() > 0
+
+
+def test_shutdown_gives_set_aside_jobs_back_to_the_queue(service, evaluator):
+    evaluator.seconds = 0.5
+    enqueue_jobs(service, 3)
+    pool = WorkerPool(service, num_workers=2, evaluator_concurrency={"sleeping": 1},
+                      poll_interval=0.05)
+
+    start = time.monotonic()
+    pool.start()
+    while pool.stats().deferred < 2:
+        assert time.monotonic() - start < 5
+        time.sleep(0.01)
+    pool.shutdown(drain=False, timeout=5)
+
+    assert pool.stats().processed == 1
+    assert pool.stats().deferred == 0
+    assert service.queue.size() == 2
+
+
+def test_set_aside_jobs_are_not_redelivered_while_they_wait(tmp_path, evaluator):
+    evaluator.seconds = 0.25
+    queue = SqliteQueue(str(tmp_path / "queue.db"), visibility_timeout=0.5, poll_interval=0.05)
+    service = EvaluationService(repository=MemoryRepository(), queue=queue)
+    enqueue_jobs(service, 5)
+    pool = WorkerPool(service, num_workers=2, evaluator_concurrency={"sleeping": 1},
+                      poll_interval=0.05)
+
+    pool.start()
+    pool.shutdown(drain=True, timeout=5)
+
+    # The last job is set aside for about 1s, twice the visibility timeout, but runs once
+    assert len(service.repository.list_evaluations(user_id="mock-user-id")) == 5
+    assert pool.stats().processed == 5
+    assert queue.is_empty()
+
+
+def test_process_mode_runs_evaluations_in_child_processes(service):
+    enqueue_jobs(service, 3, evaluator="dummy")
+    pool = WorkerPool(service, num_workers=2, mode="process", poll_interval=0.05)
+
+    pool.start()
+    pool.shutdown(drain=True, timeout=120)
+
+    stored = service.repository.list_evaluations(user_id="mock-user-id")
+    assert len(stored) == 3
+    assert all(evaluation.evaluator == "dummy" for evaluation in stored)
+    assert pool.stats().processed == 3
+
+
+def test_throttled_job_is_retried_after_its_delay_and_stored(service, monkeypatch):
+    throttled = ThrottledEvaluator(failures=2)
+    monkeypatch.setitem(evaluators._evaluators, throttled.name, throttled)
+    enqueue_jobs(service, 1, evaluator="throttled")
+    pool = WorkerPool(service, num_workers=2, poll_interval=0.05)
+
+    pool.start()
+    pool.shutdown(drain=True, timeout=5)
+
+    assert len(service.repository.list_evaluations(user_id="mock-user-id")) == 1
+    assert len(throttled.attempts) == 3
+    assert throttled.attempts[1] - throttled.attempts[0] >= 0.3
+    assert (pool.stats().failed, pool.stats().processed) == (2, 1)
+    assert service.queue.is_empty()